@@ -2,6 +2,7 @@ from typing import Annotated, List, Dict
 import json
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
+from llm import get_chat_model
 from models import GraphState, Skill
 from utils import safe_parse_llm_json
 from dotenv import load_dotenv
@@ -37,7 +38,7 @@ Base your analysis on the candidate's experience, projects, and overall profile:
 
 class ClassifyAgent:
     def __init__(self, model: Annotated[ChatOpenAI, "OpenAI model for classification"] = None):
-        self.model = model or ChatOpenAI(model="gpt-4-turbo-preview")
+        self.model = model or get_chat_model()
 
     def format_skills_for_prompt(self, skills: List[Skill]) -> str:
         """Format skills list for the prompt"""
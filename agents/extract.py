@@ -3,7 +3,9 @@ import json
 import os
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
+from llm import get_chat_model
 from models import GraphState, CandidateProfile, Skill
+from pipeline import ResultCache, get_result_cache, model_fingerprint
 from utils import safe_parse_llm_json
 from dotenv import load_dotenv
 
@@ -49,12 +51,18 @@ SAMPLE_PROFILE = {
 
 
 class ExtractAgent:
-    def __init__(self, model: Annotated[ChatOpenAI, "OpenAI model for extraction"] = None):
+    def __init__(
+        self,
+        model: Annotated[ChatOpenAI, "OpenAI model for extraction"] = None,
+        cache: Annotated[ResultCache, "Stage result cache keyed by upload content"] = None
+    ):
         # Validate OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is not set")
             
-        self.model = model or ChatOpenAI(model="gpt-4-turbo-preview")
+        self.model = model or get_chat_model()
+        self.model_key = model_fingerprint(self.model)
+        self.cache = cache or get_result_cache()
 
     def parse_skills(self, skills_data: List[dict]) -> List[Skill]:
         """Convert raw skills data to Skill objects"""
@@ -83,6 +91,14 @@ class ExtractAgent:
                 state.current_step = "classify"
                 return state
 
+            # A re-uploaded resume reuses the profile extracted the first time
+            if self.cache and state.resume_hash:
+                profile = self.cache.get_profile(state.resume_hash, self.model_key)
+                if profile is not None:
+                    state.candidate_profile = profile
+                    state.current_step = "classify"
+                    return state
+
             # Extract structured data
             try:
                 messages = [
@@ -93,6 +109,8 @@ class ExtractAgent:
                 
                 # Parse the JSON response with robust parsing
                 data = safe_parse_llm_json(response.content, SAMPLE_PROFILE)
+                # Unparseable responses fall back to the sample profile, which must not be cached
+                cacheable = data is not SAMPLE_PROFILE
                 
                 # Convert skills data to Skill objects
                 skills = self.parse_skills(data.pop("skills", []))
@@ -124,6 +142,8 @@ class ExtractAgent:
                     **data
                 )
                 
+                if cacheable and self.cache and state.resume_hash:
+                    self.cache.set_profile(state.resume_hash, self.model_key, profile)
                 state.candidate_profile = profile
                 state.current_step = "classify"
                 return state
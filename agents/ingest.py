@@ -2,69 +2,43 @@ from typing import Annotated, Union
 import os
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
-from pypdf import PdfReader
-from io import BytesIO
+from llm import get_chat_model
 from models import GraphState
+from pipeline import BoundedExecutor, PdfExtractor, ResultCache, content_hash, get_executor, get_result_cache
+from pipeline.metrics import timed
+from pipeline.pdf import clean_text, extract_resume_text
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-def clean_text(text: str) -> str:
-    """Clean extracted text from PDF"""
-    return " ".join(text.split())
-
 
 class IngestAgent:
-    def __init__(self, model: Annotated[ChatOpenAI, "OpenAI model for text processing"] = None):
+    def __init__(
+        self,
+        model: Annotated[ChatOpenAI, "OpenAI model for text processing"] = None,
+        executor: Annotated[BoundedExecutor, "Pool for blocking PDF extraction"] = None,
+        pdf_extractor: Annotated[PdfExtractor, "Streaming PDF text extractor"] = None,
+        cache: Annotated[ResultCache, "Stage result cache keyed by upload content"] = None
+    ):
         # Validate OpenAI API key
         if not os.getenv("OPENAI_API_KEY"):
             raise ValueError("OPENAI_API_KEY environment variable is not set")
             
-        self.model = model or ChatOpenAI(model="gpt-4-turbo-preview")
+        self.model = model or get_chat_model()
+        self.executor = executor or get_executor("ingest")
+        self.pdf_extractor = pdf_extractor or PdfExtractor(executor=self.executor)
+        self.cache = cache or get_result_cache()
 
     def process_pdf(self, pdf_data: Union[str, bytes]) -> str:
         """Extract text from PDF resume or handle text files"""
-        try:
-            # Handle string input (already text)
-            if isinstance(pdf_data, str):
-                return clean_text(pdf_data)
-            
-            # Handle bytes input
-            if isinstance(pdf_data, bytes):
-                # First, try to decode as text to check if it's a text file
-                try:
-                    text_content = pdf_data.decode('utf-8')
-                    # Check if it looks like text (not PDF)
-                    if len(text_content) > 0 and not text_content.startswith('%PDF'):
-                        # It's a text file, not a PDF
-                        return clean_text(text_content)
-                except UnicodeDecodeError:
-                    pass
-                
-                # If not text, try to process as PDF
-                try:
-                    pdf_io = BytesIO(pdf_data)
-                    reader = PdfReader(pdf_io)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text()
-                        
-                    if not text.strip():
-                        raise ValueError("No text extracted from PDF")
-                        
-                    return clean_text(text)
-                except Exception as pdf_error:
-                    # If PDF processing fails, try to decode as text anyway
-                    try:
-                        text_content = pdf_data.decode('utf-8')
-                        return clean_text(text_content)
-                    except UnicodeDecodeError:
-                        raise ValueError(f"Failed to process as PDF or text: {str(pdf_error)}")
-            
-            raise ValueError("Invalid input type")
-        except Exception as e:
-            raise ValueError(f"Failed to process PDF: {str(e)}")
+        return extract_resume_text(pdf_data)
+
+    def cache_extraction(self, state: GraphState):
+        """Remember text that passed validation so a re-upload skips parsing and validation"""
+        if self.cache and state.resume_hash:
+            self.cache.set_extraction(state.resume_hash, self.pdf_extractor.char_budget,
+                                      state.resume_text, state.pdf_extraction)
 
     async def __call__(self, state: GraphState) -> GraphState:
         """LangGraph node implementation"""
@@ -73,8 +47,17 @@ class IngestAgent:
             return state
 
         try:
-            # Extract text from PDF bytes
-            extracted_text = self.process_pdf(state.resume_text)
+            state.resume_hash = content_hash(state.resume_text)
+            if self.cache:
+                cached = self.cache.get_extraction(state.resume_hash, self.pdf_extractor.char_budget)
+                if cached is not None:
+                    state.resume_text, state.pdf_extraction = cached
+                    state.current_step = "extract"
+                    return state
+
+            # Extract text from PDF bytes in the ingest pool so parsing never blocks the event loop
+            with timed("pdf"):
+                extracted_text, state.pdf_extraction = await self.pdf_extractor.extract(state.resume_text)
             
             if not extracted_text:
                 state.error = "No text could be extracted from the PDF"
@@ -85,6 +68,7 @@ class IngestAgent:
 
             # For testing, skip OpenAI validation if using sample resume
             if len(extracted_text) < 2000 and "Jane Doe" in extracted_text:
+                self.cache_extraction(state)
                 state.current_step = "extract"
                 return state
 
@@ -111,6 +95,7 @@ class IngestAgent:
                 state.error = f"Failed to validate resume: {str(api_error)}"
                 return state
                 
+            self.cache_extraction(state)
             state.current_step = "extract"
             return state
             
@@ -1,110 +1,430 @@
-from typing import Annotated, List
+from typing import Annotated, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import functools
 import json
+import threading
+import time
 import numpy as np
 import os
+from langchain_core.embeddings import Embeddings
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+from langchain_openai import ChatOpenAI
 import faiss
-from models import GraphState, JobPosting, MatchResult, MatchStatus, Skill
-from utils import safe_parse_llm_json
+from langgraph.config import get_stream_writer
+from llm import EmbeddingBatcher, get_chat_model, get_embeddings
+from models import CandidateProfile, GraphState, JobPosting, MatchResult, MatchStatus, Skill
+from pipeline import (
+    SECTION_WEIGHTS, BoundedExecutor, ResultCache, ResumeChunk, chunk_resume, content_hash, get_executor,
+    get_result_cache, model_fingerprint
+)
+from pipeline.metrics import timed
+from retrieval import (
+    POOLING_MODES, CandidateStore, CatalogLoadError, CatalogRecordError, CatalogSnapshot, EmbeddingStore, IndexConfig,
+    JobColumns, ScoredPairLog, SimilarityCalibration, configure_search, embedding_key, embedding_model_name,
+    index_version, iter_job_catalog, iter_job_records, job_digest, job_faiss_id, normalize_skill, pool_similarities,
+    pooling_key, prepare_vectors, search_similarities, write_job_catalog
+)
+from retrieval.index import IndexBuilder, search_parameters, training_sample
+from retrieval.store import file_fingerprint
+from retrieval.skills import reciprocal_rank_fusion
+from utils import chunked, safe_parse_llm_json
 from dotenv import load_dotenv
+import config
 
 # Load environment variables
 load_dotenv()
 
-def load_job_catalog():
-    """Load job catalog from JSON file"""
+DEFAULT_MATCH_ANALYSIS = {
+    "confidence_score": 0.5,
+    "reasoning": "Unable to analyze match due to parsing error"
+}
+
+SCORING_MODES = ("per_job", "batched")
+
+# Called with (position in the returned list, result) as each match result is ready
+ResultCallback = Optional[Callable[[int, MatchResult], None]]
+RETRIEVAL_MODES = ("dense", "hybrid")
+
+
+def match_status(confidence_score: float) -> MatchStatus:
+    """Route a confidence score to its match status"""
+    if confidence_score >= 0.9:
+        return MatchStatus.AUTO_MATCHED
+    if confidence_score >= 0.6:
+        return MatchStatus.RECRUITER_REVIEW
+    return MatchStatus.REJECTED
+
+
+def job_text(job: JobPosting) -> str:
+    """Text embedded for a job posting"""
+    return f"{job.title}\n{job.description}\nRequired: {', '.join(s.name for s in job.required_skills)}"
+
+
+def candidate_text(profile: CandidateProfile) -> str:
+    """Text embedded for a candidate profile"""
+    return f"{profile.title}\n{profile.summary or ''}\nSkills: {', '.join(s.name for s in profile.skills)}"
+
+
+def stream_writer() -> Optional[Callable[[Dict], None]]:
+    """LangGraph's custom stream writer when called from a graph node, else None"""
     try:
-        # Get the directory of the current file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        # Navigate to the data directory
-        data_dir = os.path.join(os.path.dirname(current_dir), 'data')
-        catalog_path = os.path.join(data_dir, 'job_catalog.json')
-        
-        with open(catalog_path, 'r') as f:
-            data = json.load(f)
-        
-        jobs = []
-        for job_data in data['jobs']:
-            # Convert skills to Skill objects
-            required_skills = [Skill(**skill) for skill in job_data.get('required_skills', [])]
-            preferred_skills = [Skill(**skill) for skill in job_data.get('preferred_skills', [])]
-            
-            job = JobPosting(
-                id=job_data['id'],
-                title=job_data['title'],
-                description=job_data['description'],
-                required_skills=required_skills,
-                preferred_skills=preferred_skills,
-                min_experience_years=job_data['min_experience_years']
-            )
-            jobs.append(job)
-        
-        return jobs
-    except Exception as e:
-        print(f"Error loading job catalog: {e}")
-        # Fallback to sample jobs
-        return [
-            JobPosting(
-                id="job1",
-                title="Senior Backend Engineer",
-                required_skills=[Skill(name="Python", level="expert"), Skill(name="PostgreSQL", level="intermediate")],
-                preferred_skills=[Skill(name="AWS", level="intermediate")],
-                min_experience_years=5,
-                description="Build scalable backend services..."
-            ),
-            JobPosting(
-                id="job2",
-                title="ML Engineer",
-                required_skills=[Skill(name="Python", level="expert"), Skill(name="PyTorch", level="intermediate")],
-                preferred_skills=[Skill(name="AWS", level="intermediate")],
-                min_experience_years=3,
-                description="Develop ML models..."
-            )
-        ]
+        return get_stream_writer()
+    except RuntimeError:
+        return None
+
+
+def resume_chunk_chars(embeddings: Embeddings) -> int:
+    """RESUME_CHUNK_CHARS, capped so no piece is longer than the embedding backend reads"""
+    return max(1, min(config.RESUME_CHUNK_CHARS, getattr(embeddings, "max_chars", None) or config.RESUME_CHUNK_CHARS))
+
+
+def select_positions(screened: List[Optional[MatchResult]], top_k: int) -> List[int]:
+    """
+    Positions of the retrieved items to return, in retrieval order; clear pre-screen
+    rejections only fill places no other retrieved item can take
+    """
+    rejected = [i for i, result in enumerate(screened) if result is not None and result.status == MatchStatus.REJECTED]
+    excluded = set(rejected)
+    keep = [i for i in range(len(screened)) if i not in excluded][:top_k]
+    return sorted(keep + rejected[:top_k - len(keep)])
+
+
+def parse_batch_scores(content: str, jobs: List[JobPosting]) -> Dict[str, Tuple[float, str]]:
+    """Validated (confidence_score, reasoning) per job id from a batched scoring response; invalid entries are dropped"""
+    data = safe_parse_llm_json(content, {})
+    entries = data.get("matches") if isinstance(data, dict) else data
+    if not isinstance(entries, list):
+        return {}
+
+    job_ids = {job.id for job in jobs}
+    scores = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or entry.get("job_id") not in job_ids:
+            continue
+        try:
+            confidence_score = float(entry["confidence_score"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        reasoning = entry.get("reasoning")
+        if not 0.0 <= confidence_score <= 1.0 or not isinstance(reasoning, str) or not reasoning.strip():
+            continue
+        scores[entry["job_id"]] = (confidence_score, reasoning)
+    return scores
+
+
+def report_catalog_errors(path: str, errors: List[CatalogRecordError], limit: int = 10):
+    """Print skipped catalog records, the first few in full"""
+    if not errors:
+        return
+    print(f"Skipped {len(errors)} invalid records in job catalog {path}")
+    for error in errors[:limit]:
+        print(f"  {error}")
+
+
+def load_job_catalog(catalog_path: str = None, errors: List[CatalogRecordError] = None) -> List[JobPosting]:
+    """Load every valid posting of a JSON, JSON Lines or chunked catalog; invalid records are reported and skipped"""
+    catalog_path = catalog_path or config.JOB_CATALOG_PATH
+    errors = [] if errors is None else errors
+    jobs = list(iter_job_catalog(catalog_path, errors))
+    report_catalog_errors(catalog_path, errors)
+    return jobs
+
+
+def save_job_catalog(jobs: Iterable[JobPosting], catalog_path: str = None):
+    """Atomically write the job catalog back to its file, in the file's format"""
+    write_job_catalog(jobs, catalog_path or config.JOB_CATALOG_PATH, config.CATALOG_CHUNK_SIZE)
+
 
 class MatchAgent:
     def __init__(
         self,
         model: Annotated[ChatOpenAI, "OpenAI model for matching"] = None,
-        embeddings: Annotated[OpenAIEmbeddings, "OpenAI embeddings model"] = None
+        embeddings: Annotated[Embeddings, "Embeddings model: OpenAI or a local backend"] = None,
+        max_concurrency: Annotated[int, "Maximum concurrent LLM scoring calls"] = None,
+        scoring_timeout: Annotated[float, "Timeout in seconds for one LLM scoring call"] = None,
+        scoring_mode: Annotated[str, "per_job or batched LLM scoring"] = None,
+        prescore: Annotated[bool, "Pre-screen a wider candidate set by skill overlap before LLM scoring"] = None,
+        retrieval_mode: Annotated[str, "dense or hybrid (dense fused with the skill index) retrieval"] = None,
+        store: Annotated[EmbeddingStore, "On-disk job embedding cache"] = None,
+        catalog_path: Annotated[str, "Path to the job catalog: JSON, JSON Lines or chunked binary"] = None,
+        index_config: Annotated[IndexConfig, "FAISS index backend and parameters"] = None,
+        embedding_batcher: Annotated[EmbeddingBatcher, "Micro-batcher for candidate embeddings"] = None,
+        search_executor: Annotated[BoundedExecutor, "Pool for blocking index searches"] = None,
+        cache: Annotated[ResultCache, "Stage result cache for candidate embeddings and matches"] = None,
+        candidates: Annotated[CandidateStore, "Store of matched candidates, searched to rank candidates for a job"] = None
     ):
-        self.model = model or ChatOpenAI(model="gpt-4-turbo-preview")
-        self.embeddings = embeddings or OpenAIEmbeddings(model="text-embedding-3-small")
-        self.jobs = load_job_catalog()
-        self._init_index()
-
-    def _init_index(self):
-        """Initialize FAISS index with job embeddings"""
-        self.job_texts = [
-            f"{job.title}\n{job.description}\nRequired: {', '.join(s.name for s in job.required_skills)}"
-            for job in self.jobs
-        ]
-        
-        embeddings = self.embeddings.embed_documents(self.job_texts)
-        dimension = len(embeddings[0])
-        
-        self.index = faiss.IndexFlatL2(dimension)
-        self.index.add(np.array(embeddings, dtype=np.float32))
+        self.model = model or get_chat_model()
+        self.embeddings = embeddings or get_embeddings()
+        self.max_concurrency = max(1, max_concurrency or config.MATCH_MAX_CONCURRENCY)
+        self.scoring_timeout = scoring_timeout or config.MATCH_SCORING_TIMEOUT
+        self.scoring_mode = scoring_mode or config.MATCH_SCORING_MODE
+        if self.scoring_mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode '{self.scoring_mode}', expected one of {', '.join(SCORING_MODES)}")
+        self.prescore = config.MATCH_PRESCORE if prescore is None else prescore
+        self.retrieval_mode = retrieval_mode or config.RETRIEVAL_MODE
+        if self.retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode '{self.retrieval_mode}', expected one of {', '.join(RETRIEVAL_MODES)}")
+        self.hybrid_rrf_k = config.HYBRID_RRF_K
+        self.prescore_candidate_factor = max(1, config.PRESCORE_CANDIDATE_FACTOR)
+        self.prescore_reject_below = config.PRESCORE_REJECT_BELOW
+        self.prescore_max_experience_gap = config.PRESCORE_MAX_EXPERIENCE_GAP
+        self.prescore_auto_match_above = config.PRESCORE_AUTO_MATCH_ABOVE
+        if store is None and config.EMBEDDING_CACHE_DIR:
+            store = EmbeddingStore(config.EMBEDDING_CACHE_DIR, embedding_model_name(self.embeddings))
+        self.store = store
+        self.embedding_model = embedding_model_name(self.embeddings)
+        self.embedding_batcher = embedding_batcher or EmbeddingBatcher(self.embeddings)
+        self.search_executor = search_executor or get_executor("search")
+        self.scoring_key = f"{model_fingerprint(self.model)}|{self.scoring_mode}"
+        if self.prescore:
+            self.scoring_key += (f"|prescore:{self.prescore_candidate_factor},{self.prescore_reject_below},"
+                                 f"{self.prescore_max_experience_gap},{self.prescore_auto_match_above}")
+        self.scoring_key += f"|{self.retrieval_mode}"
+        self.resume_max_chunks = max(0, config.RESUME_MAX_CHUNKS)
+        # Pieces longer than the backend's input limit would be truncated before they are embedded
+        self.resume_chunk_chars = resume_chunk_chars(self.embeddings)
+        self.chunk_pooling = config.RESUME_CHUNK_POOLING
+        if self.chunk_pooling not in POOLING_MODES:
+            raise ValueError(f"Unknown chunk pooling '{self.chunk_pooling}', expected one of {', '.join(POOLING_MODES)}")
+        # Chunking changes the similarities retrieval, the floor and the calibration see
+        self.pooling_key = pooling_key(self.resume_max_chunks, self.resume_chunk_chars, self.chunk_pooling)
+        if self.resume_max_chunks:
+            self.scoring_key += f"|{self.pooling_key}"
+        self.cache = cache or get_result_cache()
+        self.index_config = index_config or IndexConfig.from_env()
+        if candidates is None and config.CANDIDATE_STORE_PATH:
+            candidates = CandidateStore(config.CANDIDATE_STORE_PATH, self.embedding_model, ttl=config.CANDIDATE_STORE_TTL,
+                                        metric=self.index_config.metric)
+        self.candidates = candidates
+        self.catalog_path = catalog_path or config.JOB_CATALOG_PATH
+        self.similarity_floor = config.MATCH_MIN_SIMILARITY
+        self.calibration = SimilarityCalibration.load(
+            config.SIMILARITY_CALIBRATION_PATH, self.embedding_model, self.index_config.metric, self.pooling_key
+        )
+        self.scored_pairs = (ScoredPairLog(config.SIMILARITY_LOG_PATH, config.SIMILARITY_LOG_MAX_BYTES)
+                             if config.SIMILARITY_LOG_PATH else None)
+        if self.similarity_floor > -1:
+            self.scoring_key += f"|floor:{self.similarity_floor}"
+        if self.calibration:
+            self.scoring_key += f"|calibration:{self.calibration.version}"
+        self.catalog_chunk_size = max(1, config.CATALOG_CHUNK_SIZE)
+        # Records skipped by the last catalog load or reload
+        self.catalog_errors: List[CatalogRecordError] = []
+        self._update_lock = threading.Lock()
+        # The catalog is loaded and indexed on first use (or by an explicit warmup), not here
+        self._load_lock = threading.Lock()
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self.load_seconds: Optional[float] = None
 
-    async def get_matches(self, state: GraphState, top_k: int = 5) -> List[MatchResult]:
-        """Find top job matches for a candidate"""
-        profile = state.candidate_profile
-        
-        # Create candidate embedding
-        candidate_text = f"{profile.title}\n{profile.summary or ''}\nSkills: {', '.join(s.name for s in profile.skills)}"
-        candidate_embedding = self.embeddings.embed_query(candidate_text)
-        
-        # Search similar jobs
-        D, I = self.index.search(np.array([candidate_embedding], dtype=np.float32), top_k)
-        
-        matches = []
-        for idx in I[0]:
-            job = self.jobs[idx]
-            
-            # Get detailed match analysis from LLM
-            messages = [
-                HumanMessage(content=f"""
+    @property
+    def ready(self) -> bool:
+        """Whether the catalog snapshot is loaded, so requests won't wait for it"""
+        return self._snapshot is not None
+
+    def load(self) -> CatalogSnapshot:
+        """Load or build the catalog snapshot if it isn't yet; concurrent callers wait for a single load"""
+        if self._snapshot is None:
+            with self._load_lock:
+                if self._snapshot is None:
+                    start = time.perf_counter()
+                    self._snapshot = self._build_snapshot(*self._load_catalog())
+                    self.load_seconds = time.perf_counter() - start
+        return self._snapshot
+
+    async def aload(self) -> CatalogSnapshot:
+        """load() from async code: the first load runs in a worker thread so the event loop keeps serving"""
+        if self._snapshot is not None:
+            return self._snapshot
+        return await asyncio.to_thread(self.load)
+
+    @property
+    def snapshot(self) -> CatalogSnapshot:
+        """Current catalog snapshot, loaded on first access; hold on to it for a consistent view across a request"""
+        return self.load()
+
+    @property
+    def jobs(self) -> List[JobPosting]:
+        return list(self.snapshot.jobs.values())
+
+    @property
+    def index(self) -> faiss.Index:
+        return self.snapshot.index
+
+    def _embed_job_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed job texts, going through the on-disk store when available"""
+        if self.store is None:
+            return np.array(self.embeddings.embed_documents(texts), dtype=np.float32)
+        return self.store.embed_documents(texts, self.embeddings.embed_documents)
+
+    def _catalog_fingerprint(self) -> Optional[str]:
+        """Content hash of the catalog file when its columns can be kept in the store"""
+        if self.store is None or not os.path.exists(self.catalog_path):
+            return None
+        return file_fingerprint(self.catalog_path)
+
+    def _read_catalog(self) -> Tuple[JobColumns, np.ndarray]:
+        """
+        Stream the catalog file into columns and embedding keys a chunk at a time,
+        so only one chunk of postings exists as objects; a later record with the
+        same posting id replaces an earlier one.
+        """
+        errors: List[CatalogRecordError] = []
+        parts, keys, records = [], [], []
+        for chunk in chunked(iter_job_records(self.catalog_path, errors), self.catalog_chunk_size):
+            jobs = [job for _, job in chunk]
+            parts.append(JobColumns.from_jobs(jobs))
+            keys.append(np.array([embedding_key(job_text(job), self.embedding_model) for job in jobs], dtype="S64"))
+            records.append(np.array([record for record, _ in chunk], dtype=np.int64))
+        if not parts:
+            report_catalog_errors(self.catalog_path, errors)
+            raise CatalogLoadError(f"No valid job postings in {self.catalog_path}")
+
+        columns, keys, records = JobColumns.concatenate(parts), np.concatenate(keys), np.concatenate(records)
+        # Last occurrence of each id, in file order
+        _, last = np.unique(columns.faiss_ids[::-1], return_index=True)
+        keep = np.sort(len(columns) - 1 - last)
+        if len(keep) < len(columns):
+            replaced = np.setdiff1d(np.arange(len(columns)), keep)
+            errors.extend(CatalogRecordError(int(records[row]), columns.text(row, "id"), "duplicate posting id, replaced by a later record")
+                          for row in replaced.tolist())
+            errors.sort(key=lambda error: error.record)
+            columns, keys = columns.take(keep), keys[keep]
+        self.catalog_errors = errors
+        report_catalog_errors(self.catalog_path, errors)
+        return columns, keys
+
+    def _load_catalog(self) -> Tuple[JobColumns, np.ndarray]:
+        """Catalog columns and embedding keys, memory-mapped from the store when this file was loaded before"""
+        fingerprint = self._catalog_fingerprint()
+        cached = self.store.load_catalog(fingerprint) if fingerprint else None
+        if cached is not None:
+            return cached
+
+        columns, keys = self._read_catalog()
+        if fingerprint:
+            self.store.save_catalog(fingerprint, columns, keys)
+        return columns, keys
+
+    def _embed_rows(self, columns: JobColumns, rows: np.ndarray) -> np.ndarray:
+        return self._embed_job_texts([job_text(columns.job(row)) for row in rows.tolist()])
+
+    def job_vectors(self, rows: np.ndarray, snapshot: CatalogSnapshot = None) -> np.ndarray:
+        """Embeddings of catalog rows, read from the embedding store when the catalog was indexed with one"""
+        snapshot = snapshot or self.snapshot
+        return self._embed_rows(snapshot.jobs, rows)
+
+    def _build_snapshot(self, columns: JobColumns, keys: np.ndarray) -> CatalogSnapshot:
+        """Initialize FAISS index with job embeddings, reusing the on-disk store when available"""
+        # The fingerprint only needs the text hashes, so a prebuilt index loads without touching vectors
+        version = index_version(columns.faiss_ids, keys, self.index_config)
+        index = self.store.load_index(version) if self.store else None
+        if index is not None:
+            configure_search(index, self.index_config)
+            return CatalogSnapshot(columns, keys, index, self.index_config)
+
+        # Embed and index a chunk at a time; only jobs whose text changed since the last build reach the API
+        chunks = [np.arange(start, min(start + self.catalog_chunk_size, len(columns)))
+                  for start in range(0, len(columns), self.catalog_chunk_size)]
+        builder = IndexBuilder(self.index_config, len(columns))
+        if builder.needs_training and self.store is not None:
+            # Embed everything into the store first, so training sees a sample of the whole catalog
+            for rows in chunks:
+                self._embed_rows(columns, rows)
+            sample = training_sample(len(columns), self.index_config.max_train_points)
+            rows = np.arange(len(columns)) if sample is None else sample
+            builder.train(self.store.get([key.decode("ascii") for key in keys[rows]]))
+        for rows in chunks:
+            builder.add(self._embed_rows(columns, rows), columns.faiss_ids[rows])
+        index = builder.finish()
+        if self.store:
+            self.store.save_index(index, version)
+        return CatalogSnapshot(columns, keys, index, self.index_config)
+
+    def _apply_changes(self, upserts: List[JobPosting], removals: List[str], persist: bool) -> CatalogSnapshot:
+        """Embed only postings whose text changed and publish a new snapshot; caller holds the update lock"""
+        current = self.snapshot
+        jobs, keys, texts = {}, {}, {}
+        for job in upserts:
+            faiss_id = job_faiss_id(job.id)
+            text = job_text(job)
+            key = embedding_key(text, self.embedding_model)
+            jobs[faiss_id] = job
+            if current.embedding_key(faiss_id) != key:
+                keys[faiss_id] = key
+                texts[faiss_id] = text
+
+        vectors = {}
+        if texts:
+            embedded = self._embed_job_texts(list(texts.values()))
+            vectors = dict(zip(texts, embedded))
+
+        snapshot = current.apply(jobs, keys, vectors, [job_faiss_id(job_id) for job_id in removals])
+        self._snapshot = snapshot
+
+        if persist:
+            previous_catalog = self._catalog_fingerprint()
+            save_job_catalog(snapshot.jobs.iter_jobs(), self.catalog_path)
+            if self.store:
+                self.store.save_index(snapshot.index, snapshot.index_version)
+                # Only this catalog's superseded files go; other workers may share the store with other catalogs
+                if current.index_version != snapshot.index_version:
+                    self.store.remove_index(current.index_version)
+                # Restarts map the updated catalog's columns instead of parsing the JSON again
+                fingerprint = self._catalog_fingerprint()
+                self.store.save_catalog(fingerprint, snapshot.jobs, snapshot.keys)
+                if previous_catalog and previous_catalog != fingerprint:
+                    self.store.remove_catalog(previous_catalog)
+        return snapshot
+
+    def add_jobs(self, jobs: List[JobPosting], persist: bool = False) -> CatalogSnapshot:
+        """Add new job postings at runtime"""
+        with self._update_lock:
+            existing = [job.id for job in jobs if job.id in self.snapshot]
+            if existing:
+                raise ValueError(f"Jobs already exist: {', '.join(existing)}")
+            return self._apply_changes(jobs, [], persist)
+
+    def update_job(self, job: JobPosting, persist: bool = False) -> CatalogSnapshot:
+        """Replace an existing job posting; it is only re-embedded if its text changed"""
+        with self._update_lock:
+            if job.id not in self.snapshot:
+                raise KeyError(job.id)
+            return self._apply_changes([job], [], persist)
+
+    def remove_jobs(self, job_ids: List[str], persist: bool = False) -> CatalogSnapshot:
+        """Remove job postings at runtime"""
+        with self._update_lock:
+            missing = [job_id for job_id in job_ids if job_id not in self.snapshot]
+            if missing:
+                raise KeyError(', '.join(missing))
+            return self._apply_changes([], job_ids, persist)
+
+    def reload_catalog(self) -> CatalogSnapshot:
+        """Apply the difference between the catalog file and the current snapshot"""
+        with self._update_lock:
+            current = self.snapshot
+            errors: List[CatalogRecordError] = []
+            # Stream the file and compare content digests, so only changed postings are held as objects
+            changed: Dict[str, JobPosting] = {}
+            seen = []
+            for _, job in iter_job_records(self.catalog_path, errors):
+                seen.append(job_faiss_id(job.id))
+                if current.digest(job.id) != job_digest(job) or job.id in changed:
+                    changed[job.id] = job
+            report_catalog_errors(self.catalog_path, errors)
+            self.catalog_errors = errors
+            if not seen:
+                raise CatalogLoadError(f"No valid job postings in {self.catalog_path}")
+            kept = np.isin(current.jobs.faiss_ids, np.array(seen, dtype=np.int64))
+            removed = [current.jobs.text(row, "id") for row in np.flatnonzero(~kept).tolist()]
+            changed = list(changed.values())
+            if not changed and not removed:
+                return current
+            return self._apply_changes(changed, removed, persist=False)
+
+    def build_match_prompt(self, profile: CandidateProfile, job: JobPosting) -> str:
+        """Build the LLM prompt for analysing one candidate/job pair"""
+        return f"""
                 Analyze the match between this candidate and job. Return a JSON with:
                 - confidence_score: 0.0-1.0 based on skill and experience match
                 - reasoning: Brief explanation of the match quality
@@ -119,33 +439,525 @@ class MatchAgent:
                 - Required Skills: {', '.join(f'{s.name} ({s.level})' for s in job.required_skills)}
                 - Preferred Skills: {', '.join(f'{s.name} ({s.level})' for s in (job.preferred_skills or []))}
                 - Min Experience: {job.min_experience_years} years
-                """)
-            ]
-            
-            response = await self.model.ainvoke(messages)
-            analysis = safe_parse_llm_json(response.content, {
-                "confidence_score": 0.5,
-                "reasoning": "Unable to analyze match due to parsing error"
-            })
-            
-            match = MatchResult(
-                candidate_profile=profile,
-                matched_job=job,
-                confidence_score=float(analysis["confidence_score"]),
-                reasoning=analysis["reasoning"],
-                status=MatchStatus.AUTO_MATCHED if analysis["confidence_score"] >= 0.9 else MatchStatus.RECRUITER_REVIEW if analysis["confidence_score"] >= 0.6 else MatchStatus.REJECTED
+                """
+
+    def build_batch_match_prompt(self, profile: CandidateProfile, jobs: List[JobPosting]) -> str:
+        """Build one LLM prompt that scores the candidate against every job, stating the candidate once"""
+        job_blocks = "\n".join(f"""
+                {number}. Job ID: {job.id}
+                - Title: {job.title}
+                - Required Skills: {', '.join(f'{s.name} ({s.level})' for s in job.required_skills)}
+                - Preferred Skills: {', '.join(f'{s.name} ({s.level})' for s in (job.preferred_skills or []))}
+                - Min Experience: {job.min_experience_years} years""" for number, job in enumerate(jobs, 1))
+        return f"""
+                Analyze the match between this candidate and each job below. Return a JSON object with a
+                "matches" array holding one entry per job, in the same order, each with:
+                - job_id: The Job ID exactly as given
+                - confidence_score: 0.0-1.0 based on skill and experience match
+                - reasoning: Brief explanation of the match quality
+                
+                Candidate:
+                - Title: {profile.title}
+                - Experience: {profile.experience_years} years
+                - Skills: {', '.join(f'{s.name} ({s.level})' for s in profile.skills)}
+                
+                Jobs:
+                {job_blocks}
+                """
+
+    def build_match_result(self, profile: CandidateProfile, job: JobPosting, confidence_score: float, reasoning: str) -> MatchResult:
+        """Clamp the score and route it to a match status"""
+        confidence_score = min(max(confidence_score, 0.0), 1.0)
+        return MatchResult(
+            candidate_profile=profile,
+            matched_job=job,
+            confidence_score=confidence_score,
+            reasoning=reasoning,
+            status=match_status(confidence_score)
+        )
+
+    async def analyze_match(self, profile: CandidateProfile, job: JobPosting, semaphore: asyncio.Semaphore) -> MatchResult:
+        """Score one candidate/job pair, falling back to the default analysis on failure"""
+        try:
+            async with semaphore:
+                messages = [HumanMessage(content=self.build_match_prompt(profile, job))]
+                response = await asyncio.wait_for(self.model.ainvoke(messages), timeout=self.scoring_timeout)
+            analysis = safe_parse_llm_json(response.content, DEFAULT_MATCH_ANALYSIS)
+            confidence_score = float(analysis["confidence_score"])
+            reasoning = analysis["reasoning"]
+        except Exception as e:
+            # A single failed or slow call only degrades this job's analysis
+            print(f"Match analysis failed for job {job.id}: {type(e).__name__}: {e}")
+            confidence_score = DEFAULT_MATCH_ANALYSIS["confidence_score"]
+            reasoning = DEFAULT_MATCH_ANALYSIS["reasoning"]
+
+        return self.build_match_result(profile, job, confidence_score, reasoning)
+
+    async def analyze_matches_batched(
+        self,
+        profile: CandidateProfile,
+        jobs: List[JobPosting],
+        semaphore: asyncio.Semaphore
+    ) -> List[MatchResult]:
+        """Score all jobs in one call; jobs missing or invalid in the response are scored one by one"""
+        scores = {}
+        try:
+            async with semaphore:
+                messages = [HumanMessage(content=self.build_batch_match_prompt(profile, jobs))]
+                response = await asyncio.wait_for(self.model.ainvoke(messages), timeout=self.scoring_timeout)
+            scores = parse_batch_scores(response.content, jobs)
+        except Exception as e:
+            print(f"Batched match analysis failed: {type(e).__name__}: {e}")
+
+        missing = [job for job in jobs if job.id not in scores]
+        if missing:
+            print(f"Batched scoring returned no valid analysis for {len(missing)} of {len(jobs)} jobs; scoring them per job")
+        fallback = await asyncio.gather(*(self.analyze_match(profile, job, semaphore) for job in missing))
+        results = {result.matched_job.id: result for result in fallback}
+        for job in jobs:
+            if job.id in scores:
+                results[job.id] = self.build_match_result(profile, job, *scores[job.id])
+        return [results[job.id] for job in jobs]
+
+    def search_width(self, top_k: int) -> int:
+        """Jobs retrieved per candidate; pre-screening looks at a wider set than it returns"""
+        return top_k * self.prescore_candidate_factor if self.prescore else top_k
+
+    def prescreen(self, profile: CandidateProfile, jobs: List[JobPosting], snapshot: CatalogSnapshot) -> List[Optional[MatchResult]]:
+        """Decide clear cases from skill overlap and experience; None marks jobs the LLM should score"""
+        scores = snapshot.skills.score_jobs(profile, [job_faiss_id(job.id) for job in jobs])
+        results = []
+        for i, job in enumerate(jobs):
+            score = float(scores.score[i])
+            gap = float(scores.experience_gap[i])
+            met, total = int(scores.required_met[i]), int(scores.required_total[i])
+            if scores.required_coverage[i] < self.prescore_reject_below or gap >= self.prescore_max_experience_gap:
+                reasoning = f"Skill pre-screen: has {met} of {total} required skills"
+                if gap > 0:
+                    reasoning += f"; {gap:g} years below the {job.min_experience_years:g}-year minimum"
+                results.append(self.build_match_result(profile, job, min(score, 0.5), reasoning))
+            elif (score >= self.prescore_auto_match_above and scores.required_coverage[i] >= 1.0
+                  and gap == 0 and profile.experience_years is not None):
+                reasoning = f"Skill pre-screen: meets all {total} required skills at the required level and the experience minimum"
+                results.append(self.build_match_result(profile, job, max(score, 0.9), reasoning))
+            else:
+                results.append(None)
+        return results
+
+    def below_floor(self, profile: CandidateProfile, job: JobPosting, similarity: Optional[float]) -> Optional[MatchResult]:
+        """A rejection for a job whose embedding similarity is under the floor, else None"""
+        if similarity is None or similarity >= self.similarity_floor:
+            return None
+        score = self.calibration.predict(similarity) if self.calibration else 0.0
+        reasoning = f"Embedding similarity {similarity:.2f} is below the {self.similarity_floor:.2f} floor"
+        return self.build_match_result(profile, job, min(score, 0.5), reasoning)
+
+    def annotate(self, result: MatchResult, similarities: Dict[int, float], similarity: float = None) -> MatchResult:
+        """Attach the job's retrieval similarity, or the given one, and its calibrated score"""
+        if similarity is None:
+            similarity = similarities.get(job_faiss_id(result.matched_job.id))
+        if similarity is not None:
+            result.similarity = similarity
+            if self.calibration:
+                result.calibrated_score = self.calibration.predict(similarity)
+        return result
+
+    async def log_scored_pairs(self, results: List[MatchResult]):
+        """Record the similarity and LLM score of scored pairs, the history calibrate.py fits on, off the event loop"""
+        if self.scored_pairs is None:
+            return
+        now = time.time()
+        records = [
+            {"similarity": result.similarity, "confidence_score": result.confidence_score, "job_id": result.matched_job.id,
+             "embedding_model": self.embedding_model, "metric": self.index_config.metric, "pooling": self.pooling_key,
+             "at": now}
+            for result in results
+            if result.similarity is not None and result.reasoning != DEFAULT_MATCH_ANALYSIS["reasoning"]
+        ]
+        if not records:
+            return
+        try:
+            await asyncio.to_thread(self.scored_pairs.append, records)
+        except Exception as e:
+            print(f"Error logging scored pairs: {str(e)}")
+
+    async def rank_matches(
+        self,
+        profile: CandidateProfile,
+        jobs: List[JobPosting],
+        top_k: int,
+        snapshot: CatalogSnapshot,
+        semaphore: asyncio.Semaphore = None,
+        on_result: ResultCallback = None,
+        similarities: Optional[Dict[int, float]] = None
+    ) -> List[MatchResult]:
+        """
+        Pick top_k of the retrieved jobs and score them, resolving clear cases without an LLM call:
+        skill pre-screen decisions and jobs below the similarity floor. `similarities` (FAISS id to
+        cosine similarity) come from `retrieve`. `on_result(position, result)` is called as each
+        result is ready, before the rest finish.
+        """
+        similarities = similarities or {}
+        screened = self.prescreen(profile, jobs, snapshot) if self.prescore else [None] * len(jobs)
+        screened = [result or self.below_floor(profile, job, similarities.get(job_faiss_id(job.id)))
+                    for result, job in zip(screened, jobs)]
+        keep = select_positions(screened, top_k)
+        for result in screened:
+            if result is not None:
+                self.annotate(result, similarities)
+
+        pending = [position for position, i in enumerate(keep) if screened[i] is None]
+        if on_result:
+            for position, i in enumerate(keep):
+                if screened[i] is not None:
+                    on_result(position, screened[i])
+        scored = await self.score_matches(
+            profile, [jobs[keep[position]] for position in pending], semaphore,
+            (lambda j, result: on_result(pending[j], self.annotate(result, similarities))) if on_result else None
+        )
+        scored = [self.annotate(result, similarities) for result in scored]
+        await self.log_scored_pairs(scored)
+        scored = iter(scored)
+        return [screened[i] or next(scored) for i in keep]
+
+    def match_key(self, must_have: Optional[List[str]] = None, resume_text: Optional[str] = None) -> str:
+        """
+        Scoring and retrieval settings, the skill filter and the resume sections
+        searched, which together decide the matches returned
+        """
+        key = self.scoring_key
+        if must_have:
+            key += f"|must:{','.join(sorted({normalize_skill(name) for name in must_have}))}"
+        chunks = self.resume_chunks(resume_text)
+        if chunks:
+            # Two uploads with the same extracted profile can still differ in their sections
+            key += f"|sections:{content_hash(chr(0).join(chunk.text for chunk in chunks))[:16]}"
+        return key
+
+    def cached_matches(
+        self,
+        profile: CandidateProfile,
+        top_k: int,
+        snapshot: CatalogSnapshot,
+        must_have: Optional[List[str]] = None,
+        resume_text: Optional[str] = None
+    ) -> Optional[List[MatchResult]]:
+        """Matches scored earlier for this profile and resume against the same catalog version and scoring model"""
+        if self.cache is None:
+            return None
+        return self.cache.get_matches(profile, snapshot.version, self.match_key(must_have, resume_text), top_k)
+
+    def cache_matches(
+        self,
+        profile: CandidateProfile,
+        top_k: int,
+        snapshot: CatalogSnapshot,
+        matches: List[MatchResult],
+        must_have: Optional[List[str]] = None,
+        resume_text: Optional[str] = None
+    ):
+        """Remember scored matches unless any analysis fell back to the default, so failures are retried"""
+        if self.cache is None or any(match.reasoning == DEFAULT_MATCH_ANALYSIS["reasoning"] for match in matches):
+            return
+        self.cache.set_matches(profile, snapshot.version, self.match_key(must_have, resume_text), top_k, matches)
+
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Vectors for the texts, embedding only those not cached in one batched call"""
+        vectors = [self.cache.get_embedding(text, self.embedding_model) if self.cache else None for text in texts]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            with timed("embedding"):
+                embedded = await self.embedding_batcher.embed_many([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+                if self.cache:
+                    self.cache.set_embedding(texts[i], self.embedding_model, vector)
+        return np.array(vectors, dtype=np.float32)
+
+    async def embed_candidates(
+        self,
+        profiles: List[CandidateProfile],
+        resume_hashes: Optional[List[Optional[str]]] = None
+    ) -> np.ndarray:
+        """Candidate profile vectors, embedded in one batched call"""
+        vectors = await self.embed_texts([candidate_text(profile) for profile in profiles])
+        await self.remember_candidates(profiles, vectors, resume_hashes)
+        return vectors
+
+    def resume_chunks(self, resume_text: Optional[str]) -> List[ResumeChunk]:
+        """Sections of the extracted resume text searched next to the profile"""
+        if not self.resume_max_chunks or not isinstance(resume_text, str):
+            return []
+        return chunk_resume(resume_text, self.resume_chunk_chars, self.resume_max_chunks)
+
+    async def embed_resumes(
+        self,
+        profiles: List[CandidateProfile],
+        resume_texts: List[Optional[str]],
+        resume_hashes: Optional[List[Optional[str]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Query vectors for many candidates from one batched embedding call: each
+        profile, then its resume chunks. Returns the vectors with each row's
+        candidate position and pooling weight.
+        """
+        texts, owners, weights = [], [], []
+        for owner, (profile, resume_text) in enumerate(zip(profiles, resume_texts)):
+            texts.append(candidate_text(profile))
+            owners.append(owner)
+            weights.append(1.0)
+            for chunk in self.resume_chunks(resume_text):
+                texts.append(chunk.text)
+                owners.append(owner)
+                weights.append(SECTION_WEIGHTS[chunk.section])
+        vectors = await self.embed_texts(texts)
+        owners = np.array(owners)
+        # The first row of each candidate is its profile vector
+        first = np.flatnonzero(np.diff(owners, prepend=-1))
+        await self.remember_candidates(profiles, vectors[first], resume_hashes)
+        return vectors, owners, np.array(weights, dtype=np.float32)
+
+    async def remember_candidates(
+        self,
+        profiles: List[CandidateProfile],
+        vectors: np.ndarray,
+        resume_hashes: Optional[List[Optional[str]]] = None
+    ):
+        """
+        Keep embedded candidates in the candidate store, keyed by their resume hash
+        when known; the SQLite write runs in a thread and a failing store never
+        fails the match
+        """
+        if self.candidates is None or not profiles:
+            return
+        try:
+            await asyncio.to_thread(self.candidates.add, profiles, vectors, resume_hashes)
+        except Exception as e:
+            print(f"Error storing candidates: {str(e)}")
+
+    async def search_ids(
+        self,
+        vectors: np.ndarray,
+        top_k: int,
+        snapshot: CatalogSnapshot,
+        allowed_ids: np.ndarray = None,
+        similarities: Optional[List[Dict[int, float]]] = None,
+        owners: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None
+    ) -> List[List[int]]:
+        """
+        Dense search for one or more candidate vectors in a single index call, optionally within allowed ids.
+        With `owners`, rows are several query vectors per candidate (see `embed_resumes`), pooled into one
+        ranking per candidate. When given, `similarities` receives each ranking's FAISS id to cosine
+        similarity mapping.
+        """
+        vectors = prepare_vectors(vectors, snapshot.index_config)
+        search = snapshot.index.search
+        if allowed_ids is not None:
+            # The id selector is checked inside the scan, so filtered-out postings are never ranked
+            params = search_parameters(snapshot.index, snapshot.index_config, allowed_ids)
+            search = functools.partial(snapshot.index.search, params=params)
+        # FAISS releases the GIL, so the search pool keeps large scans off the event loop
+        with timed("search"):
+            D, I = await self.search_executor.run(search, vectors, top_k)
+        if owners is not None:
+            pooled = pool_similarities(search_similarities(D, snapshot.index_config), I, owners, weights,
+                                       self.chunk_pooling)
+            pooled = [dict(list(found.items())[:top_k]) for found in pooled]
+            if similarities is not None:
+                similarities.extend(pooled)
+            return [list(found) for found in pooled]
+        if similarities is not None:
+            similarities.extend(
+                {int(faiss_id): float(similarity) for faiss_id, similarity in zip(row, scores) if faiss_id >= 0}
+                for row, scores in zip(I, search_similarities(D, snapshot.index_config))
             )
-            matches.append(match)
-            
+        return [[int(faiss_id) for faiss_id in row if faiss_id >= 0] for row in I]
+
+    async def search_jobs(self, vectors: np.ndarray, top_k: int, snapshot: CatalogSnapshot = None) -> List[List[JobPosting]]:
+        """Search the catalog for one or more candidate vectors in a single index call"""
+        # Search against one snapshot so concurrent catalog updates can't shift results
+        snapshot = snapshot or await self.aload()
+        return [[snapshot.jobs[faiss_id] for faiss_id in row] for row in await self.search_ids(vectors, top_k, snapshot)]
+
+    async def retrieve(
+        self,
+        profiles: List[CandidateProfile],
+        vectors: np.ndarray,
+        top_k: int,
+        snapshot: CatalogSnapshot = None,
+        must_have: Optional[List[str]] = None,
+        similarities: Optional[List[Dict[int, float]]] = None,
+        owners: Optional[np.ndarray] = None,
+        weights: Optional[np.ndarray] = None
+    ) -> List[List[JobPosting]]:
+        """
+        Candidate jobs per profile from dense search (pooled over each profile's
+        vectors when `owners` and `weights` come from `embed_resumes`), restricted to postings listing
+        every must-have skill and, in hybrid mode, fused by reciprocal rank with the
+        postings the skill index ranks best for the candidate's skills. When given,
+        `similarities` receives each profile's dense search similarities by FAISS id.
+        """
+        snapshot = snapshot or await self.aload()
+        mask = snapshot.skills.bitmap(must_have) if must_have else None
+        allowed_ids = snapshot.skills.faiss_ids[mask] if mask is not None else None
+        if allowed_ids is not None and not len(allowed_ids):
+            if similarities is not None:
+                similarities.extend({} for _ in profiles)
+            return [[] for _ in profiles]
+
+        rankings = await self.search_ids(vectors, top_k, snapshot, allowed_ids, similarities, owners, weights)
+        if self.retrieval_mode == "hybrid":
+            for i, profile in enumerate(profiles):
+                skill_ids = await self.search_executor.run(snapshot.skills.skill_candidates, profile, top_k, mask)
+                rankings[i] = reciprocal_rank_fusion([rankings[i], skill_ids], self.hybrid_rrf_k)[:top_k]
+        return [[snapshot.jobs[faiss_id] for faiss_id in ranking] for ranking in rankings]
+
+    async def score_matches(
+        self,
+        profile: CandidateProfile,
+        jobs: List[JobPosting],
+        semaphore: asyncio.Semaphore = None,
+        on_result: ResultCallback = None
+    ) -> List[MatchResult]:
+        """Get detailed match analyses from the LLM concurrently; results keep the retrieval order"""
+        semaphore = semaphore or asyncio.Semaphore(self.max_concurrency)
+        if self.scoring_mode == "batched" and len(jobs) > 1:
+            results = await self.analyze_matches_batched(profile, jobs, semaphore)
+            if on_result:
+                for position, result in enumerate(results):
+                    on_result(position, result)
+            return results
+
+        async def analyze(position: int, job: JobPosting) -> MatchResult:
+            result = await self.analyze_match(profile, job, semaphore)
+            if on_result:
+                on_result(position, result)
+            return result
+
+        return list(await asyncio.gather(*(analyze(position, job) for position, job in enumerate(jobs))))
+
+    async def get_matches(self, state: GraphState, top_k: int = 5, on_result: ResultCallback = None) -> List[MatchResult]:
+        """Find top job matches for a candidate, passing each result to `on_result` as soon as it is scored"""
+        profile = state.candidate_profile
+        must_have = state.must_have_skills
+        snapshot = await self.aload()
+        cached = self.cached_matches(profile, top_k, snapshot, must_have, state.resume_text)
+        if cached is not None:
+            if on_result:
+                for position, match in enumerate(cached):
+                    on_result(position, match)
+            return cached
+        
+        # Embed the profile and resume sections, then search similar jobs; concurrent requests share embeddings calls
+        similarities = []
+        jobs = (await self.search_profiles([profile], self.search_width(top_k), snapshot, must_have, similarities,
+                                           [state.resume_text], [state.resume_hash]))[0]
+        matches = await self.rank_matches(profile, jobs, top_k, snapshot, on_result=on_result, similarities=similarities[0])
+        self.cache_matches(profile, top_k, snapshot, matches, must_have, state.resume_text)
         return matches
 
+    async def match_candidates(self, job_id: str, top_k: int = 5) -> List[MatchResult]:
+        """
+        Rank stored candidates for a catalog job: search the candidate index with the
+        job's embedded text, then pre-screen, apply the similarity floor and score each
+        pair like a resume match. Pairs are scored one per call, whatever the scoring mode.
+        """
+        if self.candidates is None:
+            raise RuntimeError("The candidate store is disabled")
+        snapshot = await self.aload()
+        job = snapshot.get(job_id)
+        # The text the catalog index was built from, so the vector usually comes from the embedding store
+        with timed("embedding"):
+            vector = await asyncio.to_thread(self._embed_job_texts, [job_text(job)])
+        similarities = []
+        with timed("search"):
+            found = (await self.search_executor.run(self.candidates.search, vector, self.search_width(top_k),
+                                                    similarities))[0]
+        similarity = [similarities[0].get(cid) for cid, _ in found]
+
+        screened = [self.prescreen(profile, [job], snapshot)[0] if self.prescore else None for _, profile in found]
+        screened = [result or self.below_floor(profile, job, similarity[i])
+                    for i, (result, (_, profile)) in enumerate(zip(screened, found))]
+        keep = select_positions(screened, top_k)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def score(i: int) -> MatchResult:
+            result = self.annotate(screened[i] or await self.analyze_match(found[i][1], job, semaphore), {}, similarity[i])
+            result.candidate_id = found[i][0]
+            return result
+
+        results = list(await asyncio.gather(*(score(i) for i in keep)))
+        await self.log_scored_pairs([results[position] for position, i in enumerate(keep) if screened[i] is None])
+        return results
+
+    async def search_profiles(
+        self,
+        profiles: List[CandidateProfile],
+        top_k: int,
+        snapshot: CatalogSnapshot = None,
+        must_have: Optional[List[str]] = None,
+        similarities: Optional[List[Dict[int, float]]] = None,
+        resume_texts: Optional[List[Optional[str]]] = None,
+        resume_hashes: Optional[List[Optional[str]]] = None
+    ) -> List[List[JobPosting]]:
+        """
+        Embed many candidates in batched embed_documents calls and search them in one index call.
+        With `resume_texts`, each candidate's resume sections are embedded and searched with its profile;
+        `resume_hashes` key the candidates in the candidate store.
+        """
+        if not profiles:
+            return []
+        if resume_texts is not None and self.resume_max_chunks:
+            vectors, owners, weights = await self.embed_resumes(profiles, resume_texts, resume_hashes)
+            return await self.retrieve(profiles, vectors, top_k, snapshot, must_have, similarities, owners, weights)
+        vectors = await self.embed_candidates(profiles, resume_hashes)
+        return await self.retrieve(profiles, vectors, top_k, snapshot, must_have, similarities)
+
+    async def match_profiles(
+        self,
+        profiles: List[CandidateProfile],
+        top_k: int = 5,
+        must_have: Optional[List[str]] = None,
+        resume_texts: Optional[List[Optional[str]]] = None
+    ) -> List[List[MatchResult]]:
+        """
+        Match many candidates at once: one embed_documents call and one multi-query
+        index search for the whole batch, with LLM scoring sharing one concurrency limit.
+        `resume_texts`, one per profile, adds each resume's sections to its search.
+        """
+        snapshot = await self.aload()
+        cache_texts = resume_texts if resume_texts is not None else [None] * len(profiles)
+        results = [self.cached_matches(profile, top_k, snapshot, must_have, resume_text)
+                   for profile, resume_text in zip(profiles, cache_texts)]
+        pending = [i for i, matches in enumerate(results) if matches is None]
+
+        similarities = []
+        jobs_per_profile = await self.search_profiles(
+            [profiles[i] for i in pending], self.search_width(top_k), snapshot, must_have, similarities,
+            [resume_texts[i] for i in pending] if resume_texts is not None else None
+        )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        scored = iter(await asyncio.gather(*(
+            self.rank_matches(profiles[i], jobs, top_k, snapshot, semaphore, similarities=profile_similarities)
+            for i, jobs, profile_similarities in zip(pending, jobs_per_profile, similarities)
+        )))
+        for i, profile in enumerate(profiles):
+            if results[i] is None:
+                results[i] = next(scored)
+                self.cache_matches(profile, top_k, snapshot, results[i], must_have, cache_texts[i])
+        return results
+
     async def __call__(self, state: GraphState) -> GraphState:
         """LangGraph node implementation"""
         if state.error or not state.candidate_profile:
             return state
 
         try:
-            matches = await self.get_matches(state)
+            # In a streamed graph run, each scored job is also streamed as soon as it is ready
+            writer = stream_writer()
+            on_result = (lambda position, match: writer({"position": position, "match": match})) if writer else None
+            matches = await self.get_matches(state, state.top_k, on_result=on_result)
             state.job_matches = matches
             state.current_step = "qa"
             return state
@@ -2,6 +2,7 @@ from typing import Annotated
 import json
 from langchain_core.messages import HumanMessage
 from langchain_openai import ChatOpenAI
+from llm import get_chat_model
 from models import GraphState, MatchStatus
 from utils import safe_parse_llm_json
 from dotenv import load_dotenv
@@ -39,7 +40,7 @@ Return a JSON object with:
 
 class QAAgent:
     def __init__(self, model: Annotated[ChatOpenAI, "OpenAI model for QA"] = None):
-        self.model = model or ChatOpenAI(model="gpt-4-turbo-preview")
+        self.model = model or get_chat_model()
 
     def format_candidate_profile(self, state: GraphState) -> str:
         """Format candidate profile for QA review"""
@@ -1,24 +1,104 @@
-from typing import List
-from fastapi import APIRouter, File, UploadFile, HTTPException
+from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from fastapi import APIRouter, File, Header, UploadFile, HTTPException, Query, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from io import BytesIO
 
-from graph import create_talent_match_graph
-from models import GraphState, MatchResult
+from agents.match import MatchAgent
+from graph import BatchMatcher, MatchStreamer, create_talent_match_graph
+from models import BatchMatchResult, GraphState, JobPosting, MatchJob, MatchResult
+from llm import get_chat_model
+from pipeline import MatchQueue, QueueFullError, get_executor, get_result_cache
+from pipeline.metrics import registry, server_timing
+import config
+from retrieval import CatalogLoadError
 
 # Create router
 router = APIRouter()
 
-# Create workflow graph
-graph = create_talent_match_graph()
+# Create workflow graph around a shared match agent so the admin endpoints can update its catalog.
+# Construction is cheap: the catalog is loaded by warm_up() or on the first request that needs it
+match_agent = MatchAgent()
+graph = create_talent_match_graph(match_agent=match_agent)
+batch_matcher = BatchMatcher(match_agent=match_agent)
+match_streamer = MatchStreamer(match_agent=match_agent)
+
+
+async def run_match_job(content: bytes, must_have: Optional[List[str]]) -> List[MatchResult]:
+    """Run the workflow for a queued upload; a workflow error or an empty result fails the job"""
+    final_state = await graph.ainvoke(GraphState(resume_text=content, must_have_skills=must_have))
+    if isinstance(final_state, dict):
+        error, matches = final_state.get('error'), final_state.get('job_matches')
+    else:
+        error, matches = final_state.error, final_state.job_matches
+    if error:
+        raise ValueError(error)
+    if not matches:
+        raise ValueError("No matching jobs found")
+    return matches
+
+
+# Workers are started by the app lifespan (or the first submit) and stopped on shutdown
+match_queue = MatchQueue(run_match_job)
+
+
+def cache_entries():
+    cache = get_result_cache()
+    entries = {"llm": get_chat_model().stats()["entries"]}
+    if cache:
+        entries["result"] = len(cache.backend)
+    if match_agent.candidates is not None:
+        entries["candidates"] = len(match_agent.candidates)
+    return entries
+
+
+# Seconds spent in each startup phase, and the error that stopped warmup, if any
+startup: Dict[str, Any] = {"import_seconds": None, "catalog_seconds": None, "ingest_pool_seconds": None, "error": None}
+
+
+async def warm_up():
+    """Load the catalog and index, then start the ingest pool, off the event loop while the app already serves"""
+    try:
+        start = time.perf_counter()
+        await match_agent.aload()
+        startup["catalog_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        await asyncio.to_thread(get_executor("ingest").warmup)
+        startup["ingest_pool_seconds"] = time.perf_counter() - start
+    except Exception as e:
+        startup["error"] = str(e)
+        print(f"Warmup failed: {str(e)}")
+
+
+registry.gauge("talentmatch_startup_seconds", "Seconds spent in each startup phase", "phase",
+               lambda: {phase: seconds for phase, seconds in startup.items() if isinstance(seconds, float)})
+# Reported once the queue is in use, so scrapes don't create its database
+registry.gauge("talentmatch_match_queue_jobs", "Match queue jobs by status", "status",
+               lambda: match_queue.store.counts() if match_queue.opened else {})
+registry.gauge("talentmatch_cache_entries", "Entries held by the LLM and stage result caches and the candidate store", "cache", cache_entries)
+
+
+def is_supported_upload(upload: UploadFile) -> bool:
+    """Accept both PDF and text files for testing"""
+    return bool(upload.content_type) and (
+        'pdf' in upload.content_type.lower() or 'text' in upload.content_type.lower()
+    )
 
 @router.post("/match/resume", response_model=List[MatchResult])
-async def match_resume(resume: UploadFile = File(...)):
+async def match_resume(
+    response: Response,
+    resume: UploadFile = File(...),
+    must_have: Optional[List[str]] = Query(None)
+):
     """
-    Upload a resume PDF and get matching job recommendations
+    Upload a resume PDF and get matching job recommendations, optionally only among
+    postings that list every `must_have` skill. With SERVER_TIMING enabled the
+    response carries a Server-Timing header with per-stage and per-operation times
     """
     try:
         # Validate file type - accept both PDF and text files for testing
-        if not resume.content_type or ('pdf' not in resume.content_type.lower() and 'text' not in resume.content_type.lower()):
+        if not is_supported_upload(resume):
             raise HTTPException(
                 status_code=400, 
                 detail="Invalid file type. Please upload a PDF or text file."
@@ -34,7 +114,8 @@ async def match_resume(resume: UploadFile = File(...)):
         
         # Initialize graph state with raw PDF bytes
         state = GraphState(
-            resume_text=content
+            resume_text=content,
+            must_have_skills=must_have
         )
         
         # Run workflow
@@ -43,6 +124,10 @@ async def match_resume(resume: UploadFile = File(...)):
         except Exception as workflow_error:
             raise HTTPException(status_code=500, detail=f"Workflow execution failed: {str(workflow_error)}")
         
+        metrics = final_state.get('metrics') if isinstance(final_state, dict) else final_state.metrics
+        if config.SERVER_TIMING and metrics:
+            response.headers["Server-Timing"] = server_timing(metrics)
+
         # Handle both dict and GraphState objects
         if isinstance(final_state, dict):
             if final_state.get('error'):
@@ -63,4 +148,266 @@ async def match_resume(resume: UploadFile = File(...)):
         raise HTTPException(
             status_code=500,
             detail=f"Failed to process resume: {str(e)}"
-        ) 
\ No newline at end of file
+        ) 
+
+@router.post("/match/resume/stream")
+async def match_resume_stream(
+    resume: UploadFile = File(...),
+    top_k: int = Query(5, ge=1, le=50),
+    must_have: Optional[List[str]] = Query(None),
+    format: Optional[str] = Query(None, pattern="^(sse|ndjson)$"),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Upload a resume and stream progress while it is matched: a `stage` event as
+    ingest, extract, classify and match finish, a `match` event per job as soon as
+    its analysis is scored, then `complete` with the final ranking (or `error`).
+
+    Events are Server-Sent Events with `format=sse` or `Accept: text/event-stream`,
+    NDJSON lines otherwise.
+    """
+    if not is_supported_upload(resume):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a PDF or text file.")
+    content = await resume.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Empty file uploaded")
+    sse = format == "sse" or (format is None and "text/event-stream" in (accept or ""))
+
+    async def events():
+        async for event in match_streamer.stream(content, top_k=top_k, must_have=must_have):
+            data = event.model_dump_json(exclude_none=True)
+            yield f"event: {event.event}\ndata: {data}\n\n" if sse else data + "\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        # Proxies must pass events through as they are written
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/match/jobs", response_model=MatchJob, status_code=202)
+async def submit_match_job(
+    resume: UploadFile = File(...),
+    must_have: Optional[List[str]] = Query(None),
+    priority: int = Query(0, ge=-100, le=100)
+):
+    """
+    Queue a resume for matching and return its job id at once; poll `GET /match/jobs/{job_id}`
+    for the result. Higher `priority` jobs run first; 429 when the queue is full
+    """
+    if not is_supported_upload(resume):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload a PDF or text file.")
+    content = await resume.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Empty file uploaded")
+    try:
+        return await match_queue.submit(content, filename=resume.filename, must_have=must_have, priority=priority)
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+
+
+@router.get("/match/jobs/{job_id}", response_model=MatchJob)
+async def get_match_job(job_id: str):
+    """
+    Status of a queued match job, with its matches once it has succeeded
+    """
+    job = await match_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Match job not found: {job_id}")
+    return job
+
+
+@router.delete("/match/jobs/{job_id}", status_code=204)
+async def cancel_match_job(job_id: str):
+    """
+    Cancel a match job that hasn't started yet
+    """
+    if await match_queue.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Match job not found: {job_id}")
+    if not await match_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail="Match job has already started")
+
+
+@router.post("/match/resumes")
+async def match_resumes(
+    resumes: List[UploadFile] = File(...),
+    top_k: int = Query(5, ge=1, le=50),
+    must_have: Optional[List[str]] = Query(None)
+):
+    """
+    Upload many resumes and stream back one NDJSON line of job matches per resume.
+
+    Candidates are embedded and searched in batches, and each line is written as
+    soon as that resume's scoring completes, so lines arrive out of upload order;
+    `index` is the resume's position in the upload.
+    """
+    rejected = []
+    inputs = []
+    positions = []
+    for position, resume in enumerate(resumes):
+        content = await resume.read() if is_supported_upload(resume) else None
+        if not content:
+            error = "Empty file uploaded" if content is not None else "Invalid file type. Please upload a PDF or text file."
+            rejected.append(BatchMatchResult(index=position, filename=resume.filename, error=error))
+        else:
+            inputs.append((resume.filename, content))
+            positions.append(position)
+
+    async def results():
+        for result in rejected:
+            yield result.model_dump_json() + "\n"
+        async for result in batch_matcher.match_resumes(inputs, top_k=top_k, must_have=must_have):
+            result.index = positions[result.index]
+            yield result.model_dump_json() + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.get("/match/job/{job_id}", response_model=List[MatchResult])
+async def match_job(job_id: str, top_k: int = Query(5, ge=1, le=50)):
+    """
+    Rank candidates from earlier resume matches for a catalog job.
+
+    The job's embedded text is searched against the candidate store, and each
+    candidate is scored and routed to a match status as in `/match/resume`;
+    `candidate_id` identifies the stored candidate.
+    """
+    try:
+        matches = await match_agent.match_candidates(job_id, top_k)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    if not matches:
+        raise HTTPException(status_code=404, detail="No matching candidates found")
+    return matches
+
+
+@router.delete("/candidates/{candidate_id}", status_code=204)
+def remove_candidate(candidate_id: str):
+    """
+    Remove a candidate from the candidate store
+    """
+    if match_agent.candidates is None or not match_agent.candidates.remove(candidate_id):
+        raise HTTPException(status_code=404, detail=f"Candidate not found: {candidate_id}")
+
+
+@router.get("/ready")
+async def ready():
+    """
+    Readiness: 200 once the job catalog and index are loaded, 503 while warmup is still running or failed.
+    Reports the time each startup phase took
+    """
+    body = {"ready": match_agent.ready, "startup": startup}
+    if not match_agent.ready:
+        return JSONResponse(body, status_code=503)
+    snapshot = match_agent.snapshot
+    body.update(jobs=len(snapshot), catalog_version=snapshot.version)
+    return body
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Stage and operation latency histograms, LLM token counts, cache hit/miss counts
+    and queue gauges in the Prometheus text format
+    """
+    # Gauges count rows in the SQLite caches and queue, so they are read off the event loop
+    return PlainTextResponse(await asyncio.to_thread(registry.render), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/metrics/embedding-batcher")
+async def embedding_batcher_metrics():
+    """
+    Candidate embedding micro-batcher configuration, queue depth and batch statistics
+    """
+    return match_agent.embedding_batcher.stats()
+
+
+@router.get("/metrics/result-cache")
+async def result_cache_metrics():
+    """
+    Stage result cache backend, size and hit/miss counts per stage
+    """
+    cache = get_result_cache()
+    return await asyncio.to_thread(cache.stats) if cache else {"backend": None}
+
+
+@router.get("/metrics/match-queue")
+async def match_queue_metrics():
+    """
+    Match queue workers, jobs per status and completed/failed counts
+    """
+    return await asyncio.to_thread(match_queue.stats)
+
+
+@router.get("/metrics/llm-cache")
+async def llm_cache_metrics():
+    """
+    Shared chat client memoization: cache size, hits, misses and coalesced in-flight prompts
+    """
+    return get_chat_model().stats()
+
+
+@router.get("/admin/jobs", response_model=List[JobPosting])
+def list_jobs():
+    """
+    List the job postings currently indexed
+    """
+    return match_agent.jobs
+
+
+@router.post("/admin/jobs", response_model=List[JobPosting], status_code=201)
+def add_jobs(jobs: List[JobPosting]):
+    """
+    Add job postings; only the new postings are embedded and inserted into the index
+    """
+    try:
+        match_agent.add_jobs(jobs, persist=True)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return jobs
+
+
+@router.put("/admin/jobs/{job_id}", response_model=JobPosting)
+def update_job(job_id: str, job: JobPosting):
+    """
+    Replace a job posting; it is only re-embedded if its title, description or required skills changed
+    """
+    if job.id != job_id:
+        raise HTTPException(status_code=400, detail="Job id in path and body do not match")
+    try:
+        match_agent.update_job(job, persist=True)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.delete("/admin/jobs/{job_id}", status_code=204)
+def remove_job(job_id: str):
+    """
+    Remove a job posting from the index
+    """
+    try:
+        match_agent.remove_jobs([job_id], persist=True)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+
+@router.post("/admin/jobs/reload")
+def reload_jobs():
+    """
+    Pick up edits made directly to the catalog file without restarting; invalid records are skipped and listed
+    """
+    try:
+        snapshot = match_agent.reload_catalog()
+    except CatalogLoadError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    errors = match_agent.catalog_errors
+    return {
+        "jobs": len(snapshot),
+        "version": snapshot.version,
+        "invalid_records": len(errors),
+        "errors": [error._asdict() for error in errors[:100]]
+    }
@@ -0,0 +1,76 @@
+import argparse
+import json
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from build_index import add_index_arguments, parse_index_config
+from retrieval import EmbeddingStore, IndexConfig, evaluate_indexes
+
+
+def synthetic_vectors(count: int, dimension: int, clusters: int = 256, seed: int = 0) -> np.ndarray:
+    """Clustered unit vectors, closer to real embedding distributions than uniform noise"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def parse_list(value: str) -> list:
+    return [int(v) for v in value.split(",") if v]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall vs latency of ANN index backends against exact flat search")
+    parser.add_argument("--size", type=int, default=100_000, help="Synthetic catalog size")
+    parser.add_argument("--dim", type=int, default=1536, help="Synthetic embedding dimension")
+    parser.add_argument("--from-store", metavar="MODEL", help="Use vectors cached in EMBEDDING_CACHE_DIR for this embedding model")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--kinds", default="ivf_flat,ivf_pq,hnsw")
+    parser.add_argument("--nprobe-sweep", default="1,4,16,64", help="IVF nprobe values to report")
+    parser.add_argument("--ef-search-sweep", default="16,64,256", help="HNSW efSearch values to report")
+    parser.add_argument("--out", help="Write the report as JSON")
+    add_index_arguments(parser)
+    args = parser.parse_args()
+
+    if args.from_store:
+        store = EmbeddingStore(config.EMBEDDING_CACHE_DIR, args.from_store)
+        vectors = store.get(list(store.rows))
+    else:
+        vectors = synthetic_vectors(args.size, args.dim)
+
+    # Queries are perturbed catalog vectors, like candidates that resemble existing postings
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.integers(0, len(vectors), args.queries)]
+    queries = queries + 0.1 * rng.standard_normal(queries.shape).astype(np.float32)
+
+    base = parse_index_config(args)
+    index_configs = [IndexConfig(kind="flat")]
+    for kind in args.kinds.split(","):
+        if kind in ("ivf_flat", "ivf_pq"):
+            index_configs += [base.model_copy(update={"kind": kind, "nprobe": n}) for n in parse_list(args.nprobe_sweep)]
+        elif kind == "hnsw":
+            index_configs += [base.model_copy(update={"kind": kind, "ef_search": n}) for n in parse_list(args.ef_search_sweep)]
+
+    report = evaluate_indexes(vectors, queries, index_configs, k=args.k)
+
+    recall_key = f"recall_at_{args.k}"
+    print(f"{len(vectors)} vectors x {vectors.shape[1]} dims, {len(queries)} queries")
+    print(f"{'index':<24}{'nprobe/ef':>10}{recall_key:>14}{'p50 ms':>10}{'p95 ms':>10}{'MiB':>10}{'build s':>10}")
+    for row in report:
+        knob = row["nprobe"] or row["ef_search"] or ""
+        build = f"{row['build_seconds']:.2f}" if row["build_seconds"] is not None else ""
+        print(f"{row['index']:<24}{knob:>10}{row[recall_key]:>14.3f}{row['latency_ms_p50']:>10.3f}"
+              f"{row['latency_ms_p95']:>10.3f}{row['memory_bytes'] / 2 ** 20:>10.1f}{build:>10}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"size": len(vectors), "dimension": int(vectors.shape[1]), "report": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
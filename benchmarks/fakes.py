@@ -0,0 +1,166 @@
+"""
+Deterministic local stand-ins for ChatOpenAI and OpenAIEmbeddings, so the
+pipeline can be benchmarked and tested without network access or an API key.
+
+Both take a configurable latency; answers depend only on the prompt text.
+"""
+import asyncio
+import hashlib
+import json
+import re
+import time
+from typing import List
+import numpy as np
+from langchain_core.messages import AIMessage
+
+WORD = re.compile(r"[a-z0-9+#./-]+")
+RESUME_FIELD = re.compile(r"\b(Title|Experience|Skills|Education|Summary):")
+SKILLS_LINE = re.compile(r"^\s*-?\s*(?:Required )?Skills:\s*(.*)$", re.MULTILINE)
+
+
+def stable_seed(text: str) -> int:
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+
+
+def skill_names(listing: str) -> set:
+    """Lower-cased names of a prompt's "Python (expert), Go (None)" skill listing"""
+    return {re.sub(r"\s*\(.*?\)\s*$", "", part).strip().lower() for part in listing.split(",") if part.strip()}
+
+
+class FakeChatModel:
+    """
+    Answers the pipeline's prompts the way a well-behaved model would.
+
+    Resume validation gets VALID, profile extraction parses the labelled
+    resumes `benchmarks.synthetic.make_resume` writes, and match scoring gives
+    the share of the job's required skills the candidate lists. Each call
+    sleeps `latency` seconds plus up to `jitter` seconds (fixed per prompt),
+    and reports token usage at roughly four characters per token.
+    """
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, model_name: str = "fake-chat"):
+        self.latency = latency
+        self.jitter = jitter
+        self.model_name = model_name
+        self.temperature = 0
+        self.calls = 0
+
+    async def ainvoke(self, messages, **kwargs) -> AIMessage:
+        prompt = "\n".join(str(message.content) for message in messages)
+        delay = self.latency + self.jitter * (stable_seed(prompt) % 1000) / 1000
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(prompt)
+
+    def invoke(self, messages, **kwargs) -> AIMessage:
+        prompt = "\n".join(str(message.content) for message in messages)
+        time.sleep(self.latency)
+        return self._respond(prompt)
+
+    def _respond(self, prompt: str) -> AIMessage:
+        self.calls += 1
+        if "valid resume" in prompt:
+            content = "VALID"
+        elif "Resume text:" in prompt:
+            content = json.dumps(self.extract_profile(prompt.split("Resume text:", 1)[1]))
+        elif '"matches" array' in prompt:
+            content = json.dumps({"matches": self.score_batch(prompt)})
+        elif "Analyze the match" in prompt:
+            score = self.score(prompt)
+            content = json.dumps({"confidence_score": score, "reasoning": f"Covers {score:.0%} of the required skills"})
+        else:
+            content = "{}"
+        usage = {"input_tokens": len(prompt) // 4, "output_tokens": len(content) // 4}
+        usage["total_tokens"] = usage["input_tokens"] + usage["output_tokens"]
+        return AIMessage(content=content, usage_metadata=usage)
+
+    @staticmethod
+    def extract_profile(text: str) -> dict:
+        """
+        Profile fields from a name followed by `Title:`, `Experience: N years`,
+        `Skills: a (level), b`, `Education:` and `Summary:` fields; ingest may
+        have joined the lines, so fields are found by label
+        """
+        parts = RESUME_FIELD.split(text.strip())
+        fields = {parts[i]: parts[i + 1].strip() for i in range(1, len(parts) - 1, 2)}
+        experience = re.search(r"[\d.]+", fields.get("Experience", ""))
+        skills = []
+        for part in fields.get("Skills", "").split(","):
+            match = re.match(r"\s*(.+?)\s*(?:\((\w+)\))?\s*$", part)
+            if match and match.group(1):
+                skills.append({"name": match.group(1), "level": match.group(2)})
+        summary = re.split(r"\s*\bEXPERIENCE\b", fields.get("Summary", ""))[0]
+        return {
+            "name": parts[0].strip() or "Unknown",
+            "title": fields.get("Title", "Engineer"),
+            "skills": skills,
+            "experience_years": float(experience.group()) if experience else None,
+            "education": [fields["Education"]] if "Education" in fields else [],
+            "summary": summary or None
+        }
+
+    @staticmethod
+    def _overlap(candidate: set, required: set) -> float:
+        return round(len(candidate & required) / len(required), 3) if required else 0.5
+
+    def score(self, prompt: str) -> float:
+        listings = SKILLS_LINE.findall(prompt)
+        if len(listings) < 2:
+            return 0.5
+        return self._overlap(skill_names(listings[0]), skill_names(listings[1]))
+
+    def score_batch(self, prompt: str) -> List[dict]:
+        candidate_part, _, jobs_part = prompt.partition("Jobs:")
+        listings = SKILLS_LINE.findall(candidate_part)
+        candidate = skill_names(listings[0]) if listings else set()
+        matches = []
+        for block in re.split(r"\n\s*\d+\. Job ID: ", jobs_part)[1:]:
+            job_id = block.splitlines()[0].strip()
+            required = SKILLS_LINE.findall(block)
+            score = self._overlap(candidate, skill_names(required[0]) if required else set())
+            matches.append({"job_id": job_id, "confidence_score": score, "reasoning": f"Covers {score:.0%} of the required skills"})
+        return matches
+
+
+class FakeEmbeddings:
+    """
+    Hashed bag-of-words vectors: texts sharing words are close, so dense
+    retrieval behaves like a (weak) real model. Each call sleeps `latency`
+    seconds plus `per_text_latency` per text.
+    """
+
+    def __init__(self, dimensions: int = 256, latency: float = 0.0, per_text_latency: float = 0.0, model: str = "fake-embedding"):
+        self.dimensions = dimensions
+        self.latency = latency
+        self.per_text_latency = per_text_latency
+        self.model = model
+        self.calls = 0
+        self.texts = 0
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for word in WORD.findall(text.lower()):
+            seed = stable_seed(word)
+            vector[seed % self.dimensions] += 1.0 if (seed >> 32) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _delay(self, count: int) -> float:
+        self.calls += 1
+        self.texts += count
+        return self.latency + self.per_text_latency * count
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        delay = self._delay(len(texts))
+        if delay:
+            time.sleep(delay)
+        return [self._vector(text).tolist() for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        delay = self._delay(len(texts))
+        if delay:
+            await asyncio.sleep(delay)
+        return [self._vector(text).tolist() for text in texts]
@@ -0,0 +1,110 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+from langchain_core.messages import AIMessage
+from agents.ingest import IngestAgent, extract_resume_text
+from models import GraphState
+from benchmarks.synthetic import make_pdf
+from pipeline import BoundedExecutor
+
+
+class InlineIngestAgent(IngestAgent):
+    """The previous behaviour: PDF parsing runs directly on the event loop"""
+
+    async def __call__(self, state: GraphState) -> GraphState:
+        state.resume_text = extract_resume_text(state.resume_text)
+        return state
+
+
+class ValidatingModel:
+    """Stand-in for the resume validation LLM call"""
+
+    async def ainvoke(self, messages):
+        return AIMessage(content="VALID")
+
+
+async def measure(agent: IngestAgent, pdf: bytes, probes: int, probe_interval: float) -> dict:
+    """
+    Latency of small concurrent requests while a large PDF is being ingested.
+
+    Small requests are scheduled at fixed times and their latency is measured
+    from the scheduled time, so time spent waiting for a blocked event loop counts.
+    """
+    small_resume = b"Jane Doe\nSenior Software Engineer\nSKILLS\nPython, AWS"
+    loop = asyncio.get_running_loop()
+
+    async def small_request(scheduled: float) -> float:
+        await asyncio.sleep(max(0.0, scheduled - loop.time()))
+        await agent(GraphState(resume_text=small_resume))
+        return loop.time() - scheduled
+
+    # Start the pool workers so their start-up isn't attributed to the first size
+    if not isinstance(agent, InlineIngestAgent):
+        agent.executor.warmup()
+    await agent(GraphState(resume_text=small_resume))
+
+    start = loop.time()
+    small = [asyncio.ensure_future(small_request(start + 0.01 + i * probe_interval)) for i in range(probes)]
+    large = asyncio.ensure_future(agent(GraphState(resume_text=pdf)))
+    await large
+    large_seconds = loop.time() - start
+    latencies = await asyncio.gather(*small)
+
+    return {
+        "large_pdf_seconds": large_seconds,
+        "small_p50_ms": 1000 * statistics.median(latencies),
+        "small_max_ms": 1000 * max(latencies),
+    }
+
+
+async def run(sizes: list, modes: list, probes: int, probe_interval: float, workers: int) -> list:
+    results = []
+    for mode in modes:
+        if mode == "inline":
+            agent = InlineIngestAgent(model=ValidatingModel())
+        else:
+            agent = IngestAgent(
+                model=ValidatingModel(), executor=BoundedExecutor("ingest", kind=mode, max_workers=workers)
+            )
+        for pages in sizes:
+            pdf = make_pdf(pages)
+            row = {"mode": mode, "pages": pages, "pdf_bytes": len(pdf)}
+            row.update(await measure(agent, pdf, probes, probe_interval))
+            results.append(row)
+            print(f"{mode:<8}{pages:>6} pages  large {row['large_pdf_seconds']:7.2f}s  "
+                  f"small p50 {row['small_p50_ms']:8.1f}ms  max {row['small_max_ms']:8.1f}ms")
+        if mode != "inline":
+            agent.executor.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Latency of small ingest requests while a large PDF is parsed, inline vs pooled"
+    )
+    parser.add_argument("--pages", default="10,50,200", help="Comma-separated large PDF sizes")
+    parser.add_argument("--modes", default="inline,thread,process")
+    parser.add_argument("--workers", type=int, default=4, help="Pool workers for thread/process modes")
+    parser.add_argument("--probes", type=int, default=20, help="Small requests per size")
+    parser.add_argument("--probe-interval", type=float, default=0.02, help="Seconds between small requests")
+    parser.add_argument("--out", help="Write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(
+        [int(p) for p in args.pages.split(",")], args.modes.split(","), args.probes, args.probe_interval, args.workers
+    ))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+
+import numpy as np
+import config
+
+SCENARIOS = ("throughput", "nodes", "index")
+
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q)) if values else 0.0
+
+
+def summarize(values) -> dict:
+    return {"p50": percentile(values, 50), "p95": percentile(values, 95), "max": max(values, default=0.0)}
+
+
+def peak_rss_mib() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+
+
+def make_agent(args, catalog_path: str, cache_dir: str):
+    """MatchAgent over fake models, with its embedding store in `cache_dir`"""
+    from agents.match import MatchAgent
+    from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+    from build_index import parse_index_config
+    from llm import CachedChatModel
+    from retrieval import EmbeddingStore
+    from retrieval.store import embedding_model_name
+
+    if args.embeddings == "hashing":
+        from llm import HashingEmbeddings
+        embeddings = HashingEmbeddings(dimensions=args.dim, workers=args.embed_workers)
+    else:
+        embeddings = FakeEmbeddings(dimensions=args.dim, latency=args.embed_latency)
+    # The client wrapper records LLM latency and tokens; without a backend every call reaches the model
+    model = CachedChatModel(FakeChatModel(latency=args.llm_latency, jitter=args.llm_jitter))
+    store = EmbeddingStore(cache_dir, embedding_model_name(embeddings))
+    return MatchAgent(model=model, embeddings=embeddings, catalog_path=catalog_path,
+                      index_config=parse_index_config(args), store=store)
+
+
+async def run_pipeline(args, catalog_path: str, cache_dir: str, concurrency_levels: list) -> list:
+    """End-to-end resumes per second and latency through the LangGraph workflow at each concurrency"""
+    from benchmarks.synthetic import make_resumes
+    from graph import create_talent_match_graph
+    from models import GraphState
+
+    agent = make_agent(args, catalog_path, cache_dir)
+    graph = create_talent_match_graph(match_agent=agent, model=agent.model)
+    resumes = make_resumes(args.resumes, seed=args.seed)
+    results = []
+    for concurrency in concurrency_levels:
+        semaphore = asyncio.Semaphore(concurrency)
+        runs = []
+
+        async def run_one(content: bytes):
+            async with semaphore:
+                start = time.perf_counter()
+                state = await graph.ainvoke(GraphState(resume_text=content))
+                runs.append((time.perf_counter() - start, state))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(run_one(content) for _, content in resumes))
+        wall = time.perf_counter() - start
+
+        metrics = [state["metrics"] for _, state in runs]
+        stages = sorted({stage for m in metrics for stage in m.stages})
+        operations = sorted({op for m in metrics for op in m.operations})
+        row = {
+            "concurrency": concurrency,
+            "resumes": len(resumes),
+            "errors": sum(bool(state.get("error")) for _, state in runs),
+            "wall_seconds": wall,
+            "resumes_per_second": len(resumes) / wall,
+            "latency_seconds": summarize([seconds for seconds, _ in runs]),
+            "stage_seconds": {stage: summarize([m.stages.get(stage, 0.0) for m in metrics]) for stage in stages},
+            "operation_seconds": {op: summarize([m.operations.get(op, 0.0) for m in metrics]) for op in operations},
+            "llm_calls_per_resume": statistics.mean(m.calls.get("llm", 0) for m in metrics),
+            "input_tokens_per_resume": statistics.mean(m.input_tokens for m in metrics),
+            "output_tokens_per_resume": statistics.mean(m.output_tokens for m in metrics),
+        }
+        results.append(row)
+        print(f"concurrency {concurrency:>4}: {row['resumes_per_second']:8.1f} resumes/s  "
+              f"p50 {1000 * row['latency_seconds']['p50']:8.1f}ms  p95 {1000 * row['latency_seconds']['p95']:8.1f}ms  "
+              f"{row['errors']} errors")
+    return results
+
+
+def measure_index(args, size: int, workdir: str) -> dict:
+    """Catalog write, cold index build and warm (memory-mapped) restart at one catalog size; runs in a fresh process"""
+    import faiss
+    # Imported before timing so the load measures catalog and index work only
+    import agents.match
+    import benchmarks.fakes
+    from benchmarks.synthetic import make_jobs
+    from retrieval import write_job_catalog
+    from retrieval.index import index_memory_bytes
+
+    config.CATALOG_CHUNK_SIZE = args.chunk_size
+    catalog_path = os.path.join(workdir, f"catalog-{size}.jsonl")
+    cache_dir = os.path.join(workdir, f"cache-{size}")
+    phase = "warm" if os.path.exists(cache_dir) else "cold"
+    write_seconds = None
+    if phase == "cold":
+        start = time.perf_counter()
+        write_job_catalog(make_jobs(size, seed=args.seed), catalog_path, args.chunk_size)
+        write_seconds = time.perf_counter() - start
+    rss_before = peak_rss_mib()
+    start = time.perf_counter()
+    agent = make_agent(args, catalog_path, cache_dir)
+    snapshot = agent.load()
+    load_seconds = time.perf_counter() - start
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.standard_normal((args.queries, args.dim)).astype(np.float32)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        snapshot.index.search(query[None, :], 10)
+        latencies.append(time.perf_counter() - start)
+
+    return {
+        "size": size,
+        "phase": phase,
+        "catalog_write_seconds": write_seconds,
+        "catalog_file_mib": os.path.getsize(catalog_path) / 2 ** 20,
+        "load_seconds": load_seconds,
+        "jobs_indexed": len(snapshot),
+        "index_kind": snapshot.index_config.kind,
+        "index_mib": index_memory_bytes(snapshot.index) / 2 ** 20,
+        "columns_mib": snapshot.jobs.nbytes / 2 ** 20,
+        "peak_rss_mib": peak_rss_mib(),
+        "rss_growth_mib": peak_rss_mib() - rss_before,
+        "search_ms": {key: 1000 * value for key, value in summarize(latencies).items()},
+        "faiss_threads": faiss.omp_get_max_threads(),
+    }
+
+
+def run_index(args, sizes: list, workdir: str) -> list:
+    results = []
+    spawn = multiprocessing.get_context("spawn")
+    for size in sizes:
+        # Each phase in a fresh process, so peak RSS belongs to that size alone
+        for _ in ("cold", "warm"):
+            with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+                row = pool.submit(measure_index, args, size, workdir).result()
+            results.append(row)
+            print(f"{row['size']:>9} jobs {row['phase']:>4}: load {row['load_seconds']:8.2f}s  "
+                  f"index {row['index_mib']:8.1f} MiB  columns {row['columns_mib']:8.1f} MiB  "
+                  f"peak RSS {row['peak_rss_mib']:8.1f} MiB  search p50 {row['search_ms']['p50']:.3f}ms")
+    return results
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=config.ROOT_DIR).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+            "commit": commit, "timestamp": time.time()}
+
+
+def main():
+    from build_index import add_index_arguments
+
+    parser = argparse.ArgumentParser(
+        description="Offline pipeline benchmarks with a fake LLM and fake embeddings: end-to-end throughput, "
+                    "per-node latency, and index build time and memory by catalog size"
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--resumes", type=int, default=200, help="Synthetic resumes per throughput run")
+    parser.add_argument("--concurrency", default="1,8,32", help="Concurrent resumes for the throughput scenario")
+    parser.add_argument("--catalog-size", type=int, default=1000, help="Catalog size for the throughput and nodes scenarios")
+    parser.add_argument("--sizes", default="10,1000,100000", help="Catalog sizes for the index scenario, e.g. 10,1000,100000,1000000")
+    parser.add_argument("--queries", type=int, default=100, help="Searches timed per catalog size")
+    parser.add_argument("--embeddings", choices=("fake", "hashing"), default="fake",
+                        help="fake: hashed words with simulated API latency; hashing: the local hashing backend at CPU speed")
+    parser.add_argument("--embed-workers", type=int, default=config.EMBEDDING_WORKERS, help="Threads for --embeddings hashing")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimensions")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per fake LLM call")
+    parser.add_argument("--llm-jitter", type=float, default=0.1, help="Extra seconds, up to, per fake LLM call")
+    parser.add_argument("--embed-latency", type=float, default=0.02, help="Seconds per fake embedding call (--embeddings fake)")
+    parser.add_argument("--chunk-size", type=int, default=config.CATALOG_CHUNK_SIZE, help="Catalog postings indexed per chunk")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="Write results as JSON, e.g. to compare against a previous run")
+    add_index_arguments(parser)
+    args = parser.parse_args()
+
+    scenarios = args.scenarios.split(",")
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    # Every run must exercise the full pipeline rather than the stage result cache
+    config.RESULT_CACHE_BACKEND = ""
+
+    report = {"environment": environment(), "settings": vars(args), "results": {}}
+    with tempfile.TemporaryDirectory(prefix="talentmatch-bench-") as workdir:
+        if "throughput" in scenarios or "nodes" in scenarios:
+            from benchmarks.synthetic import make_jobs
+            from retrieval import write_job_catalog
+
+            catalog_path = os.path.join(workdir, "catalog.jsonl")
+            write_job_catalog(make_jobs(args.catalog_size, seed=args.seed), catalog_path)
+            cache_dir = os.path.join(workdir, "cache")
+            if "nodes" in scenarios:
+                # One resume at a time: per-node latency without queueing behind other requests
+                print("per-node latency, sequential:")
+                row = asyncio.run(run_pipeline(args, catalog_path, cache_dir, [1]))[0]
+                report["results"]["nodes"] = {"stage_seconds": row["stage_seconds"],
+                                              "operation_seconds": row["operation_seconds"],
+                                              "llm_calls_per_resume": row["llm_calls_per_resume"],
+                                              "input_tokens_per_resume": row["input_tokens_per_resume"],
+                                              "output_tokens_per_resume": row["output_tokens_per_resume"]}
+                for stage, stats in row["stage_seconds"].items():
+                    print(f"  {stage:<10} p50 {1000 * stats['p50']:8.1f}ms  p95 {1000 * stats['p95']:8.1f}ms")
+            if "throughput" in scenarios:
+                print("end-to-end throughput:")
+                report["results"]["throughput"] = asyncio.run(run_pipeline(
+                    args, catalog_path, cache_dir, [int(c) for c in args.concurrency.split(",")]
+                ))
+        if "index" in scenarios:
+            print("index build and memory:")
+            report["results"]["index"] = run_index(args, [int(s) for s in args.sizes.split(",")], workdir)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
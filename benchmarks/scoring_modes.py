@@ -0,0 +1,124 @@
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from agents.extract import SAMPLE_PROFILE
+from agents.match import DEFAULT_MATCH_ANALYSIS, MatchAgent, load_job_catalog
+from benchmarks.fakes import FakeEmbeddings
+from models import CandidateProfile
+import config
+
+
+class UsageRecorder:
+    """Wraps a chat model and records the token usage the API reports for each call"""
+
+    def __init__(self, model):
+        self.model = model
+        self.model_name = getattr(model, "model_name", "chat")
+        self.calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        response = await self.model.ainvoke(messages, **kwargs)
+        usage = getattr(response, "usage_metadata", None) or {}
+        self.calls += 1
+        self.input_tokens += usage.get("input_tokens", 0)
+        self.output_tokens += usage.get("output_tokens", 0)
+        return response
+
+
+def rank_correlation(a, b) -> float:
+    """Spearman correlation of two score lists"""
+    if len(a) < 2 or statistics.pstdev(a) == 0 or statistics.pstdev(b) == 0:
+        return float("nan")
+    ranks_a = np.argsort(np.argsort(a))
+    ranks_b = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+async def run(model_name: str, top_k: int, repeats: int, catalog_path: str) -> dict:
+    from langchain_openai import ChatOpenAI
+
+    profile = CandidateProfile(**json.loads(json.dumps(SAMPLE_PROFILE)))
+    jobs = load_job_catalog(catalog_path)
+    report = {"model": model_name, "top_k": top_k, "repeats": repeats, "modes": {}}
+    scores = {}
+
+    for mode in ("per_job", "batched"):
+        # A raw client: the shared memoized client would answer repeats from its cache
+        recorder = UsageRecorder(ChatOpenAI(model=model_name))
+        # Scoring doesn't depend on retrieval, so the index can use fake embeddings
+        agent = MatchAgent(model=recorder, embeddings=FakeEmbeddings(dimensions=16), scoring_mode=mode, catalog_path=catalog_path)
+        # Every repeat must reach the model
+        agent.cache = None
+        latencies = []
+        fallbacks = 0
+        scores[mode] = []
+        for repeat in range(repeats):
+            # Rotate through the catalog so repeats score different job sets
+            batch = [jobs[(repeat * top_k + i) % len(jobs)] for i in range(top_k)]
+            start = time.perf_counter()
+            matches = await agent.score_matches(profile, batch)
+            latencies.append(time.perf_counter() - start)
+            fallbacks += sum(m.reasoning == DEFAULT_MATCH_ANALYSIS["reasoning"] for m in matches)
+            scores[mode].append([m.confidence_score for m in matches])
+
+        report["modes"][mode] = {
+            "llm_calls": recorder.calls,
+            "input_tokens": recorder.input_tokens,
+            "output_tokens": recorder.output_tokens,
+            "latency_s_p50": statistics.median(latencies),
+            "latency_s_max": max(latencies),
+            "default_analyses": fallbacks
+        }
+        print(f"{mode:>8}: {recorder.calls} calls, {recorder.input_tokens} input / {recorder.output_tokens} output "
+              f"tokens, p50 {statistics.median(latencies):.2f}s, {fallbacks} default analyses")
+
+    correlations = [rank_correlation(a, b) for a, b in zip(scores["per_job"], scores["batched"])]
+    correlations = [c for c in correlations if not np.isnan(c)]
+    per_job = [s for run_scores in scores["per_job"] for s in run_scores]
+    batched = [s for run_scores in scores["batched"] for s in run_scores]
+    report["agreement"] = {
+        "mean_abs_score_diff": float(np.mean(np.abs(np.array(per_job) - np.array(batched)))),
+        "status_agreement": float(np.mean([
+            (a >= 0.9, a >= 0.6) == (b >= 0.9, b >= 0.6) for a, b in zip(per_job, batched)
+        ])),
+        # Undefined for job sets where either mode gave every job the same score
+        "rank_correlation_mean": float(np.mean(correlations)) if correlations else None
+    }
+    print(f"agreement: {json.dumps(report['agreement'])}")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare per-job and batched LLM match scoring: tokens, latency and score agreement"
+    )
+    parser.add_argument("--model", default=config.LLM_MODEL)
+    parser.add_argument("--top-k", type=int, default=5, help="Jobs scored per candidate")
+    parser.add_argument("--repeats", type=int, default=5, help="Job sets scored per mode")
+    parser.add_argument("--catalog", default=config.JOB_CATALOG_PATH)
+    parser.add_argument("--out", help="Write results as JSON")
+    args = parser.parse_args()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        sys.exit("OPENAI_API_KEY is required: this benchmark measures real token usage and latency")
+    # The job index is irrelevant to scoring; keep the fake vectors out of the shared embedding cache
+    config.EMBEDDING_CACHE_DIR = ""
+
+    report = asyncio.run(run(args.model, args.top_k, args.repeats, args.catalog))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Synthetic benchmark inputs: text PDFs, resumes and job catalogs of any size, reproducible from a seed"""
+import random
+from typing import Iterator, List, Tuple
+from models import JobPosting, Skill
+
+# Role families with the skills their postings and candidates draw from
+DOMAINS = {
+    "Backend": ["Python", "Go", "Java", "PostgreSQL", "Redis", "Kafka", "Django", "FastAPI", "gRPC", "Microservices"],
+    "Frontend": ["JavaScript", "TypeScript", "React", "Vue", "CSS", "Webpack", "GraphQL", "Accessibility", "Next.js"],
+    "Data": ["Python", "SQL", "Spark", "Airflow", "dbt", "Snowflake", "Pandas", "Data Modeling", "Kafka"],
+    "ML": ["Python", "PyTorch", "TensorFlow", "Machine Learning", "NLP", "MLOps", "LangChain", "Scikit-learn", "CUDA"],
+    "DevOps": ["Kubernetes", "Docker", "Terraform", "AWS", "GCP", "CI/CD", "Prometheus", "Linux", "Ansible"],
+    "Mobile": ["Swift", "Kotlin", "iOS", "Android", "React Native", "Flutter", "GraphQL", "Firebase"],
+    "Systems": ["C++", "Rust", "C", "Linux Kernel", "Assembly", "Performance Tuning", "Embedded", "Networking"],
+}
+SENIORITY = [("Junior", 0, 2), ("", 2, 5), ("Senior", 5, 9), ("Staff", 8, 14), ("Principal", 10, 18)]
+LEVELS = ["beginner", "intermediate", "advanced", "expert"]
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Wei", "Maria", "Tomás", "Aisha", "Jonas", "Yuki", "Omar", "Lena", "Ravi"]
+LAST_NAMES = ["Kim", "Okafor", "Schmidt", "Garcia", "Nguyen", "Patel", "Rossi", "Haddad", "Novak", "Silva"]
+
+
+def make_job(number: int, rng: random.Random) -> JobPosting:
+    domain = rng.choice(list(DOMAINS))
+    seniority, low, high = rng.choice(SENIORITY)
+    skills = rng.sample(DOMAINS[domain], k=min(len(DOMAINS[domain]), rng.randint(4, 7)))
+    required, preferred = skills[:rng.randint(2, 4)], skills[4:]
+    title = f"{seniority} {domain} Engineer".strip()
+    return JobPosting(
+        id=f"job-{number:07d}",
+        title=title,
+        description=f"{title} working on {', '.join(skills[:3])} for team {number % 997}.",
+        required_skills=[Skill(name=name, level=rng.choice(LEVELS[1:])) for name in required],
+        preferred_skills=[Skill(name=name, level=rng.choice(LEVELS)) for name in preferred] or None,
+        min_experience_years=float(rng.randint(low, high)) if rng.random() < 0.9 else None
+    )
+
+
+def make_jobs(count: int, seed: int = 0) -> Iterator[JobPosting]:
+    """Stream `count` postings, so million-posting catalogs never exist as one list"""
+    rng = random.Random(seed)
+    for number in range(count):
+        yield make_job(number, rng)
+
+
+def make_resume(number: int, seed: int = 0) -> str:
+    """
+    Plain-text resume in the line format benchmarks.fakes.FakeChatModel extracts
+    profiles from: name, then `Title:`, `Experience:`, `Skills:` and `Summary:` lines
+    """
+    rng = random.Random(f"{seed}:{number}")
+    domain = rng.choice(list(DOMAINS))
+    seniority, low, high = rng.choice(SENIORITY)
+    years = rng.randint(low, high)
+    skills = rng.sample(DOMAINS[domain], k=rng.randint(3, 6))
+    # Most candidates also picked up a skill or two from a neighbouring field
+    skills += rng.sample(DOMAINS[rng.choice(list(DOMAINS))], k=rng.randint(0, 2))
+    skills = list(dict.fromkeys(skills))
+    title = f"{seniority} {domain} Engineer".strip()
+    return "\n".join([
+        f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        f"Title: {title}",
+        f"Experience: {years} years",
+        f"Skills: {', '.join(f'{name} ({rng.choice(LEVELS)})' for name in skills)}",
+        f"Education: B.S. Computer Science, State University, {2024 - years}",
+        f"Summary: {title} with {years} years building products with {', '.join(skills[:3])}.",
+        "",
+        "EXPERIENCE",
+        *(f"- Delivered {rng.choice(skills)} project {i} used by {rng.randint(2, 900)}k users" for i in range(rng.randint(3, 8)))
+    ])
+
+
+def make_resumes(count: int, seed: int = 0) -> List[Tuple[str, bytes]]:
+    """(filename, content) uploads"""
+    return [(f"resume-{number}.txt", make_resume(number, seed).encode("utf-8")) for number in range(count)]
+
+
+def make_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Minimal multi-page text PDF, so the benchmark needs no PDF-writing dependency"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in range(pages):
+        lines = "".join(
+            f"(Experience item {page}.{line}: built distributed Python services on AWS and Kubernetes) Tj T* "
+            for line in range(lines_per_page)
+        )
+        stream = f"BT /F1 9 Tf 11 TL 40 800 Td {lines}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % k for k in kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
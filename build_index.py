@@ -0,0 +1,52 @@
+import argparse
+import time
+from agents.match import MatchAgent
+from retrieval import INDEX_KINDS, IndexConfig
+from retrieval.index import index_memory_bytes
+
+
+def parse_index_config(args: argparse.Namespace) -> IndexConfig:
+    """Overlay command line options on the environment configuration"""
+    overrides = {
+        field: getattr(args, field)
+        for field in IndexConfig.model_fields
+        if getattr(args, field, None) is not None
+    }
+    return IndexConfig.from_env().model_copy(update=overrides)
+
+
+def add_index_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--kind", choices=INDEX_KINDS)
+    parser.add_argument("--nlist", type=int, help="IVF inverted lists")
+    parser.add_argument("--nprobe", type=int, help="IVF lists scanned per query")
+    parser.add_argument("--pq-m", dest="pq_m", type=int, help="IVF-PQ sub-quantizers")
+    parser.add_argument("--pq-bits", dest="pq_bits", type=int, help="IVF-PQ bits per code")
+    parser.add_argument("--hnsw-m", dest="hnsw_m", type=int, help="HNSW neighbours per node")
+    parser.add_argument("--ef-construction", dest="ef_construction", type=int, help="HNSW build beam width")
+    parser.add_argument("--ef-search", dest="ef_search", type=int, help="HNSW query beam width")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Embed the job catalog and write its FAISS index to EMBEDDING_CACHE_DIR, "
+                    "so API workers memory-map it at startup"
+    )
+    parser.add_argument("--catalog", help="Job catalog JSON file (defaults to JOB_CATALOG_PATH)")
+    add_index_arguments(parser)
+    args = parser.parse_args()
+
+    index_config = parse_index_config(args)
+    start = time.perf_counter()
+    agent = MatchAgent(catalog_path=args.catalog, index_config=index_config)
+    snapshot = agent.load()
+    elapsed = time.perf_counter() - start
+
+    print(f"Indexed {len(snapshot)} jobs with {index_config.kind} ({index_config.factory_string()}) in {elapsed:.1f}s")
+    print(f"Index size: {index_memory_bytes(snapshot.index) / 2 ** 20:.1f} MiB")
+    print(f"Catalog columns: {snapshot.jobs.nbytes / 2 ** 20:.1f} MiB")
+    if agent.store:
+        print(f"Saved to {agent.store.index_path(snapshot.index_version)}")
+
+
+if __name__ == "__main__":
+    main()
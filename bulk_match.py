@@ -0,0 +1,56 @@
+import argparse
+import json
+import os
+import sys
+from typing import Iterator
+import numpy as np
+from agents.match import MatchAgent, candidate_text
+from models import CandidateProfile
+from retrieval import BulkMatcher, candidate_id
+from retrieval.bulk import CandidateBatch
+from utils import chunked
+
+
+def iter_profile_file(path: str, agent: MatchAgent, batch_size: int) -> Iterator[CandidateBatch]:
+    """Candidates from a JSON Lines file of CandidateProfile objects, embedded a batch at a time"""
+    with open(path, encoding="utf-8") as f:
+        profiles = (CandidateProfile.model_validate_json(line) for line in f if line.strip())
+        for batch in chunked(profiles, batch_size):
+            vectors = np.array(agent.embeddings.embed_documents([candidate_text(profile) for profile in batch]), dtype=np.float32)
+            yield [candidate_id(profile) for profile in batch], batch, vectors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Score every candidate against every job without LLM calls, from embedding similarity and the "
+                    "skill pre-score, and write the top matches per candidate and per job as Parquet"
+    )
+    parser.add_argument("out", help="Directory for candidate_top_jobs.parquet and job_top_candidates.parquet")
+    parser.add_argument("--profiles", help="JSON Lines file of candidate profiles (defaults to the candidate store)")
+    parser.add_argument("--catalog", help="Job catalog file (defaults to JOB_CATALOG_PATH)")
+    parser.add_argument("--top-k", type=int, default=10, help="Matches kept per candidate and per job")
+    parser.add_argument("--candidate-block", type=int, default=1024, help="Candidates scored per block")
+    parser.add_argument("--job-block", type=int, default=8192, help="Jobs scored per block")
+    parser.add_argument("--similarity-weight", type=float, default=0.5,
+                        help="Weight of embedding similarity against the skill pre-score in the ranking")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Job blocks scored in parallel; each holds its own block of pair matrices")
+    args = parser.parse_args()
+
+    agent = MatchAgent(catalog_path=args.catalog)
+    if args.profiles:
+        candidates = iter_profile_file(args.profiles, agent, args.candidate_block)
+    elif agent.candidates is not None:
+        candidates = agent.candidates.iter_batches(args.candidate_block)
+    else:
+        sys.exit("No --profiles file given and the candidate store is disabled")
+
+    snapshot = agent.load()
+    matcher = BulkMatcher(snapshot, lambda rows: agent.job_vectors(rows, snapshot), args.top_k, args.job_block,
+                          args.similarity_weight, args.workers)
+    summary = matcher.run(candidates, args.out)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
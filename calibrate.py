@@ -0,0 +1,52 @@
+import argparse
+import json
+import sys
+import numpy as np
+import config
+from agents.match import resume_chunk_chars
+from llm.client import get_embeddings
+from retrieval import IndexConfig, ScoredPairLog, SimilarityCalibration, embedding_model_name, pooling_key, suggest_floor
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit the mapping from embedding similarity to LLM confidence_score on the logged scored pairs, "
+                    "and suggest a MATCH_MIN_SIMILARITY floor"
+    )
+    parser.add_argument("--log", default=config.SIMILARITY_LOG_PATH, help="Scored pair log (defaults to SIMILARITY_LOG_PATH)")
+    parser.add_argument("--out", default=config.SIMILARITY_CALIBRATION_PATH,
+                        help="Calibration file (defaults to SIMILARITY_CALIBRATION_PATH)")
+    parser.add_argument("--embedding-model", help="Embedding model the pairs were retrieved with (defaults to the configured one)")
+    parser.add_argument("--metric", help="Index metric the pairs were retrieved with (defaults to INDEX_METRIC)")
+    parser.add_argument("--pooling", help="Query pooling the pairs were retrieved with, e.g. profile or chunks:8,1500,max "
+                                          "(defaults to the RESUME_* settings)")
+    parser.add_argument("--bins", type=int, default=50, help="Similarity quantile bins fitted")
+    parser.add_argument("--threshold", type=float, default=0.6, help="confidence_score of the pairs the floor must keep")
+    parser.add_argument("--max-missed", type=float, default=0.01, help="Share of those pairs the floor may drop")
+    args = parser.parse_args()
+
+    if not args.log:
+        sys.exit("No --log given and SIMILARITY_LOG_PATH is empty")
+    embeddings = get_embeddings()
+    embedding_model = args.embedding_model or embedding_model_name(embeddings)
+    metric = args.metric or IndexConfig.from_env().metric
+    pooling = args.pooling or pooling_key(max(0, config.RESUME_MAX_CHUNKS), resume_chunk_chars(embeddings),
+                                          config.RESUME_CHUNK_POOLING)
+    pairs = list(ScoredPairLog(args.log).read(embedding_model, metric, pooling))
+    if not pairs:
+        sys.exit(f"No scored pairs for {embedding_model} ({metric}, {pooling}) in {args.log}")
+
+    similarities, scores = (np.array(values) for values in zip(*pairs))
+    calibration = SimilarityCalibration.fit(similarities, scores, embedding_model, metric, args.bins, pooling)
+    calibration.save(args.out)
+    print(json.dumps({
+        "pairs": calibration.pairs,
+        "calibration": args.out,
+        "version": calibration.version,
+        "knots": [[round(x, 4), round(y, 4)] for x, y in zip(calibration.similarities, calibration.scores)],
+        "suggested_min_similarity": suggest_floor(similarities, scores, args.threshold, args.max_missed),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
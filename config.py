@@ -0,0 +1,146 @@
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+def env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment"""
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    """Read a float setting from the environment"""
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Job catalog: JSON, JSON Lines (.jsonl) or chunked binary (.jcat), streamed and indexed in chunks of CATALOG_CHUNK_SIZE postings
+JOB_CATALOG_PATH = os.getenv("JOB_CATALOG_PATH", os.path.join(ROOT_DIR, "data", "job_catalog.json"))
+CATALOG_CHUNK_SIZE = env_int("CATALOG_CHUNK_SIZE", 10000)
+
+# Chat model shared by all agents, with prompt-hash memoization: memory, sqlite or an empty string to disable
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4-turbo-preview")
+LLM_CACHE_BACKEND = os.getenv("LLM_CACHE_BACKEND", "memory")
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(ROOT_DIR, "data", "llm_cache.sqlite3"))
+LLM_CACHE_MAX_ENTRIES = env_int("LLM_CACHE_MAX_ENTRIES", 50000)
+LLM_CACHE_TTL = env_float("LLM_CACHE_TTL", 7 * 86400.0)
+
+# Embedding backend for job postings and candidates: openai (EMBEDDING_MODEL), hashing (local hashed
+# character n-grams of EMBEDDING_DIMENSIONS) or onnx (local sentence-transformer in EMBEDDING_ONNX_PATH)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "openai")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+EMBEDDING_DIMENSIONS = env_int("EMBEDDING_DIMENSIONS", 512)
+EMBEDDING_ONNX_PATH = os.getenv("EMBEDDING_ONNX_PATH", "")
+# Tokens the onnx model reads per text; longer texts are truncated, so resume chunks are capped to fit
+EMBEDDING_MAX_TOKENS = env_int("EMBEDDING_MAX_TOKENS", 256)
+# Local backends: texts per inference batch and batches run in parallel
+EMBEDDING_BATCH_SIZE = env_int("EMBEDDING_BATCH_SIZE", 256)
+EMBEDDING_WORKERS = env_int("EMBEDDING_WORKERS", min(4, os.cpu_count() or 1))
+
+# Match scoring
+MATCH_MAX_CONCURRENCY = env_int("MATCH_MAX_CONCURRENCY", 5)
+MATCH_SCORING_TIMEOUT = env_float("MATCH_SCORING_TIMEOUT", 30.0)
+# per_job: one LLM call per retrieved job; batched: the candidate and all top_k jobs in one call
+MATCH_SCORING_MODE = os.getenv("MATCH_SCORING_MODE", "per_job")
+
+# Skill pre-screen: score a wider FAISS candidate set locally and only send unclear cases to the LLM
+MATCH_PRESCORE = env_int("MATCH_PRESCORE", 0) == 1
+PRESCORE_CANDIDATE_FACTOR = env_int("PRESCORE_CANDIDATE_FACTOR", 3)
+PRESCORE_REJECT_BELOW = env_float("PRESCORE_REJECT_BELOW", 0.25)
+PRESCORE_MAX_EXPERIENCE_GAP = env_float("PRESCORE_MAX_EXPERIENCE_GAP", 4.0)
+PRESCORE_AUTO_MATCH_ABOVE = env_float("PRESCORE_AUTO_MATCH_ABOVE", 0.95)
+
+# Retrieval: dense (FAISS only) or hybrid (FAISS fused with skill-index candidates by reciprocal rank)
+RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense")
+HYBRID_RRF_K = env_int("HYBRID_RRF_K", 60)
+
+# Embedding micro-batching: concurrent embedding requests within the window are sent as one call
+EMBED_BATCH_MAX_SIZE = env_int("EMBED_BATCH_MAX_SIZE", 64)
+EMBED_BATCH_MAX_WAIT_MS = env_float("EMBED_BATCH_MAX_WAIT_MS", 5.0)
+EMBED_BATCH_MAX_QUEUE = env_int("EMBED_BATCH_MAX_QUEUE", 1024)
+
+# Pools for blocking work: PDF parsing ("ingest") and FAISS search ("search")
+EXECUTORS = {
+    "ingest": {
+        "kind": os.getenv("INGEST_EXECUTOR", "process"),
+        "max_workers": env_int("INGEST_WORKERS", 0) or None,
+        "max_queue": env_int("INGEST_QUEUE", 0) or None
+    },
+    "search": {
+        "kind": "thread",
+        "max_workers": env_int("SEARCH_WORKERS", 0) or None,
+        "max_queue": env_int("SEARCH_QUEUE", 0) or None
+    }
+}
+
+# PDF extraction: characters kept from a resume (prompts only use a prefix), and when to split pages across the pool
+PDF_CHAR_BUDGET = env_int("PDF_CHAR_BUDGET", 20000)
+PDF_PARALLEL_MIN_PAGES = env_int("PDF_PARALLEL_MIN_PAGES", 40)
+PDF_PAGES_PER_TASK = env_int("PDF_PAGES_PER_TASK", 10)
+
+# Batch resume matching: resumes embedded and searched together, and resumes prepared concurrently
+BATCH_CHUNK_SIZE = env_int("BATCH_CHUNK_SIZE", 64)
+BATCH_PREPARE_CONCURRENCY = env_int("BATCH_PREPARE_CONCURRENCY", 8)
+
+# Persistent job embedding cache and prebuilt FAISS indexes; set to an empty string to disable
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR",
+    os.path.join(ROOT_DIR, "data", "index_cache")
+)
+
+# FAISS index backend: flat, ivf_flat, ivf_pq or hnsw
+INDEX_KIND = os.getenv("INDEX_KIND", "flat")
+# cosine: inner product over normalized vectors, so search scores are similarities; l2: Euclidean distance
+INDEX_METRIC = os.getenv("INDEX_METRIC", "cosine")
+INDEX_NLIST = env_int("INDEX_NLIST", 1024)
+INDEX_NPROBE = env_int("INDEX_NPROBE", 16)
+INDEX_PQ_M = env_int("INDEX_PQ_M", 64)
+INDEX_PQ_BITS = env_int("INDEX_PQ_BITS", 8)
+INDEX_HNSW_M = env_int("INDEX_HNSW_M", 32)
+INDEX_EF_CONSTRUCTION = env_int("INDEX_EF_CONSTRUCTION", 200)
+INDEX_EF_SEARCH = env_int("INDEX_EF_SEARCH", 64)
+
+# Stage result cache for repeated uploads: memory (per-process LRU), sqlite (shared on disk) or an empty string to disable
+RESULT_CACHE_BACKEND = os.getenv("RESULT_CACHE_BACKEND", "memory")
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", os.path.join(ROOT_DIR, "data", "result_cache.sqlite3"))
+RESULT_CACHE_MAX_ENTRIES = env_int("RESULT_CACHE_MAX_ENTRIES", 10000)
+RESULT_CACHE_TTL = env_float("RESULT_CACHE_TTL", 86400.0)
+
+# Submit/poll match queue: in-process workers, waiting jobs allowed before submits get 429, and how long results are kept
+MATCH_QUEUE_PATH = os.getenv("MATCH_QUEUE_PATH", os.path.join(ROOT_DIR, "data", "match_queue.sqlite3"))
+MATCH_QUEUE_WORKERS = env_int("MATCH_QUEUE_WORKERS", 2)
+MATCH_QUEUE_MAX_PENDING = env_int("MATCH_QUEUE_MAX_PENDING", 100)
+MATCH_QUEUE_RESULT_TTL = env_float("MATCH_QUEUE_RESULT_TTL", 86400.0)
+# Runs of a job whose worker died before it is failed instead of requeued
+MATCH_QUEUE_MAX_ATTEMPTS = env_int("MATCH_QUEUE_MAX_ATTEMPTS", 3)
+
+# Resume sections embedded next to the profile and searched with it; RESUME_MAX_CHUNKS=0 searches on the profile only
+RESUME_MAX_CHUNKS = env_int("RESUME_MAX_CHUNKS", 8)
+RESUME_CHUNK_CHARS = env_int("RESUME_CHUNK_CHARS", 1500)
+# max: a job's best similarity to any of the candidate's vectors; mean: the section-weighted mean
+RESUME_CHUNK_POOLING = os.getenv("RESUME_CHUNK_POOLING", "max")
+
+# Jobs whose embedding similarity to the candidate is below this floor are rejected without an LLM call; -1 keeps all
+MATCH_MIN_SIMILARITY = env_float("MATCH_MIN_SIMILARITY", -1.0)
+# Every LLM-scored pair's similarity and confidence_score, for calibrate.py; off unless a path is set
+SIMILARITY_LOG_PATH = os.getenv("SIMILARITY_LOG_PATH", "")
+# Size at which the log is rotated to SIMILARITY_LOG_PATH.1; 0 lets it grow
+SIMILARITY_LOG_MAX_BYTES = env_int("SIMILARITY_LOG_MAX_BYTES", 64 * 1024 * 1024)
+# Similarity to confidence_score mapping written by calibrate.py and reported as MatchResult.calibrated_score
+SIMILARITY_CALIBRATION_PATH = os.getenv("SIMILARITY_CALIBRATION_PATH", os.path.join(ROOT_DIR, "data", "similarity_calibration.json"))
+
+# Matched candidates and their embeddings, searched to rank candidates for a job; an empty string disables the store
+CANDIDATE_STORE_PATH = os.getenv("CANDIDATE_STORE_PATH", "")
+# Seconds a stored candidate is kept; 0 keeps them until removed
+CANDIDATE_STORE_TTL = env_float("CANDIDATE_STORE_TTL", 90 * 86400.0)
+
+# Add a Server-Timing header with per-stage and per-operation durations to /match/resume responses
+SERVER_TIMING = env_int("SERVER_TIMING", 0) == 1
+
+# Load the job catalog and index in the background at startup; 0 defers it to the first request
+WARMUP_ON_STARTUP = env_int("WARMUP_ON_STARTUP", 1) == 1
@@ -0,0 +1,28 @@
+import argparse
+import sys
+from retrieval import CatalogLoadError, iter_job_catalog, write_job_catalog
+import config
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a job catalog between JSON, JSON Lines (.jsonl) and chunked binary (.jcat), "
+                    "streaming it so the catalog is never fully in memory"
+    )
+    parser.add_argument("source", help="Catalog to read")
+    parser.add_argument("target", help="Catalog to write; the format follows the extension")
+    parser.add_argument("--chunk-size", type=int, default=config.CATALOG_CHUNK_SIZE, help="Postings per binary chunk")
+    args = parser.parse_args()
+
+    errors = []
+    try:
+        write_job_catalog(iter_job_catalog(args.source, errors), args.target, args.chunk_size)
+    except CatalogLoadError as e:
+        sys.exit(f"Can't convert {args.source}: {e}")
+    for error in errors:
+        print(f"Skipped {error}")
+    print(f"Wrote {args.target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,5 @@
 from .workflow import create_talent_match_graph
+from .batch import BatchMatcher
+from .stream import MatchStreamer
 
-__all__ = ['create_talent_match_graph'] 
\ No newline at end of file
+__all__ = ['create_talent_match_graph', 'BatchMatcher', 'MatchStreamer']
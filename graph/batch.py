@@ -0,0 +1,145 @@
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple, Union
+import asyncio
+from agents.ingest import IngestAgent
+from agents.extract import ExtractAgent
+from agents.classify import ClassifyAgent
+from agents.match import MatchAgent
+from agents.qa import QAAgent
+from models import BatchMatchResult, GraphState, JobPosting, MatchResult
+from retrieval import CatalogSnapshot
+from utils import chunked
+import config
+
+# A resume to match: (filename or None, raw PDF/text bytes or text)
+ResumeInput = Tuple[Optional[str], Union[str, bytes]]
+
+
+class BatchMatcher:
+    """
+    Match many resumes without one graph invocation per resume.
+
+    Resumes run through the ingest, extract and classify nodes concurrently,
+    then each chunk is embedded with a single embed_documents call and searched
+    with a single multi-query index.search. Results are yielded per resume as
+    soon as its scoring finishes, while the next chunk is already being prepared.
+    """
+
+    def __init__(
+        self,
+        match_agent: MatchAgent = None,
+        ingest_agent: IngestAgent = None,
+        extract_agent: ExtractAgent = None,
+        classify_agent: ClassifyAgent = None,
+        qa_agent: QAAgent = None,
+        chunk_size: int = None,
+        prepare_concurrency: int = None
+    ):
+        self.match_agent = match_agent or MatchAgent()
+        self.ingest_agent = ingest_agent or IngestAgent()
+        self.extract_agent = extract_agent or ExtractAgent()
+        self.classify_agent = classify_agent or ClassifyAgent()
+        self.qa_agent = qa_agent or QAAgent()
+        self.chunk_size = max(1, chunk_size or config.BATCH_CHUNK_SIZE)
+        self.prepare_concurrency = max(1, prepare_concurrency or config.BATCH_PREPARE_CONCURRENCY)
+
+    async def _prepare(self, content: Union[str, bytes], semaphore: asyncio.Semaphore) -> GraphState:
+        """Run the per-resume nodes that precede matching"""
+        async with semaphore:
+            state = GraphState(resume_text=content)
+            for node in (self.ingest_agent, self.extract_agent, self.classify_agent):
+                state = await node(state)
+            return state
+
+    async def _prepare_chunk(self, chunk: List[Tuple[int, ResumeInput]]) -> List[GraphState]:
+        semaphore = asyncio.Semaphore(self.prepare_concurrency)
+        return list(await asyncio.gather(*(self._prepare(content, semaphore) for _, (_, content) in chunk)))
+
+    async def _finish(
+        self,
+        index: int,
+        filename: Optional[str],
+        state: GraphState,
+        top_k: int,
+        snapshot: CatalogSnapshot,
+        jobs: Optional[List[JobPosting]] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        matches: Optional[List[MatchResult]] = None,
+        similarities: Optional[Dict[int, float]] = None
+    ) -> BatchMatchResult:
+        """Score one prepared resume, unless its matches were cached, and run the QA node on it"""
+        if matches is None:
+            matches = await self.match_agent.rank_matches(state.candidate_profile, jobs, top_k, snapshot, semaphore,
+                                                          similarities=similarities)
+            self.match_agent.cache_matches(state.candidate_profile, top_k, snapshot, matches, state.must_have_skills,
+                                           state.resume_text)
+        state.job_matches = matches
+        state.current_step = "qa"
+        state = await self.qa_agent(state)
+        return BatchMatchResult(index=index, filename=filename, job_matches=state.job_matches, error=state.error)
+
+    async def match_resumes(
+        self,
+        resumes: Iterable[ResumeInput],
+        top_k: int = 5,
+        must_have: Optional[List[str]] = None
+    ) -> AsyncIterator[BatchMatchResult]:
+        """Yield a BatchMatchResult per resume, in completion order; `index` is the input position"""
+        chunks = chunked(enumerate(resumes), self.chunk_size)
+        chunk = next(chunks, None)
+        preparing = asyncio.ensure_future(self._prepare_chunk(chunk)) if chunk else None
+        scoring: List[asyncio.Future] = []
+
+        try:
+            while preparing:
+                states = await preparing
+                current = chunk
+                # Overlap preparation of the next chunk with embedding and scoring of this one
+                chunk = next(chunks, None)
+                preparing = asyncio.ensure_future(self._prepare_chunk(chunk)) if chunk else None
+
+                # One snapshot per chunk keeps the search and the cached results on the same catalog version
+                snapshot = await self.match_agent.aload()
+                ready = []
+                cached = []
+                for (index, (filename, _)), state in zip(current, states):
+                    if state.error or not state.candidate_profile:
+                        yield BatchMatchResult(index=index, filename=filename,
+                                               error=state.error or "No candidate profile extracted")
+                        continue
+                    state.must_have_skills = must_have
+                    matches = self.match_agent.cached_matches(state.candidate_profile, top_k, snapshot, must_have,
+                                                              state.resume_text)
+                    if matches is not None:
+                        cached.append(asyncio.ensure_future(
+                            self._finish(index, filename, state, top_k, snapshot, matches=matches)
+                        ))
+                    else:
+                        ready.append((index, filename, state))
+                scoring = cached
+
+                similarities = []
+                try:
+                    jobs_per_resume = await self.match_agent.search_profiles(
+                        [state.candidate_profile for _, _, state in ready], self.match_agent.search_width(top_k), snapshot,
+                        must_have, similarities, [state.resume_text for _, _, state in ready],
+                        [state.resume_hash for _, _, state in ready]
+                    )
+                except Exception as e:
+                    for index, filename, _ in ready:
+                        yield BatchMatchResult(index=index, filename=filename,
+                                               error=f"Failed to find job matches: {str(e)}")
+                    jobs_per_resume = []
+                    ready = []
+
+                semaphore = asyncio.Semaphore(self.match_agent.max_concurrency)
+                scoring = cached + [
+                    asyncio.ensure_future(self._finish(index, filename, state, top_k, snapshot, jobs, semaphore,
+                                                       similarities=resume_similarities))
+                    for (index, filename, state), jobs, resume_similarities in zip(ready, jobs_per_resume, similarities)
+                ]
+                for finished in asyncio.as_completed(scoring):
+                    yield await finished
+        finally:
+            # The consumer may stop early, e.g. when a streaming client disconnects
+            for task in scoring + ([preparing] if preparing else []):
+                task.cancel()
@@ -0,0 +1,86 @@
+from typing import AsyncIterator, List, Optional, Union
+import time
+from agents.ingest import IngestAgent
+from agents.extract import ExtractAgent
+from agents.classify import ClassifyAgent
+from agents.match import MatchAgent
+from agents.qa import QAAgent
+from models import GraphState, MatchEvent, RunMetrics
+from .workflow import STAGES, create_talent_match_graph
+
+
+class MatchStreamer:
+    """
+    Match one resume and yield progress while it runs.
+
+    Runs the compiled workflow graph with `astream`, yielding a `stage` event
+    as each node finishes. The match node streams each job's analysis as soon
+    as its scoring call returns, so the first match arrives long before the
+    slowest one.
+    """
+
+    def __init__(
+        self,
+        match_agent: MatchAgent = None,
+        ingest_agent: IngestAgent = None,
+        extract_agent: ExtractAgent = None,
+        classify_agent: ClassifyAgent = None,
+        qa_agent: QAAgent = None
+    ):
+        self.match_agent = match_agent or MatchAgent()
+        self.graph = create_talent_match_graph(
+            match_agent=self.match_agent,
+            ingest_agent=ingest_agent,
+            extract_agent=extract_agent,
+            classify_agent=classify_agent,
+            qa_agent=qa_agent
+        )
+
+    async def stream(
+        self,
+        content: Union[str, bytes],
+        top_k: int = 5,
+        must_have: Optional[List[str]] = None
+    ) -> AsyncIterator[MatchEvent]:
+        """Yield stage and match events, ending with one `complete` or `error` event"""
+        start = time.perf_counter()
+
+        def event(name: str, **fields) -> MatchEvent:
+            return MatchEvent(event=name, seconds=round(time.perf_counter() - start, 3), **fields)
+
+        state = GraphState(resume_text=content, must_have_skills=must_have, top_k=top_k, metrics=RunMetrics())
+        finished = []
+        updates = self.graph.astream(state, stream_mode=["custom", "updates", "values"])
+        try:
+            async for mode, chunk in updates:
+                if mode == "custom":
+                    yield event("match", position=chunk["position"], match=chunk["match"])
+                elif mode == "updates":
+                    finished.extend(chunk)
+                else:
+                    state = GraphState(**chunk)
+                    if not finished:
+                        continue
+                    stage = finished[-1]
+                    if state.error:
+                        yield event("error", stage=stage, error=state.error)
+                        return
+                    if stage == "classify" and not state.candidate_profile:
+                        yield event("error", stage="extract", error="No candidate profile extracted")
+                        return
+                    if stage == "qa":
+                        break
+                    yield event("stage", stage=stage)
+        except Exception as e:
+            # A node that raised instead of setting state.error
+            stage = STAGES[len(finished)] if len(finished) < len(STAGES) else STAGES[-1]
+            yield event("error", stage=stage, error=f"{stage} failed: {str(e)}")
+            return
+        finally:
+            # The consumer may stop early, e.g. when a streaming client disconnects; closing cancels the running node
+            await updates.aclose()
+
+        if not state.job_matches:
+            yield event("error", stage="match", error="No matching jobs found")
+        else:
+            yield event("complete", job_matches=state.job_matches)
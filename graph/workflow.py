@@ -6,22 +6,36 @@ from agents.classify import ClassifyAgent
 from agents.match import MatchAgent
 from agents.qa import QAAgent
 from models import GraphState
+from pipeline.metrics import timed_node
 
 # Type variable for the graph state
 S = TypeVar("S", bound=GraphState)
 
-def create_talent_match_graph() -> StateGraph:
-    """Create the talent matching workflow graph"""
+# Nodes in the order they run
+STAGES = ("ingest", "extract", "classify", "match", "qa")
+
+def create_talent_match_graph(
+    match_agent: MatchAgent = None,
+    model=None,
+    ingest_agent: IngestAgent = None,
+    extract_agent: ExtractAgent = None,
+    classify_agent: ClassifyAgent = None,
+    qa_agent: QAAgent = None
+) -> StateGraph:
+    """
+    Create the talent matching workflow graph, optionally around shared agents
+    and with one chat model for every other agent instead of the shared client
+    """
     
     # Initialize workflow graph
     workflow = StateGraph(GraphState)
     
-    # Add nodes
-    workflow.add_node("ingest", IngestAgent())
-    workflow.add_node("extract", ExtractAgent())
-    workflow.add_node("classify", ClassifyAgent())
-    workflow.add_node("match", MatchAgent())
-    workflow.add_node("qa", QAAgent())
+    # Add nodes, timed into state.metrics
+    workflow.add_node("ingest", timed_node("ingest", ingest_agent or IngestAgent(model=model)))
+    workflow.add_node("extract", timed_node("extract", extract_agent or ExtractAgent(model=model)))
+    workflow.add_node("classify", timed_node("classify", classify_agent or ClassifyAgent(model=model)))
+    workflow.add_node("match", timed_node("match", match_agent or MatchAgent(model=model)))
+    workflow.add_node("qa", timed_node("qa", qa_agent or QAAgent(model=model)))
     
     # Define edges
     workflow.add_edge("ingest", "extract")
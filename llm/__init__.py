@@ -0,0 +1,16 @@
+from .batching import EmbeddingBatcher
+from .client import CachedChatModel, create_embeddings, get_chat_model, get_embeddings, prompt_key
+from .embeddings import EMBEDDING_BACKENDS, HashingEmbeddings, LocalEmbeddings, OnnxEmbeddings
+
+__all__ = [
+    'EmbeddingBatcher',
+    'CachedChatModel',
+    'create_embeddings',
+    'get_chat_model',
+    'get_embeddings',
+    'prompt_key',
+    'EMBEDDING_BACKENDS',
+    'HashingEmbeddings',
+    'LocalEmbeddings',
+    'OnnxEmbeddings'
+]
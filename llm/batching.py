@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Set
+import asyncio
+import time
+from langchain_core.embeddings import Embeddings
+import config
+
+
+class EmbeddingBatcher:
+    """
+    Coalesce concurrent embedding requests into batched embed_documents calls.
+
+    Requests arriving within `max_wait_ms` of the first queued request, up to
+    `max_batch_size` texts, are embedded together off the event loop and each
+    caller receives its own vector. The queue is bounded by `max_queue_size`;
+    when it is full, callers wait for room instead of piling up work.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        max_batch_size: int = None,
+        max_wait_ms: float = None,
+        max_queue_size: int = None
+    ):
+        self.embeddings = embeddings
+        self.max_batch_size = max(1, max_batch_size or config.EMBED_BATCH_MAX_SIZE)
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else config.EMBED_BATCH_MAX_WAIT_MS
+        self.max_queue_size = max(1, max_queue_size or config.EMBED_BATCH_MAX_QUEUE)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._flushes: Set[asyncio.Task] = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.largest_batch = 0
+        self.errors = 0
+        self.wait_seconds = 0.0
+        self.embed_seconds = 0.0
+
+    def _ensure_worker(self):
+        """Bind the queue and worker to the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        """Embed one text as part of the next batch"""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        self.requests += 1
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed several texts; they share batches with any other concurrent callers"""
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+            while len(batch) < self.max_batch_size:
+                # Drain whatever is already queued, then wait out the window for stragglers
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Keep collecting the next batch while this one is being embedded
+            flush = loop.create_task(self._flush(batch))
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _flush(self, batch: list):
+        batch = [(text, future, queued_at) for text, future, queued_at in batch if not future.done()]
+        if not batch:
+            return
+        start = time.perf_counter()
+        self.wait_seconds += sum(start - queued_at for _, _, queued_at in batch)
+
+        # Identical texts in one batch are embedded once
+        unique_texts = list(dict.fromkeys(text for text, _, _ in batch))
+        try:
+            if hasattr(self.embeddings, "aembed_documents"):
+                vectors = await self.embeddings.aembed_documents(unique_texts)
+            else:
+                vectors = await asyncio.to_thread(self.embeddings.embed_documents, unique_texts)
+        except Exception as e:
+            self.errors += 1
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.embed_seconds += time.perf_counter() - start
+
+        self.batches += 1
+        self.batched_texts += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future, _ in batch:
+            if not future.done():
+                future.set_result(by_text[text])
+
+    def stats(self) -> Dict[str, float]:
+        """Batching configuration and counters"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_size": self.max_queue_size,
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "in_flight_batches": len(self._flushes),
+            "requests": self.requests,
+            "batches": self.batches,
+            "errors": self.errors,
+            "mean_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "mean_wait_ms": 1000 * self.wait_seconds / self.batched_texts if self.batched_texts else 0.0,
+            "mean_embed_ms": 1000 * self.embed_seconds / (self.batches + self.errors) if self.batches + self.errors else 0.0
+        }
@@ -0,0 +1,154 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import threading
+from langchain_core.embeddings import Embeddings
+from langchain_core.messages import AIMessage, BaseMessage
+from pipeline.cache import CacheBackend, create_cache_backend, model_fingerprint
+from pipeline.metrics import record_cache, record_tokens, timed
+from .embeddings import EMBEDDING_BACKENDS, HashingEmbeddings, OnnxEmbeddings
+import config
+
+
+def prompt_key(model_key: str, messages: List[BaseMessage]) -> str:
+    """Hash of the model identity and the full message list"""
+    payload = json.dumps([model_key, [[message.type, message.content] for message in messages]])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedChatModel:
+    """
+    Chat model wrapper that memoizes responses by prompt hash.
+
+    Identical prompts, such as the same candidate/job pair scored twice, are
+    answered from the cache backend instead of the API, and concurrent
+    identical prompts share one in-flight call. Failed calls are not cached.
+    """
+
+    def __init__(self, model, backend: CacheBackend = None):
+        self.model = model
+        # Callers key their own caches by model_fingerprint(), which passes through to the wrapped model
+        self.model_name = model_fingerprint(model)
+        self.backend = backend
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def _invoke(self, messages: List[BaseMessage], **kwargs: Any) -> AIMessage:
+        """Call the wrapped model, recording latency and the token usage the API reports"""
+        with timed("llm"):
+            response = await self.model.ainvoke(messages, **kwargs)
+        record_tokens(getattr(response, "usage_metadata", None))
+        return response
+
+    async def _call(self, key: str, messages: List[BaseMessage]) -> str:
+        try:
+            response = await self._invoke(messages)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._in_flight.pop(key, None)
+        self.backend.set(key, response.content)
+        return response.content
+
+    async def ainvoke(self, messages: List[BaseMessage], **kwargs: Any) -> AIMessage:
+        if self.backend is None or kwargs:
+            return await self._invoke(messages, **kwargs)
+
+        key = prompt_key(self.model_name, messages)
+        content = self.backend.get(key)
+        if content is not None:
+            self.hits += 1
+            record_cache("llm", hit=True)
+            return AIMessage(content=content)
+
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            # Answered without a call of its own, so it counts as a hit
+            self.coalesced += 1
+            record_cache("llm", hit=True)
+        else:
+            self.misses += 1
+            record_cache("llm", hit=False)
+            task = asyncio.ensure_future(self._call(key, messages))
+            self._in_flight[key] = task
+        # A caller timing out must not cancel the call other callers are waiting on
+        return AIMessage(content=await asyncio.shield(task))
+
+    def invoke(self, messages: List[BaseMessage], **kwargs: Any) -> AIMessage:
+        return self.model.invoke(messages, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "entries": len(self.backend) if self.backend else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors
+        }
+
+
+_chat_model: Optional[CachedChatModel] = None
+_chat_model_lock = threading.Lock()
+
+
+def get_chat_model() -> CachedChatModel:
+    """Chat client shared by every agent, memoized according to the LLM_CACHE_* settings"""
+    global _chat_model
+    with _chat_model_lock:
+        if _chat_model is None:
+            from langchain_openai import ChatOpenAI
+            backend = None
+            if config.LLM_CACHE_BACKEND:
+                backend = create_cache_backend(
+                    config.LLM_CACHE_BACKEND,
+                    path=config.LLM_CACHE_PATH,
+                    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+                    ttl=config.LLM_CACHE_TTL
+                )
+            _chat_model = CachedChatModel(ChatOpenAI(model=config.LLM_MODEL), backend)
+        return _chat_model
+
+
+def create_embeddings(backend: str = None) -> Embeddings:
+    """Embeddings client for an EMBEDDING_BACKEND, configured from the EMBEDDING_* settings"""
+    backend = backend or config.EMBEDDING_BACKEND
+    if backend == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        return OpenAIEmbeddings(model=config.EMBEDDING_MODEL)
+    if backend == "hashing":
+        return HashingEmbeddings(config.EMBEDDING_DIMENSIONS, batch_size=config.EMBEDDING_BATCH_SIZE,
+                                 workers=config.EMBEDDING_WORKERS)
+    if backend == "onnx":
+        if not config.EMBEDDING_ONNX_PATH:
+            raise ValueError("EMBEDDING_ONNX_PATH must point to an exported model directory for the onnx backend")
+        return OnnxEmbeddings(config.EMBEDDING_ONNX_PATH, max_length=config.EMBEDDING_MAX_TOKENS,
+                              batch_size=config.EMBEDDING_BATCH_SIZE, workers=config.EMBEDDING_WORKERS)
+    raise ValueError(f"Unknown embedding backend '{backend}', expected one of {', '.join(EMBEDDING_BACKENDS)}")
+
+
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+
+def get_embeddings() -> Embeddings:
+    """Embeddings client shared by every agent, created on first use"""
+    global _embeddings
+    with _embeddings_lock:
+        if _embeddings is None:
+            _embeddings = create_embeddings()
+        return _embeddings
+
+
+def reset_chat_model():
+    """Drop the shared client so the next get_chat_model() re-reads the configuration"""
+    global _chat_model
+    with _chat_model_lock:
+        _chat_model = None
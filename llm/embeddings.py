@@ -0,0 +1,188 @@
+from typing import List, Optional, Sequence, Tuple
+import os
+import threading
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from utils import chunked
+
+EMBEDDING_BACKENDS = ("openai", "hashing", "onnx")
+# Conservative characters per subword token, to turn a model's token limit into a text length
+CHARS_PER_TOKEN = 3
+
+# Bytes that make up words: lowercase letters, digits, + and # (C++, C#) and any non-ASCII byte
+ALNUM_BYTES = np.zeros(256, dtype=bool)
+ALNUM_BYTES[[*range(ord("a"), ord("z") + 1), *range(ord("0"), ord("9") + 1), *range(128, 256)]] = True
+WORD_BYTES = ALNUM_BYTES.copy()
+WORD_BYTES[[ord("+"), ord("#")]] = True
+
+
+def mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer, so bucket and sign bits of polynomial hashes are well spread"""
+    values = values ^ (values >> np.uint64(30))
+    values = values * np.uint64(0xBF58476D1CE4E5B9)
+    values = values ^ (values >> np.uint64(27))
+    values = values * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+class LocalEmbeddings(Embeddings):
+    """
+    CPU embeddings computed in-process. Texts are split into batches of
+    `batch_size` and the batches run on `workers` threads; subclasses
+    implement `_embed_batch`, which should spend its time in code that
+    releases the GIL (NumPy, ONNX Runtime) for the threads to pay off.
+    """
+    model: str
+    dimensions: int
+
+    def __init__(self, batch_size: int = 256, workers: int = 1):
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    def embed_array(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dimensions) float32 array of L2-normalized embeddings"""
+        batches = list(chunked(texts, self.batch_size))
+        if not batches:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        if len(batches) == 1 or self.workers == 1:
+            return np.concatenate([self._embed_batch(batch) for batch in batches])
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="embed")
+        return np.concatenate(list(self._pool.map(self._embed_batch, batches)))
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_array([text])[0].tolist()
+
+
+class HashingEmbeddings(LocalEmbeddings):
+    """
+    Hashed character n-gram and word features with sublinear term frequency,
+    no model download or network needed. Each feature is hashed to one of
+    `dimensions` buckets with a random sign, so collisions cancel out on
+    average instead of piling up. Vectors only depend on the text, not on a
+    fitted vocabulary, so cached embeddings stay valid as the catalog grows.
+
+    A batch is hashed as one byte array: the n-gram hashes of every text are
+    a few vectorized NumPy passes, and the bucket counts one `bincount`.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = 512,
+        ngram_range: Tuple[int, int] = (3, 5),
+        batch_size: int = 256,
+        workers: int = 1
+    ):
+        super().__init__(batch_size, workers)
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.model = f"hashing-char{ngram_range[0]}-{ngram_range[1]}"
+
+    def _buckets(self, hashes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        hashes = mix64(hashes)
+        signs = np.where(hashes >> np.uint64(63), -1.0, 1.0)
+        return (hashes % np.uint64(self.dimensions)).astype(np.int64), signs
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encoded = [f" {' '.join(text.lower().split())} ".encode("utf-8") for text in texts]
+        data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        owner = np.repeat(np.arange(len(texts)), [len(text) for text in encoded])
+        docs, buckets, signs = [], [], []
+
+        def add(owners: np.ndarray, hashes: np.ndarray):
+            bucket, sign = self._buckets(hashes)
+            docs.append(owners)
+            buckets.append(bucket)
+            signs.append(sign)
+
+        hashes = data.astype(np.uint64)
+        for n in range(1, self.ngram_range[1] + 1):
+            if n > 1:
+                # Rolling polynomial hash of the n bytes starting at each position
+                hashes = hashes[:-1] * np.uint64(0x100000001B3) + data[n - 1:]
+            if n >= self.ngram_range[0]:
+                # n-grams that would run into the next text are dropped
+                within = owner[:len(hashes)] == owner[n - 1:]
+                add(owner[:len(hashes)][within], hashes[within] ^ np.uint64(n))
+
+        # Whole words too, so short skill names (Go, R, C#) count beyond their n-grams
+        in_word = WORD_BYTES[data]
+        in_word[:-1] |= (data[:-1] == ord(".")) & ALNUM_BYTES[data[1:]]
+        starts = in_word & ~np.concatenate([[False], in_word[:-1]])
+        if starts.any():
+            start_positions = np.flatnonzero(starts)
+            positions = np.flatnonzero(in_word)
+            word = np.cumsum(starts)[positions] - 1
+            offsets = (positions - start_positions[word]).astype(np.uint64)
+            # A word's hash is the sum of its hashed (byte, offset) pairs
+            tokens = mix64(data[positions].astype(np.uint64) ^ (offsets << np.uint64(8)) ^ np.uint64(0xFF))
+            add(owner[start_positions], np.add.reduceat(tokens, np.flatnonzero(np.diff(word, prepend=-1))))
+
+        counts = np.bincount(
+            np.concatenate(docs) * self.dimensions + np.concatenate(buckets),
+            weights=np.concatenate(signs),
+            minlength=len(texts) * self.dimensions
+        ).reshape(len(texts), self.dimensions)
+        vectors = (np.sign(counts) * np.log1p(np.abs(counts))).astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class OnnxEmbeddings(LocalEmbeddings):
+    """
+    Sentence-transformer exported to ONNX (`model.onnx` and `tokenizer.json`
+    in `model_dir`, e.g. from `optimum-cli export onnx`), run with ONNX
+    Runtime on the CPU. Token embeddings are mean-pooled over the attention
+    mask and normalized. Needs the optional `onnxruntime` and `tokenizers`
+    packages. The output dimension is read from the model. Texts are truncated
+    to `max_length` tokens; `max_chars` is the text length that safely fits.
+    """
+
+    def __init__(self, model_dir: str, max_length: int = 256, batch_size: int = 64, workers: int = 1):
+        super().__init__(batch_size, workers)
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise ImportError("The onnx embedding backend needs `pip install onnxruntime tokenizers`") from e
+
+        self.model = f"onnx-{os.path.basename(os.path.normpath(model_dir))}"
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length)
+        self.max_chars = max_length * CHARS_PER_TOKEN
+        self.tokenizer.enable_padding()
+        options = onnxruntime.SessionOptions()
+        # Batches already run on `workers` threads; split the cores between them
+        options.intra_op_num_threads = max(1, (os.cpu_count() or 1) // self.workers)
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, "model.onnx"), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+        self.dimensions = int(self._embed_batch(["dimension probe"]).shape[1])
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        inputs = {
+            "input_ids": np.array([encoding.ids for encoding in encodings], dtype=np.int64),
+            "attention_mask": np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64),
+            "token_type_ids": np.array([encoding.type_ids for encoding in encodings], dtype=np.int64),
+        }
+        outputs = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        if outputs.ndim == 3:
+            mask = inputs["attention_mask"][:, :, None].astype(np.float32)
+            outputs = (outputs * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1.0)
+        vectors = outputs.astype(np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
@@ -1,18 +1,40 @@
+import time
+
+# Measured from before the application modules are imported
+IMPORT_START = time.perf_counter()
+
+import asyncio
 import os
+from contextlib import asynccontextmanager
 from typing import List
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from api.endpoints import router
+from api.endpoints import match_queue, router, startup, warm_up
+import config
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume match jobs queued before a restart
+    match_queue.start()
+    # Serve at once and load the catalog in the background; /ready reports when it is done
+    warmup = asyncio.ensure_future(warm_up()) if config.WARMUP_ON_STARTUP else None
+    yield
+    if warmup:
+        warmup.cancel()
+    await match_queue.stop()
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="TalentMatch API",
     description="AI-powered talent matching using LangGraph",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -26,6 +48,7 @@ app.add_middleware(
 
 # Include router
 app.include_router(router, prefix="/api/v1")
+startup["import_seconds"] = time.perf_counter() - IMPORT_START
 
 if __name__ == "__main__":
     import uvicorn
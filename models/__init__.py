@@ -1,6 +1,8 @@
 from .base import Skill, CandidateProfile
 from .job import JobPosting
-from .matching import MatchStatus, MatchResult
+from .matching import MatchStatus, MatchResult, BatchMatchResult, MatchEvent, MatchJob
+from .ingest import PageTiming, PdfExtractionReport
+from .metrics import RunMetrics
 from .state import GraphState
 
 __all__ = [
@@ -9,5 +11,11 @@ __all__ = [
     'JobPosting',
     'MatchStatus',
     'MatchResult',
+    'BatchMatchResult',
+    'MatchEvent',
+    'MatchJob',
+    'PageTiming',
+    'PdfExtractionReport',
+    'RunMetrics',
     'GraphState'
 ] 
\ No newline at end of file
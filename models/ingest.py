@@ -0,0 +1,17 @@
+from typing import List
+from pydantic import BaseModel
+
+class PageTiming(BaseModel):
+    page: int
+    chars: int
+    seconds: float
+
+class PdfExtractionReport(BaseModel):
+    """How a PDF upload was read: pages processed, whether the character budget cut it short, and per-page timings"""
+    page_count: int
+    pages_read: int
+    chars: int
+    truncated: bool
+    parallel: bool
+    seconds: float
+    pages: List[PageTiming]
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from .base import CandidateProfile
 from .job import JobPosting
@@ -13,4 +14,48 @@ class MatchResult(BaseModel):
     matched_job: JobPosting
     confidence_score: float = Field(..., ge=0.0, le=1.0)
     reasoning: str
-    status: MatchStatus 
\ No newline at end of file
+    status: MatchStatus
+    # Cosine similarity of the candidate and job embeddings, when the job came from the dense search
+    similarity: Optional[float] = None
+    # The similarity mapped onto the confidence_score scale by the fitted calibration, when one is loaded
+    calibrated_score: Optional[float] = None
+    # Set when the candidate was found in the candidate store, i.e. when ranking candidates for a job
+    candidate_id: Optional[str] = None
+
+class BatchMatchResult(BaseModel):
+    """Matches for one resume of a batch, identified by its position in the batch"""
+    index: int
+    filename: Optional[str] = None
+    job_matches: Optional[List[MatchResult]] = None
+    error: Optional[str] = None
+
+class MatchEvent(BaseModel):
+    """
+    One event of a streamed resume match: `stage` when a pipeline stage finishes,
+    `match` for each scored job as soon as it is ready (`position` is its place in
+    the final ranking), then `complete` with the final matches, or `error`
+    """
+    event: str
+    stage: Optional[str] = None
+    position: Optional[int] = None
+    match: Optional[MatchResult] = None
+    job_matches: Optional[List[MatchResult]] = None
+    error: Optional[str] = None
+    seconds: float
+
+class MatchJob(BaseModel):
+    """
+    A resume submitted to the match queue: `queued`, `running`, then `succeeded`
+    with its matches, `failed` with an error, or `cancelled` before it started.
+    `queue_position` counts the queued jobs that will run before it.
+    """
+    id: str
+    status: str
+    priority: int = 0
+    filename: Optional[str] = None
+    submitted_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    queue_position: Optional[int] = None
+    job_matches: Optional[List[MatchResult]] = None
+    error: Optional[str] = None
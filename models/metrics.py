@@ -0,0 +1,16 @@
+from typing import Dict
+from pydantic import BaseModel, Field
+
+class RunMetrics(BaseModel):
+    """
+    Where one pipeline run spent its time: seconds per graph node (`stages`) and
+    per instrumented operation inside them (`operations`: pdf, embedding, search,
+    llm, summed over `calls`), LLM token usage and cache hits/misses by cache
+    """
+    stages: Dict[str, float] = Field(default_factory=dict)
+    operations: Dict[str, float] = Field(default_factory=dict)
+    calls: Dict[str, int] = Field(default_factory=dict)
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_hits: Dict[str, int] = Field(default_factory=dict)
+    cache_misses: Dict[str, int] = Field(default_factory=dict)
@@ -2,6 +2,8 @@ from typing import Optional, List, Union
 from pydantic import BaseModel
 from .base import CandidateProfile
 from .matching import MatchResult
+from .ingest import PdfExtractionReport
+from .metrics import RunMetrics
 
 class GraphState(BaseModel):
     """State object passed between LangGraph nodes"""
@@ -9,4 +11,9 @@ class GraphState(BaseModel):
     candidate_profile: Optional[CandidateProfile] = None
     job_matches: Optional[List[MatchResult]] = None
     current_step: str = "start"
-    error: Optional[str] = None 
\ No newline at end of file
+    error: Optional[str] = None
+    pdf_extraction: Optional[PdfExtractionReport] = None
+    resume_hash: Optional[str] = None
+    must_have_skills: Optional[List[str]] = None
+    top_k: int = 5
+    metrics: Optional[RunMetrics] = None 
\ No newline at end of file
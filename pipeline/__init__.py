@@ -0,0 +1,29 @@
+from .cache import (
+    CacheBackend, MemoryLRUCache, ResultCache, SQLiteCache, content_hash, get_result_cache, model_fingerprint
+)
+from .jobs import JobStore, MatchQueue, QueueFullError
+from .executors import BoundedExecutor, get_executor, shutdown_executors
+from .pdf import PdfExtractor, extract_pdf, extract_resume_text
+from .chunking import SECTION_WEIGHTS, ResumeChunk, chunk_resume
+
+__all__ = [
+    'CacheBackend',
+    'MemoryLRUCache',
+    'SQLiteCache',
+    'ResultCache',
+    'content_hash',
+    'get_result_cache',
+    'model_fingerprint',
+    'JobStore',
+    'MatchQueue',
+    'QueueFullError',
+    'BoundedExecutor',
+    'get_executor',
+    'shutdown_executors',
+    'PdfExtractor',
+    'extract_pdf',
+    'extract_resume_text',
+    'SECTION_WEIGHTS',
+    'ResumeChunk',
+    'chunk_resume'
+]
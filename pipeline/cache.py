@@ -0,0 +1,292 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from models import CandidateProfile, MatchResult, PdfExtractionReport
+from .metrics import record_cache
+import config
+
+CACHE_BACKENDS = ("memory", "sqlite")
+
+
+def content_hash(data: Union[str, bytes]) -> str:
+    """SHA-256 of an upload; text uploads are hashed as their UTF-8 bytes"""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def model_fingerprint(model) -> str:
+    """Identify a chat model by name and sampling temperature, which both change its answers"""
+    name = getattr(model, "model_name", None) or getattr(model, "model", None) or type(model).__name__
+    temperature = getattr(model, "temperature", None)
+    return f"{name}@{temperature}" if temperature is not None else str(name)
+
+
+class CacheBackend(ABC):
+    """Key/value store for serialized stage results with optional expiry"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemoryLRUCache(CacheBackend):
+    """Per-process LRU cache; entries older than `ttl` seconds are treated as missing"""
+
+    def __init__(self, max_entries: int = 10000, ttl: float = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl or None
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str):
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """
+    On-disk cache shared by every worker process on the host.
+
+    Entries are evicted least recently used first once `max_entries` is
+    exceeded, and entries older than `ttl` seconds are treated as missing.
+    The size is checked every `evict_every` writes rather than on each one,
+    and a hit only rewrites its last-used time once that is `touch_interval`
+    seconds old, so the table may briefly run over `max_entries` and eviction
+    order is only as fine as the touch interval.
+    """
+
+    def __init__(self, path: str, max_entries: int = 10000, ttl: float = None,
+                 evict_every: int = None, touch_interval: float = 60.0):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl or None
+        self.evict_every = evict_every or max(1, self.max_entries // 100)
+        self.touch_interval = touch_interval
+        self._writes = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL, used_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_used_at ON results (used_at)")
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, stored_at, used_at FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if self.ttl and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                return None
+            if now - row[2] >= self.touch_interval:
+                self._conn.execute("UPDATE results SET used_at = ? WHERE key = ?", (now, key))
+            return row[0]
+
+    def set(self, key: str, value: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, value, stored_at, used_at) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            self._writes += 1
+            if self._writes % self.evict_every == 0:
+                self._evict()
+
+    def _evict(self):
+        """Drop the least recently used entries over `max_entries`; COUNT(*) scans the table, so writes batch it"""
+        overflow = self._count() - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY used_at LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+
+class ResultCache:
+    """
+    Per-stage cache of talent-match pipeline results.
+
+    Each stage is cached separately, so a catalog change only invalidates the
+    match results while extracted text, profiles and embeddings stay valid:
+
+    - extraction: upload hash and character budget
+    - profile: upload hash and extraction model
+    - embedding: candidate text and embedding model
+    - matches: candidate profile, catalog version, scoring model (and resume sections) and top_k
+
+    Stages after extraction are keyed by the content of the previous stage's
+    output, so they follow the upload hash without going stale if an earlier
+    stage is recomputed.
+    """
+
+    STAGES = ("extraction", "profile", "embedding", "matches")
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = {stage: 0 for stage in self.STAGES}
+        self.misses = {stage: 0 for stage in self.STAGES}
+
+    @staticmethod
+    def key(stage: str, *parts: Any) -> str:
+        digest = hashlib.sha256("\0".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+        return f"{stage}:{digest}"
+
+    def _get(self, stage: str, *parts: Any) -> Optional[Any]:
+        value = self.backend.get(self.key(stage, *parts))
+        if value is None:
+            self.misses[stage] += 1
+            record_cache(stage, hit=False)
+            return None
+        self.hits[stage] += 1
+        record_cache(stage, hit=True)
+        return json.loads(value)
+
+    def _set(self, stage: str, parts: Tuple, value: Any):
+        self.backend.set(self.key(stage, *parts), json.dumps(value))
+
+    def get_extraction(self, resume_hash: str, char_budget: int) -> Optional[Tuple[str, Optional[PdfExtractionReport]]]:
+        cached = self._get("extraction", resume_hash, char_budget)
+        if cached is None:
+            return None
+        report = cached["report"]
+        return cached["text"], PdfExtractionReport(**report) if report else None
+
+    def set_extraction(self, resume_hash: str, char_budget: int, text: str, report: Optional[PdfExtractionReport]):
+        self._set("extraction", (resume_hash, char_budget), {
+            "text": text,
+            "report": report.model_dump(mode="json") if report else None
+        })
+
+    def get_profile(self, resume_hash: str, model_key: str) -> Optional[CandidateProfile]:
+        cached = self._get("profile", resume_hash, model_key)
+        return CandidateProfile(**cached) if cached is not None else None
+
+    def set_profile(self, resume_hash: str, model_key: str, profile: CandidateProfile):
+        self._set("profile", (resume_hash, model_key), profile.model_dump(mode="json"))
+
+    def get_embedding(self, text: str, embedding_model: str) -> Optional[List[float]]:
+        return self._get("embedding", content_hash(text), embedding_model)
+
+    def set_embedding(self, text: str, embedding_model: str, vector: List[float]):
+        self._set("embedding", (content_hash(text), embedding_model), [float(x) for x in vector])
+
+    def get_matches(
+        self,
+        profile: CandidateProfile,
+        catalog_version: str,
+        model_key: str,
+        top_k: int
+    ) -> Optional[List[MatchResult]]:
+        cached = self._get("matches", content_hash(profile.model_dump_json()), catalog_version, model_key, top_k)
+        return [MatchResult(**match) for match in cached] if cached is not None else None
+
+    def set_matches(
+        self,
+        profile: CandidateProfile,
+        catalog_version: str,
+        model_key: str,
+        top_k: int,
+        matches: List[MatchResult]
+    ):
+        self._set(
+            "matches",
+            (content_hash(profile.model_dump_json()), catalog_version, model_key, top_k),
+            [match.model_dump(mode="json") for match in matches]
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self.backend).__name__,
+            "entries": len(self.backend),
+            "hits": dict(self.hits),
+            "misses": dict(self.misses)
+        }
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def create_cache_backend(kind: str, path: str = None, max_entries: int = None, ttl: float = None) -> CacheBackend:
+    if kind not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache backend '{kind}', expected one of {', '.join(CACHE_BACKENDS)}")
+    max_entries = max_entries or config.RESULT_CACHE_MAX_ENTRIES
+    ttl = ttl if ttl is not None else config.RESULT_CACHE_TTL
+    if kind == "sqlite":
+        return SQLiteCache(path or config.RESULT_CACHE_PATH, max_entries=max_entries, ttl=ttl)
+    return MemoryLRUCache(max_entries=max_entries, ttl=ttl)
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Shared stage result cache configured from the environment, or None when disabled"""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None and config.RESULT_CACHE_BACKEND:
+            _result_cache = ResultCache(create_cache_backend(config.RESULT_CACHE_BACKEND))
+        return _result_cache
+
+
+def reset_result_cache():
+    """Drop the shared cache so the next get_result_cache() re-reads the configuration"""
+    global _result_cache
+    with _result_cache_lock:
+        _result_cache = None
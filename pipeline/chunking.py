@@ -0,0 +1,104 @@
+from typing import Dict, List, NamedTuple
+import re
+
+# Kept free of LLM and web imports, like pdf.py, so it can run wherever resume text is parsed
+
+# Headings that open each section, matched as whole words
+SECTION_HEADINGS: Dict[str, tuple] = {
+    "experience": ("experience", "work experience", "professional experience", "employment", "employment history",
+                   "work history", "career history"),
+    "projects": ("projects", "personal projects", "selected projects", "key projects"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "core competencies", "technologies"),
+    "summary": ("summary", "professional summary", "profile", "about me", "objective"),
+    "education": ("education", "certifications", "certificates", "training"),
+}
+# Weight of a chunk's similarity when pooling across a candidate's vectors; text before the first heading is "other"
+SECTION_WEIGHTS: Dict[str, float] = {
+    "experience": 1.0,
+    "projects": 1.0,
+    "skills": 1.0,
+    "summary": 0.9,
+    "other": 0.8,
+    "education": 0.6,
+}
+
+HEADING = re.compile(
+    r"\b(" + "|".join(sorted((re.escape(phrase) for phrases in SECTION_HEADINGS.values() for phrase in phrases),
+                             key=len, reverse=True)) + r")\b(\s*:)?",
+    re.IGNORECASE
+)
+SECTION_OF = {phrase: section for section, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+# Bullets and sentence ends, where long sections are split
+BREAK = re.compile(r"\s+(?=[-•▪*]\s)|(?<=[.;])\s+|\n+")
+
+
+class ResumeChunk(NamedTuple):
+    section: str
+    text: str
+
+
+def is_heading(text: str, match: re.Match) -> bool:
+    """
+    Section headings survive text cleaning as ALL-CAPS words ("EXPERIENCE"),
+    capitalized words followed by a colon ("Skills:"), or a line of their own
+    """
+    phrase = match.group(1)
+    if phrase.isupper():
+        return True
+    if match.group(2) and phrase[0].isupper():
+        return True
+    line_start = match.start() == 0 or text[match.start() - 1] == "\n"
+    return line_start and (match.end() == len(text) or text[match.end()] == "\n")
+
+
+def split_text(text: str, max_chars: int) -> List[str]:
+    """Pieces of at most `max_chars`, broken at bullets and sentence ends where possible"""
+    pieces, current = [], ""
+    for part in BREAK.split(text):
+        while len(part) > max_chars:
+            cut = part.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            part, head = part[cut:].lstrip(), part[:cut]
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(head)
+        if current and len(current) + 1 + len(part) > max_chars:
+            pieces.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        pieces.append(current)
+    return [piece.strip() for piece in pieces if piece.strip()]
+
+
+def chunk_resume(text: str, max_chars: int = 1500, max_chunks: int = 8, min_chars: int = 40) -> List[ResumeChunk]:
+    """
+    Split resume text into its sections (experience, projects, skills, ...),
+    each in pieces of at most `max_chars`, so every piece fits an embedding
+    call. Pieces shorter than `min_chars` carry too little to retrieve on and
+    are dropped. Over `max_chunks`, the higher-weighted sections are kept,
+    in resume order.
+    """
+    if not text or not text.strip():
+        return []
+    headings = [match for match in HEADING.finditer(text) if is_heading(text, match)]
+    bounds = [(0, "other")] + [(match.start(), SECTION_OF[match.group(1).lower()]) for match in headings]
+    sections: List[ResumeChunk] = []
+    for (start, section), (end, _) in zip(bounds, bounds[1:] + [(len(text), None)]):
+        body = text[start:end].strip()
+        if not body:
+            continue
+        # Consecutive headings of one section, e.g. "Experience: 6 years ... EXPERIENCE ...", read as one
+        if sections and sections[-1].section == section:
+            sections[-1] = ResumeChunk(section, f"{sections[-1].text} {body}")
+        else:
+            sections.append(ResumeChunk(section, body))
+
+    chunks = [ResumeChunk(section, piece) for section, body in sections for piece in split_text(body, max_chars)
+              if len(piece) >= min_chars]
+    if len(chunks) > max_chunks:
+        keep = sorted(range(len(chunks)), key=lambda i: (-SECTION_WEIGHTS[chunks[i].section], i))[:max_chunks]
+        chunks = [chunks[i] for i in sorted(keep)]
+    return chunks
@@ -0,0 +1,105 @@
+from typing import Any, Callable, Dict, Optional
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+import config
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool for blocking work called from async code.
+
+    At most `max_queue` tasks may be queued or running at once; further
+    callers wait for a slot, so a burst of large uploads applies backpressure
+    instead of growing an unbounded backlog inside the pool.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = None, max_queue: int = None):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind '{kind}', expected 'thread' or 'process'")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers or min(4, os.cpu_count() or 1))
+        self.max_queue = max(self.max_workers, max_queue or 4 * self.max_workers)
+        self.in_flight = 0
+        self.completed = 0
+        self._executor: Optional[Executor] = None
+        self._slots: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # Spawned workers don't inherit the server's threads (FAISS/OpenMP, HTTP clients)
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            return self._executor
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if loop not in self._slots:
+            self._slots = {loop: asyncio.Semaphore(self.max_queue)}
+        return self._slots[loop]
+
+    async def run(self, fn: Callable, *args: Any) -> Any:
+        """Run fn(*args) in the pool; process pools need a picklable, module-level fn"""
+        async with self._semaphore():
+            self.in_flight += 1
+            try:
+                return await asyncio.get_running_loop().run_in_executor(
+                    self._get_executor(), functools.partial(fn, *args)
+                )
+            finally:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def warmup(self):
+        """Start every worker now instead of on first use; spawned processes take a while to import"""
+        executor = self._get_executor()
+        if self.kind == "process":
+            futures = [executor.submit(time.sleep, 0.05) for _ in range(self.max_workers)]
+            for future in futures:
+                future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed
+        }
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Shared executor for a kind of blocking work, configured from the environment"""
+    with _executors_lock:
+        if name not in _executors:
+            settings = config.EXECUTORS.get(name, {})
+            _executors[name] = BoundedExecutor(name, **settings)
+        return _executors[name]
+
+
+def shutdown_executors():
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
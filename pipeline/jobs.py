@@ -0,0 +1,350 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from models import MatchJob, MatchResult
+import config
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed", "cancelled")
+FINISHED_STATUSES = ("succeeded", "failed", "cancelled")
+
+# Runs one queued resume (upload bytes, must-have skills) to its matches; raising fails the job
+MatchRunner = Callable[[bytes, Optional[List[str]]], Awaitable[List[MatchResult]]]
+
+
+def process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class QueueFullError(RuntimeError):
+    """The queue already holds its maximum number of waiting jobs"""
+
+
+class JobStore:
+    """
+    SQLite table of match jobs, shared by every worker process on the host.
+
+    Queued jobs keep their upload until they finish; finished jobs keep their
+    matches or error for `result_ttl` seconds so clients can poll for them.
+    A job whose worker died `max_attempts` times fails instead of being
+    requeued again, so an upload that crashes workers can't loop forever.
+
+    Calls block on SQLite locks and disk writes; async callers run them in a thread.
+    """
+
+    def __init__(self, path: str, result_ttl: float = None, max_attempts: int = None):
+        self.path = path
+        self.result_ttl = result_ttl or None
+        self.max_attempts = max_attempts or None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, status TEXT NOT NULL, priority INTEGER NOT NULL, filename TEXT, "
+            "must_have TEXT, payload BLOB, result TEXT, error TEXT, "
+            "submitted_at REAL NOT NULL, started_at REAL, finished_at REAL, owner INTEGER, "
+            "attempts INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "attempts" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority, submitted_at)")
+
+    def submit(
+        self,
+        payload: bytes,
+        filename: str = None,
+        must_have: List[str] = None,
+        priority: int = 0,
+        max_pending: int = None
+    ) -> str:
+        """Queue an upload and return its job id; raises QueueFullError once `max_pending` jobs are waiting"""
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            # Count and insert in one write transaction so concurrent submitters can't overshoot the bound
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if max_pending and self._count("queued") >= max_pending:
+                    raise QueueFullError(f"Match queue is full ({max_pending} jobs waiting)")
+                self._conn.execute(
+                    "INSERT INTO jobs (id, status, priority, filename, must_have, payload, submitted_at) "
+                    "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                    (job_id, priority, filename, json.dumps(must_have) if must_have else None, payload, time.time())
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return job_id
+
+    def claim(self) -> Optional[Tuple[str, bytes, Optional[List[str]]]]:
+        """Mark the next job running, highest priority first and oldest first within a priority"""
+        with self._lock:
+            # Select and mark in one write transaction, so two processes can't claim the same job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id, payload, must_have FROM jobs WHERE status = 'queued' "
+                    "ORDER BY priority DESC, submitted_at LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', started_at = ?, owner = ?, attempts = attempts + 1 "
+                        "WHERE id = ?",
+                        (time.time(), os.getpid(), row[0])
+                    )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row[0], row[1], json.loads(row[2]) if row[2] else None
+
+    def finish(self, job_id: str, matches: List[MatchResult] = None, error: str = None):
+        """Record a job's matches, or its error, and drop the upload"""
+        result = json.dumps([match.model_dump(mode="json") for match in matches]) if matches is not None else None
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ? "
+                "WHERE id = ? AND status = 'running'",
+                ("failed" if error is not None else "succeeded", result, error, time.time(), job_id)
+            )
+
+    def requeue(self, job_id: str):
+        """Put a running job back in the queue when its worker is shut down; the attempt doesn't count"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL, attempts = attempts - 1 "
+                "WHERE id = ? AND status = 'running'",
+                (job_id,)
+            )
+
+    def requeue_orphans(self) -> int:
+        """
+        Requeue running jobs whose worker process has exited, or was an earlier
+        run of this process; jobs that have used up `max_attempts` fail instead
+        """
+        with self._lock:
+            owners = [row[0] for row in self._conn.execute("SELECT DISTINCT owner FROM jobs WHERE status = 'running'")]
+            orphaned = [owner for owner in owners if owner is None or owner == os.getpid() or not process_alive(owner)]
+            requeued = 0
+            for owner in orphaned:
+                if self.max_attempts:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, payload = NULL, finished_at = ? "
+                        "WHERE status = 'running' AND owner IS ? AND attempts >= ?",
+                        (f"Worker stopped during each of {self.max_attempts} attempts", time.time(), owner,
+                         self.max_attempts)
+                    )
+                requeued += self._conn.execute(
+                    "UPDATE jobs SET status = 'queued', started_at = NULL, owner = NULL "
+                    "WHERE status = 'running' AND owner IS ?", (owner,)
+                ).rowcount
+            return requeued
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that hasn't started; returns False if it is running or finished"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = 'cancelled', payload = NULL, finished_at = ? WHERE id = ? AND status = 'queued'",
+                (time.time(), job_id)
+            )
+            return cursor.rowcount > 0
+
+    def get(self, job_id: str) -> Optional[MatchJob]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, priority, filename, result, error, submitted_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row[1] == "queued":
+                position = self._conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = 'queued' AND "
+                    "(priority > ? OR (priority = ? AND submitted_at < ?))",
+                    (row[2], row[2], row[6])
+                ).fetchone()[0]
+        return MatchJob(
+            id=row[0], status=row[1], priority=row[2], filename=row[3],
+            job_matches=[MatchResult(**match) for match in json.loads(row[4])] if row[4] else None,
+            error=row[5], submitted_at=row[6], started_at=row[7], finished_at=row[8], queue_position=position
+        )
+
+    def prune(self) -> int:
+        """Delete finished jobs older than `result_ttl`"""
+        if not self.result_ttl:
+            return 0
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED_STATUSES))}) AND finished_at < ?",
+                (*FINISHED_STATUSES, time.time() - self.result_ttl)
+            )
+            return cursor.rowcount
+
+    def _count(self, status: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {status: rows.get(status, 0) for status in JOB_STATUSES}
+
+
+class MatchQueue:
+    """
+    Submit/poll matching: uploads are queued in a JobStore and run by `workers`
+    in-process worker tasks, so requests return a job id at once instead of
+    holding a connection open for the whole pipeline.
+
+    At most `max_pending` jobs wait at once; submit raises QueueFullError beyond
+    that so callers can shed load. Jobs interrupted by a shutdown are requeued
+    and run again when the queue next starts; several server processes can share
+    one store, each only resuming the jobs of processes that have exited.
+
+    Store calls run in threads, so SQLite lock waits and disk writes don't block
+    the event loop; finished jobs are pruned at most every `prune_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        runner: MatchRunner,
+        store: JobStore = None,
+        workers: int = None,
+        max_pending: int = None,
+        poll_interval: float = 1.0,
+        prune_interval: float = 60.0
+    ):
+        self.runner = runner
+        self._store = store
+        self.workers = max(1, workers or config.MATCH_QUEUE_WORKERS)
+        self.max_pending = max_pending if max_pending is not None else config.MATCH_QUEUE_MAX_PENDING
+        # Workers also re-check the store this often, for jobs queued by other processes
+        self.poll_interval = poll_interval
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        self._store_lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def store(self) -> JobStore:
+        # Opened on first use, so importing the API doesn't create the database
+        with self._store_lock:
+            if self._store is None:
+                self._store = JobStore(config.MATCH_QUEUE_PATH, result_ttl=config.MATCH_QUEUE_RESULT_TTL,
+                                       max_attempts=config.MATCH_QUEUE_MAX_ATTEMPTS)
+        return self._store
+
+    @property
+    def opened(self) -> bool:
+        return self._store is not None
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def _call(self, method: str, *args) -> Any:
+        """Run a JobStore method in a thread; the store itself is opened there on first use"""
+        return await asyncio.to_thread(lambda: getattr(self.store, method)(*args))
+
+    def start(self):
+        """Start the worker tasks on the running event loop, resuming jobs left queued or running"""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        # Orphans are requeued once, before any worker claims a job
+        resumed = asyncio.ensure_future(self._call("requeue_orphans"))
+        self._tasks = [asyncio.ensure_future(self._work(resumed)) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; the jobs they were running go back to the queue"""
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def submit(
+        self,
+        payload: bytes,
+        filename: str = None,
+        must_have: List[str] = None,
+        priority: int = 0
+    ) -> MatchJob:
+        """Queue an upload, starting the workers if needed; raises QueueFullError when the queue is full"""
+        self.start()
+        job_id = await self._call("submit", payload, filename, must_have, priority, self.max_pending)
+        self._wakeup.set()
+        return await self._call("get", job_id)
+
+    async def get(self, job_id: str) -> Optional[MatchJob]:
+        return await self._call("get", job_id)
+
+    async def cancel(self, job_id: str) -> bool:
+        return await self._call("cancel", job_id)
+
+    async def _prune(self):
+        if time.monotonic() - self._pruned_at < self.prune_interval:
+            return
+        self._pruned_at = time.monotonic()
+        await self._call("prune")
+
+    async def _work(self, resumed: asyncio.Future):
+        try:
+            await asyncio.shield(resumed)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error requeueing interrupted match jobs: {str(e)}")
+        while True:
+            # Cleared before claiming, so a submit after an empty claim still wakes this worker
+            self._wakeup.clear()
+            job = await self._call("claim")
+            if job is None:
+                await self._prune()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            job_id, payload, must_have = job
+            try:
+                matches = await self.runner(payload, must_have)
+            except asyncio.CancelledError:
+                await asyncio.shield(self._call("requeue", job_id))
+                raise
+            except Exception as e:
+                print(f"Match job {job_id} failed: {str(e)}")
+                self.failed += 1
+                await self._call("finish", job_id, None, str(e))
+            else:
+                self.completed += 1
+                await self._call("finish", job_id, matches)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "max_pending": self.max_pending,
+            "jobs": self.store.counts(),
+            "completed": self.completed,
+            "failed": self.failed
+        }
@@ -0,0 +1,230 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import bisect
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from models import GraphState, RunMetrics
+
+# Latency buckets in seconds, from a cached lookup to a slow LLM call
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def format_labels(labels: Labels, extra: Tuple[str, str] = None) -> str:
+    pairs = labels + ((extra,) if extra else ())
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels, value: float = 1.0):
+        self.values[labels] = self.values.get(labels, 0.0) + value
+
+    def samples(self) -> Iterator[str]:
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{format_labels(labels)} {format_value(value)}"
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (not cumulative), sum and count
+        self.values: Dict[Labels, List] = {}
+
+    def observe(self, labels: Labels, value: float):
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    def samples(self) -> Iterator[str]:
+        for labels, (counts, total, count) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (math.inf,), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{format_labels(labels, ('le', format_value(bound)))} {cumulative}"
+            yield f"{self.name}_sum{format_labels(labels)} {format_value(total)}"
+            yield f"{self.name}_count{format_labels(labels)} {count}"
+
+
+class MetricsRegistry:
+    """
+    Process-wide counters and histograms rendered in the Prometheus text format.
+
+    Recording is a dict update under a lock, cheap enough to leave on for every
+    request. Gauges are read from callbacks at scrape time, so components that
+    already keep their own stats (caches, queues) don't need to report changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Any] = {}
+        self._gauges: Dict[str, Tuple[str, str, Callable[[], Dict[str, float]]]] = {}
+
+    def counter(self, name: str, help: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help))
+
+    def histogram(self, name: str, help: str, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help, buckets))
+
+    def gauge(self, name: str, help: str, label: str, read: Callable[[], Dict[str, float]]):
+        """Register a gauge whose values, keyed by `label`, are read when the metrics are rendered"""
+        with self._lock:
+            self._gauges[name] = (help, label, read)
+
+    def inc(self, name: str, value: float = 1.0, **labels: str):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._metrics[name].inc(labels, value)
+
+    def observe(self, name: str, value: float, **labels: str):
+        labels = tuple(sorted(labels.items()))
+        with self._lock:
+            self._metrics[name].observe(labels, value)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, metric in sorted(self._metrics.items()):
+                kind = "counter" if isinstance(metric, Counter) else "histogram"
+                lines += [f"# HELP {name} {metric.help}", f"# TYPE {name} {kind}", *metric.samples()]
+            gauges = sorted(self._gauges.items())
+        for name, (help, label, read) in gauges:
+            try:
+                values = read()
+            except Exception as e:
+                print(f"Error reading gauge {name}: {str(e)}")
+                continue
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            lines += [f"{name}{format_labels(((label, str(key)),))} {format_value(value)}" for key, value in sorted(values.items())]
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.values.clear()
+
+
+registry = MetricsRegistry()
+registry.histogram("talentmatch_stage_seconds", "Time spent in each pipeline node")
+registry.counter("talentmatch_stage_errors_total", "Pipeline runs that failed in each node")
+registry.histogram("talentmatch_operation_seconds", "Time spent in pdf parsing, embedding, FAISS search and LLM calls")
+registry.counter("talentmatch_llm_tokens_total", "LLM tokens reported by the API, by input or output")
+registry.counter("talentmatch_cache_requests_total", "Cache lookups by cache and hit or miss")
+
+# Metrics of the pipeline run the current task belongs to; set by the node wrappers
+_current_run: contextvars.ContextVar[Optional[RunMetrics]] = contextvars.ContextVar("run_metrics", default=None)
+
+
+def current_run() -> Optional[RunMetrics]:
+    return _current_run.get()
+
+
+@contextmanager
+def track_run(metrics: RunMetrics):
+    """Record operations in the block, including in tasks it starts, against `metrics`"""
+    token = _current_run.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current_run.reset(token)
+
+
+@contextmanager
+def timed(operation: str):
+    """Time a block as one call of `operation`, for the current run and the process-wide histogram"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        registry.observe("talentmatch_operation_seconds", elapsed, operation=operation)
+        run = _current_run.get()
+        if run is not None:
+            run.operations[operation] = run.operations.get(operation, 0.0) + elapsed
+            run.calls[operation] = run.calls.get(operation, 0) + 1
+
+
+def record_tokens(usage: Optional[Dict[str, Any]]):
+    """Count the tokens of an LLM response's usage metadata, when the API reported any"""
+    if not usage:
+        return
+    input_tokens, output_tokens = usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    registry.inc("talentmatch_llm_tokens_total", input_tokens, kind="input")
+    registry.inc("talentmatch_llm_tokens_total", output_tokens, kind="output")
+    run = _current_run.get()
+    if run is not None:
+        run.input_tokens += input_tokens
+        run.output_tokens += output_tokens
+
+
+def record_cache(cache: str, hit: bool):
+    registry.inc("talentmatch_cache_requests_total", cache=cache, result="hit" if hit else "miss")
+    run = _current_run.get()
+    if run is not None:
+        counts = run.cache_hits if hit else run.cache_misses
+        counts[cache] = counts.get(cache, 0) + 1
+
+
+def record_stage(metrics: RunMetrics, name: str, seconds: float, failed: bool = False):
+    metrics.stages[name] = metrics.stages.get(name, 0.0) + seconds
+    registry.observe("talentmatch_stage_seconds", seconds, stage=name)
+    if failed:
+        registry.inc("talentmatch_stage_errors_total", stage=name)
+
+
+def timed_node(name: str, node: Callable) -> Callable:
+    """
+    Wrap a LangGraph node so its run time, and the operations it records, land
+    on `state.metrics` and in the process-wide registry. A node that sets
+    `state.error` or raises counts as a stage error.
+    """
+    async def run(state: GraphState) -> GraphState:
+        metrics = state.metrics = state.metrics or RunMetrics()
+        failed_before = bool(state.error)
+        start = time.perf_counter()
+        failed = True
+        try:
+            with track_run(metrics):
+                state = await node(state)
+            failed = bool(state.error) and not failed_before
+        finally:
+            state.metrics = metrics
+            record_stage(metrics, name, time.perf_counter() - start, failed=failed)
+        return state
+
+    run.__name__ = name
+    return run
+
+
+def server_timing(metrics: RunMetrics) -> str:
+    """Server-Timing header value: one entry per node and operation, in milliseconds"""
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in metrics.stages.items()]
+    entries += [
+        f'{name};dur={seconds * 1000:.1f};desc="{calls} call{"" if calls == 1 else "s"}"'
+        for name, seconds in metrics.operations.items()
+        for calls in (metrics.calls.get(name, 0),)
+    ]
+    return ", ".join(entries)
@@ -0,0 +1,197 @@
+from typing import List, Optional, Tuple, Union
+import asyncio
+import time
+from io import BytesIO
+from pypdf import PdfReader
+from models import PageTiming, PdfExtractionReport
+from .executors import BoundedExecutor, get_executor
+import config
+
+# Kept free of LLM and web imports: process pool workers import this module on start-up
+
+# (page number, cleaned text, seconds spent extracting it)
+PageText = Tuple[int, str, float]
+
+
+def clean_text(text: str) -> str:
+    """Clean extracted text from PDF"""
+    return " ".join(text.split())
+
+
+def decode_text_upload(data: bytes) -> Optional[str]:
+    """Return the upload as text if it is a text file rather than a PDF"""
+    try:
+        text_content = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+    if len(text_content) > 0 and not text_content.startswith('%PDF'):
+        return text_content
+    return None
+
+
+def read_pages(pdf_data: bytes, start: int, stop: int, char_budget: int) -> List[PageText]:
+    """
+    Extract pages [start, stop) one at a time, stopping once char_budget characters are read.
+
+    Module-level so a process pool can run page ranges of one document in parallel.
+    """
+    reader = PdfReader(BytesIO(pdf_data))
+    pages = []
+    chars = 0
+    for number in range(start, min(stop, len(reader.pages))):
+        page_start = time.perf_counter()
+        text = clean_text(reader.pages[number].extract_text() or "")
+        pages.append((number, text, time.perf_counter() - page_start))
+        chars += len(text) + 1
+        if chars >= char_budget:
+            break
+    return pages
+
+
+def count_pages(pdf_data: bytes) -> int:
+    """Page count from the document structure; pages are only parsed when extracted"""
+    return len(PdfReader(BytesIO(pdf_data)).pages)
+
+
+class PageCollector:
+    """Accumulates pages in document order until the character budget is reached"""
+
+    def __init__(self, char_budget: int):
+        self.char_budget = char_budget
+        self.parts: List[str] = []
+        self.timings: List[PageTiming] = []
+        self.chars = 0
+
+    @property
+    def full(self) -> bool:
+        return self.chars >= self.char_budget
+
+    def add(self, pages: List[PageText]) -> bool:
+        """Add pages; returns True once the budget is reached"""
+        for number, text, seconds in pages:
+            if self.full:
+                break
+            self.timings.append(PageTiming(page=number + 1, chars=len(text), seconds=seconds))
+            if text:
+                self.parts.append(text)
+                self.chars += len(text) + 1
+        return self.full
+
+    def result(self, page_count: int, parallel: bool, started: float) -> Tuple[str, PdfExtractionReport]:
+        text = " ".join(self.parts)[:self.char_budget]
+        if not text.strip():
+            raise ValueError("No text extracted from PDF")
+        return text, PdfExtractionReport(
+            page_count=page_count,
+            pages_read=len(self.timings),
+            chars=len(text),
+            truncated=self.full,
+            parallel=parallel,
+            seconds=time.perf_counter() - started,
+            pages=self.timings
+        )
+
+
+def extract_pdf(pdf_data: bytes, char_budget: int = None) -> Tuple[str, PdfExtractionReport]:
+    """Stream pages in order until the character budget is reached"""
+    started = time.perf_counter()
+    char_budget = char_budget or config.PDF_CHAR_BUDGET
+    collector = PageCollector(char_budget)
+    page_count = count_pages(pdf_data)
+    collector.add(read_pages(pdf_data, 0, page_count, char_budget))
+    return collector.result(page_count, parallel=False, started=started)
+
+
+def extract_resume_text(pdf_data: Union[str, bytes], char_budget: int = None) -> str:
+    """Extract text from PDF resume or handle text files"""
+    try:
+        # Handle string input (already text)
+        if isinstance(pdf_data, str):
+            return clean_text(pdf_data)
+
+        # Handle bytes input
+        if isinstance(pdf_data, bytes):
+            # First, check if it's a text file
+            text_content = decode_text_upload(pdf_data)
+            if text_content is not None:
+                return clean_text(text_content)
+
+            # If not text, try to process as PDF
+            try:
+                text, _ = extract_pdf(pdf_data, char_budget)
+                return text
+            except Exception as pdf_error:
+                # If PDF processing fails, try to decode as text anyway
+                try:
+                    return clean_text(pdf_data.decode('utf-8'))
+                except UnicodeDecodeError:
+                    raise ValueError(f"Failed to process as PDF or text: {str(pdf_error)}")
+
+        raise ValueError("Invalid input type")
+    except Exception as e:
+        raise ValueError(f"Failed to process PDF: {str(e)}")
+
+
+class PdfExtractor:
+    """
+    Resume text extraction that keeps PDF parsing off the event loop.
+
+    Small documents are parsed as one task in the executor. Documents with at
+    least `parallel_min_pages` pages are split into one page range per pool
+    worker, of at least `pages_per_task` pages; ranges are consumed in order
+    and outstanding ranges are cancelled as soon as the character budget is
+    reached, since downstream prompts only use a prefix of the resume.
+    """
+
+    def __init__(
+        self,
+        executor: BoundedExecutor = None,
+        char_budget: int = None,
+        parallel_min_pages: int = None,
+        pages_per_task: int = None
+    ):
+        self.executor = executor or get_executor("ingest")
+        self.char_budget = char_budget or config.PDF_CHAR_BUDGET
+        self.parallel_min_pages = parallel_min_pages or config.PDF_PARALLEL_MIN_PAGES
+        self.pages_per_task = max(1, pages_per_task or config.PDF_PAGES_PER_TASK)
+
+    async def extract(self, data: Union[str, bytes]) -> Tuple[str, Optional[PdfExtractionReport]]:
+        """Return (cleaned text, extraction report); the report is None for text uploads"""
+        if isinstance(data, str):
+            return clean_text(data), None
+        text_content = decode_text_upload(data)
+        if text_content is not None:
+            return clean_text(text_content), None
+
+        try:
+            page_count = await self.executor.run(count_pages, data)
+            if page_count < self.parallel_min_pages:
+                return await self.executor.run(extract_pdf, data, self.char_budget)
+            return await self._extract_parallel(data, page_count)
+        except Exception as pdf_error:
+            # If PDF processing fails, try to decode as text anyway
+            try:
+                return clean_text(data.decode('utf-8')), None
+            except UnicodeDecodeError:
+                raise ValueError(f"Failed to process PDF: Failed to process as PDF or text: {str(pdf_error)}")
+
+    async def _extract_parallel(self, data: bytes, page_count: int) -> Tuple[str, PdfExtractionReport]:
+        started = time.perf_counter()
+        collector = PageCollector(self.char_budget)
+        # One contiguous range per worker, so each parses the document and receives its bytes once;
+        # every range stops at the budget by itself, bounding the pages read past it
+        tasks = max(1, min(self.executor.max_workers, page_count // self.pages_per_task))
+        size = -(-page_count // tasks)
+        ranges = [
+            asyncio.ensure_future(self.executor.run(read_pages, data, start, start + size, self.char_budget))
+            for start in range(0, page_count, size)
+        ]
+        try:
+            for pages in ranges:
+                if collector.add(await pages):
+                    break
+        finally:
+            # Ranges past the budget are dropped; queued ones never reach a worker
+            for pending in ranges:
+                pending.cancel()
+        return collector.result(page_count, parallel=True, started=started)
@@ -0,0 +1,56 @@
+from .store import EmbeddingStore, embedding_key, embedding_model_name, index_fingerprint
+from .index import (
+    INDEX_KINDS, INDEX_METRICS, POOLING_MODES, IndexConfig, build_index, configure_search, evaluate_indexes,
+    pool_similarities, prepare_vectors, search_similarities
+)
+from .columns import JobColumns, SkillColumns, job_digest
+from .skills import SkillIndex, SkillScores, normalize_skill
+from .loader import (
+    CATALOG_FORMATS, CatalogLoadError, CatalogRecordError, catalog_format, iter_job_catalog, iter_job_records,
+    write_job_catalog
+)
+from .catalog import CatalogSnapshot, build_job_index, index_version, job_faiss_id
+from .candidates import CandidateStore, candidate_id
+from .bulk import BulkMatcher
+from .calibration import ScoredPairLog, SimilarityCalibration, pooling_key, suggest_floor
+
+__all__ = [
+    'EmbeddingStore',
+    'embedding_key',
+    'embedding_model_name',
+    'index_fingerprint',
+    'INDEX_KINDS',
+    'INDEX_METRICS',
+    'POOLING_MODES',
+    'IndexConfig',
+    'build_index',
+    'configure_search',
+    'evaluate_indexes',
+    'pool_similarities',
+    'prepare_vectors',
+    'search_similarities',
+    'JobColumns',
+    'SkillColumns',
+    'job_digest',
+    'SkillIndex',
+    'SkillScores',
+    'normalize_skill',
+    'CATALOG_FORMATS',
+    'CatalogLoadError',
+    'CatalogRecordError',
+    'catalog_format',
+    'iter_job_catalog',
+    'iter_job_records',
+    'write_job_catalog',
+    'CatalogSnapshot',
+    'build_job_index',
+    'index_version',
+    'job_faiss_id',
+    'CandidateStore',
+    'candidate_id',
+    'BulkMatcher',
+    'ScoredPairLog',
+    'SimilarityCalibration',
+    'pooling_key',
+    'suggest_floor'
+]
@@ -0,0 +1,221 @@
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from models import CandidateProfile
+from utils import chunked
+from .catalog import CatalogSnapshot
+
+# Per pair features written next to the ids and rank, in this order
+PAIR_FEATURES = ("score", "similarity", "skill_score", "required_coverage", "experience_gap")
+
+# (candidate ids, profiles, embeddings) for one block of candidates
+CandidateBatch = Tuple[List[str], List[CandidateProfile], np.ndarray]
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class TopK:
+    """Best `k` entries seen so far for each of `rows` rows, with the other index and every pair feature"""
+
+    def __init__(self, rows: int, k: int):
+        self.k = k
+        self.ids = np.full((rows, k), -1, dtype=np.int64)
+        self.features = {name: np.full((rows, k), -np.inf if name == "score" else 0.0, dtype=np.float32)
+                         for name in PAIR_FEATURES}
+
+    def update(self, rows: slice, ids: np.ndarray, features: Dict[str, np.ndarray], axis: int = 1):
+        """
+        Merge a block of pair features whose entries along `axis` are the given
+        ids, keeping each row's k best scores; `axis=0` merges the block's columns
+        into `rows`, so a block never has to be transposed whole
+        """
+        scores = features["score"]
+        # Each row's k best within the block first, so only k entries per row are merged
+        if scores.shape[axis] > self.k:
+            best = np.argpartition(-scores, self.k - 1, axis=axis)
+            best = best[:, :self.k] if axis == 1 else best[:self.k]
+        else:
+            best = np.broadcast_to(np.arange(scores.shape[axis])[:, None] if axis == 0 else np.arange(scores.shape[1]),
+                                   scores.shape)
+
+        def block(values: np.ndarray) -> np.ndarray:
+            picked = np.take_along_axis(values, best, axis=axis)
+            return picked if axis == 1 else picked.T
+
+        candidates = np.concatenate([self.features["score"][rows], block(scores)], axis=1)
+        keep = np.argpartition(-candidates, self.k - 1, axis=1)[:, :self.k]
+        picked_ids = np.asarray(ids)[best]
+        picked_ids = picked_ids if axis == 1 else picked_ids.T
+        self.ids[rows] = np.take_along_axis(np.concatenate([self.ids[rows], picked_ids], axis=1), keep, axis=1)
+        for name in PAIR_FEATURES:
+            merged = np.concatenate([self.features[name][rows], block(features[name])], axis=1)
+            self.features[name][rows] = np.take_along_axis(merged, keep, axis=1)
+
+    def ranked(self, rows: slice) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """(row positions, ranks, other ids, features) of the filled entries of `rows`, best first per row"""
+        order = np.argsort(-self.features["score"][rows], axis=1, kind="stable")
+        ids = np.take_along_axis(self.ids[rows], order, axis=1)
+        filled = ids >= 0
+        positions = np.nonzero(filled)
+        features = {name: np.take_along_axis(values[rows], order, axis=1)[filled] for name, values in self.features.items()}
+        return positions[0], positions[1], ids[filled], features
+
+
+class ParquetSink:
+    """Writes ranked pairs to a Parquet file one row group at a time, so the file never sits in memory"""
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.path = path
+        self.rows = 0
+        self.schema = pa.schema(
+            [("candidate_id", pa.string()), ("job_id", pa.string()), ("rank", pa.int32())]
+            + [(name, pa.float32()) for name in PAIR_FEATURES]
+        )
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, candidate_ids: Sequence[str], job_ids: Sequence[str], ranks: np.ndarray, features: Dict[str, np.ndarray]):
+        if not len(ranks):
+            return
+        columns = [self.pa.array(candidate_ids, self.pa.string()), self.pa.array(job_ids, self.pa.string()),
+                   self.pa.array(ranks.astype(np.int32) + 1)]
+        columns += [self.pa.array(features[name].astype(np.float32)) for name in PAIR_FEATURES]
+        self.writer.write_table(self.pa.Table.from_arrays(columns, schema=self.schema))
+        self.rows += len(ranks)
+
+    def close(self):
+        self.writer.close()
+
+
+class BulkMatcher:
+    """
+    Scores every candidate against every catalog posting without the LLM.
+
+    Candidates arrive in blocks and are compared with the catalog a block of
+    postings at a time: cosine similarity is one matrix product of normalized
+    embeddings, and the skill pre-score features come from `SkillIndex.score_matrix`.
+    Pairs are ranked by `similarity_weight × similarity + (1 − similarity_weight) ×
+    skill score`, and only the `top_k` best jobs per candidate and candidates per
+    job are kept. Memory is bounded by one (candidate block × job block) matrix
+    per feature plus the kept pairs, so the candidate and catalog sizes only
+    grow the run time. Job vectors are spilled to a memory-mapped file first.
+
+    NumPy releases the GIL in the products and element-wise work, so `workers`
+    threads score that many job blocks at once, each holding its own block.
+    """
+
+    def __init__(
+        self,
+        snapshot: CatalogSnapshot,
+        job_vectors: Callable[[np.ndarray], np.ndarray],
+        top_k: int = 10,
+        job_block: int = 8192,
+        similarity_weight: float = 0.5,
+        workers: int = 1
+    ):
+        self.snapshot = snapshot
+        self.job_vectors = job_vectors
+        self.top_k = max(1, top_k)
+        self.job_block = max(1, job_block)
+        self.similarity_weight = similarity_weight
+        self.workers = max(1, workers)
+
+    def _job_blocks(self) -> List[np.ndarray]:
+        return [np.arange(start, min(start + self.job_block, len(self.snapshot)))
+                for start in range(0, len(self.snapshot), self.job_block)]
+
+    def _spill_job_vectors(self, path: str) -> np.ndarray:
+        """Normalized vectors of every catalog row in a memory-mapped file, embedded a block at a time"""
+        vectors = None
+        for rows in self._job_blocks():
+            block = normalize_rows(self.job_vectors(rows))
+            if vectors is None:
+                vectors = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(len(self.snapshot), block.shape[1]))
+            vectors[rows[0]:rows[-1] + 1] = block
+        vectors.flush()
+        return np.load(path, mmap_mode="r")
+
+    def _pair_features(self, profiles: List[CandidateProfile], vectors: np.ndarray, rows: np.ndarray,
+                       job_vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        similarity = vectors @ np.asarray(job_vectors[rows[0]:rows[-1] + 1]).T
+        skills = self.snapshot.skills.score_matrix(profiles, rows)
+        return {
+            "score": self.similarity_weight * similarity + (1 - self.similarity_weight) * skills.score,
+            "similarity": similarity,
+            "skill_score": skills.score,
+            "required_coverage": skills.required_coverage,
+            "experience_gap": skills.experience_gap,
+        }
+
+    def run(self, candidates: Iterable[CandidateBatch], output_dir: str) -> Dict[str, Any]:
+        """
+        Write `candidate_top_jobs.parquet` (each candidate's best jobs, written
+        block by block) and `job_top_candidates.parquet` (each job's best
+        candidates, written at the end) to `output_dir`; returns a summary
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        start = time.perf_counter()
+        columns = self.snapshot.jobs
+        job_ids = [columns.text(row, "id") for row in range(len(columns))]
+        job_blocks = self._job_blocks()
+        per_job = TopK(len(columns), self.top_k)
+        candidate_ids: List[str] = []
+        by_candidate = ParquetSink(os.path.join(output_dir, "candidate_top_jobs.parquet"))
+        pool = ThreadPoolExecutor(self.workers, thread_name_prefix="bulk-match")
+        try:
+            with tempfile.TemporaryDirectory(dir=output_dir) as workdir:
+                job_vectors = self._spill_job_vectors(os.path.join(workdir, "job_vectors.npy"))
+                for ids, profiles, vectors in candidates:
+                    if not ids:
+                        continue
+                    offset = len(candidate_ids)
+                    candidate_ids.extend(ids)
+                    vectors = normalize_rows(vectors)
+                    per_candidate = TopK(len(ids), self.top_k)
+
+                    def score_block(rows: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+                        features = self._pair_features(profiles, vectors, rows, job_vectors)
+                        # Job blocks cover disjoint rows of per_job, so workers can merge into it concurrently
+                        per_job.update(slice(rows[0], rows[-1] + 1), np.arange(offset, offset + len(ids)), features, axis=0)
+                        return rows, features
+
+                    # One window of blocks at a time bounds the block matrices held at once
+                    for window in chunked(job_blocks, self.workers):
+                        for rows, features in pool.map(score_block, window):
+                            per_candidate.update(slice(None), rows, features)
+                    positions, ranks, rows, features = per_candidate.ranked(slice(None))
+                    by_candidate.write([ids[i] for i in positions.tolist()], [job_ids[row] for row in rows.tolist()],
+                                       ranks, features)
+        finally:
+            pool.shutdown()
+            by_candidate.close()
+
+        by_job = ParquetSink(os.path.join(output_dir, "job_top_candidates.parquet"))
+        try:
+            for rows in job_blocks:
+                positions, ranks, candidates_rows, features = per_job.ranked(slice(rows[0], rows[-1] + 1))
+                by_job.write([candidate_ids[i] for i in candidates_rows.tolist()],
+                             [job_ids[rows[0] + i] for i in positions.tolist()], ranks, features)
+        finally:
+            by_job.close()
+
+        return {
+            "candidates": len(candidate_ids),
+            "jobs": len(columns),
+            "pairs_scored": len(candidate_ids) * len(columns),
+            "seconds": time.perf_counter() - start,
+            "candidate_top_jobs": by_candidate.path,
+            "candidate_rows": by_candidate.rows,
+            "job_top_candidates": by_job.path,
+            "job_rows": by_job.rows,
+        }
@@ -0,0 +1,188 @@
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import time
+import numpy as np
+from pydantic import BaseModel
+
+
+def isotonic_fit(x: np.ndarray, y: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Non-decreasing least-squares fit of y over x sorted ascending (pool adjacent violators)"""
+    values: List[float] = []
+    totals: List[float] = []
+    sizes: List[int] = []
+    for value, weight in zip(y.tolist(), weights.tolist()):
+        values.append(value)
+        totals.append(weight)
+        sizes.append(1)
+        # Merge backwards while the newest block breaks monotonicity
+        while len(values) > 1 and values[-2] > values[-1]:
+            weight = totals[-2] + totals[-1]
+            values[-2] = (values[-2] * totals[-2] + values[-1] * totals[-1]) / weight
+            totals[-2] = weight
+            sizes[-2] += sizes[-1]
+            del values[-1], totals[-1], sizes[-1]
+    return np.repeat(np.array(values), sizes)
+
+
+def suggest_floor(similarities: np.ndarray, scores: np.ndarray, threshold: float = 0.6, max_missed: float = 0.01) -> Optional[float]:
+    """
+    Highest similarity floor that would have dropped at most `max_missed` of the
+    pairs the LLM scored at `threshold` or above (recruiter review and better)
+    """
+    kept = np.asarray(similarities)[np.asarray(scores) >= threshold]
+    if not len(kept):
+        return None
+    return float(np.quantile(kept, max_missed, method="lower"))
+
+
+def pooling_key(max_chunks: int, chunk_chars: int, pooling: str) -> str:
+    """How query similarities were formed: the profile alone, or pooled with resume chunks of these settings"""
+    return f"chunks:{max_chunks},{chunk_chars},{pooling}" if max_chunks else "profile"
+
+
+class SimilarityCalibration(BaseModel):
+    """
+    Monotone mapping from retrieval similarity to the LLM `confidence_score`,
+    fitted on pairs the LLM scored. Similarities are pre-binned into quantiles
+    and fitted with isotonic regression; `predict` interpolates between knots.
+    Only valid for the embedding model, index metric and query pooling
+    (`pooling_key`) it was fitted with.
+    """
+    embedding_model: str
+    metric: str
+    pooling: str = "profile"
+    similarities: List[float]
+    scores: List[float]
+    pairs: int
+    fitted_at: float
+
+    @classmethod
+    def fit(
+        cls,
+        similarities: Sequence[float],
+        scores: Sequence[float],
+        embedding_model: str,
+        metric: str,
+        bins: int = 50,
+        pooling: str = "profile"
+    ) -> "SimilarityCalibration":
+        similarities = np.asarray(similarities, dtype=np.float64)
+        scores = np.asarray(scores, dtype=np.float64)
+        if not len(similarities):
+            raise ValueError("No scored pairs to fit a calibration on")
+        order = np.argsort(similarities, kind="stable")
+        similarities, scores = similarities[order], scores[order]
+        groups = np.array_split(np.arange(len(similarities)), min(bins, len(similarities)))
+        x = np.array([similarities[group].mean() for group in groups])
+        y = np.array([scores[group].mean() for group in groups])
+        weights = np.array([len(group) for group in groups], dtype=np.float64)
+        return cls(
+            embedding_model=embedding_model,
+            metric=metric,
+            pooling=pooling,
+            similarities=x.tolist(),
+            scores=np.clip(isotonic_fit(x, y, weights), 0.0, 1.0).tolist(),
+            pairs=len(similarities),
+            fitted_at=time.time()
+        )
+
+    @property
+    def version(self) -> str:
+        return hashlib.sha256(json.dumps([self.similarities, self.scores]).encode("utf-8")).hexdigest()[:16]
+
+    def predict(self, similarity: float) -> float:
+        """Expected confidence_score at a similarity; flat beyond the fitted range"""
+        return float(np.interp(similarity, self.similarities, self.scores))
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(self.model_dump_json(indent=2))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        embedding_model: str = None,
+        metric: str = None,
+        pooling: str = None
+    ) -> Optional["SimilarityCalibration"]:
+        """The calibration at `path`, or None if there is none for this embedding model, metric and pooling"""
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path) as f:
+                calibration = cls.model_validate_json(f.read())
+        except (OSError, ValueError) as e:
+            print(f"Error loading similarity calibration {path}: {str(e)}")
+            return None
+        if ((embedding_model and calibration.embedding_model != embedding_model) or (metric and calibration.metric != metric)
+                or (pooling and calibration.pooling != pooling)):
+            print(f"Ignoring similarity calibration {path}: fitted for {calibration.embedding_model} "
+                  f"({calibration.metric}, {calibration.pooling})")
+            return None
+        return calibration
+
+
+class ScoredPairLog:
+    """
+    Append-only JSON Lines record of (similarity, confidence_score) for every
+    pair the LLM scored, the history calibrations are fitted on. Lines are
+    short single writes in append mode, so worker processes can share the file.
+    Once the file exceeds `max_bytes` it is rotated to `<path>.1`, replacing
+    the previous rotation, so the log keeps at most about twice that.
+    """
+
+    def __init__(self, path: str, max_bytes: int = None):
+        self.path = path
+        self.max_bytes = max_bytes or None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, records: Iterable[Dict]):
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        if not lines:
+            return
+        if self.max_bytes:
+            try:
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+            except FileNotFoundError:
+                # Missing, or another process rotated it first
+                pass
+        with open(self.path, "a") as f:
+            f.write(lines)
+
+    def read(
+        self,
+        embedding_model: str = None,
+        metric: str = None,
+        pooling: str = None
+    ) -> Iterator[Tuple[float, float]]:
+        """(similarity, confidence_score) pairs, oldest first, optionally for one embedding model, metric and pooling"""
+        for path in (self.path + ".1", self.path):
+            if os.path.exists(path):
+                yield from self._read(path, embedding_model, metric, pooling)
+
+    def _read(self, path: str, embedding_model: str, metric: str, pooling: str) -> Iterator[Tuple[float, float]]:
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    if embedding_model and record.get("embedding_model") != embedding_model:
+                        continue
+                    if metric and record.get("metric") != metric:
+                        continue
+                    if pooling and record.get("pooling", "profile") != pooling:
+                        continue
+                    yield float(record["similarity"]), float(record["confidence_score"])
+                except (ValueError, KeyError, TypeError):
+                    # A line cut short by a crashed writer
+                    continue
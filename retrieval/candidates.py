@@ -0,0 +1,204 @@
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+import faiss
+from models import CandidateProfile
+from .columns import job_faiss_id
+from .index import IndexConfig, prepare_vectors, search_similarities
+
+
+def candidate_id(profile: CandidateProfile, resume_hash: str = None) -> str:
+    """
+    Stable id of a candidate: the content hash of their resume upload when known,
+    so re-uploading it maps to the same candidate even if the extracted profile
+    changes between runs; otherwise a hash of the profile
+    """
+    if resume_hash:
+        return resume_hash[:32]
+    return hashlib.sha256(profile.model_dump_json().encode("utf-8")).hexdigest()[:32]
+
+
+class CandidateStore:
+    """
+    SQLite table of matched candidate profiles and their embeddings, with a
+    FAISS index over the vectors for finding candidates that fit a job.
+
+    Rows are kept per embedding model, so vectors of different models are never
+    searched together. The index is built on first search and then only reads
+    rows added since, including those written by other worker processes.
+    Candidates added more than `ttl` seconds ago are deleted, checked on
+    writes at most every `prune_interval` seconds. The index uses the job
+    index's `metric`, so candidate similarities compare with job similarities.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        model_name: str,
+        ttl: float = None,
+        prune_interval: float = 600.0,
+        metric: str = "cosine"
+    ):
+        self.path = path
+        self.model_name = model_name
+        self.index_config = IndexConfig(kind="flat", metric=metric)
+        self.ttl = ttl or None
+        self.prune_interval = prune_interval
+        self._pruned_at = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "id TEXT NOT NULL, model TEXT NOT NULL, faiss_id INTEGER NOT NULL, profile TEXT NOT NULL, "
+            "vector BLOB NOT NULL, added_at REAL NOT NULL, PRIMARY KEY (id, model))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS candidates_faiss_id ON candidates (model, faiss_id)")
+        self._index: Optional[faiss.Index] = None
+        # Highest rowid already in the index; replaced rows get a new rowid, so they are picked up again
+        self._last_row = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM candidates WHERE model = ?", (self.model_name,)).fetchone()[0]
+
+    def add(
+        self,
+        profiles: Sequence[CandidateProfile],
+        vectors: np.ndarray,
+        resume_hashes: Sequence[Optional[str]] = None
+    ) -> List[str]:
+        """Store or replace candidates with their embeddings, keyed by resume hash when given; returns their ids"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        resume_hashes = resume_hashes or [None] * len(profiles)
+        ids = [candidate_id(profile, resume_hash) for profile, resume_hash in zip(profiles, resume_hashes)]
+        now = time.time()
+        rows = [(cid, self.model_name, job_faiss_id(cid), profile.model_dump_json(), vector.tobytes(), now)
+                for cid, profile, vector in zip(ids, profiles, vectors)]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO candidates (id, model, faiss_id, profile, vector, added_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+        if self.ttl and time.monotonic() - self._pruned_at >= self.prune_interval:
+            self._pruned_at = time.monotonic()
+            self.prune()
+        return ids
+
+    def prune(self) -> int:
+        """Delete candidates of every model added more than `ttl` seconds ago; returns how many"""
+        if not self.ttl:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                expired = [row[0] for row in self._conn.execute(
+                    "SELECT faiss_id FROM candidates WHERE model = ? AND added_at < ?", (self.model_name, cutoff)
+                )]
+                deleted = self._conn.execute("DELETE FROM candidates WHERE added_at < ?", (cutoff,)).rowcount
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            # Other processes' indexes skip these ids once their rows are gone
+            if expired and self._index is not None:
+                self._index.remove_ids(np.array(expired, dtype=np.int64))
+        return deleted
+
+    def get(self, candidate_ids: Sequence[str]) -> List[Optional[CandidateProfile]]:
+        """Profiles for the given ids, None for candidates that were removed"""
+        if not candidate_ids:
+            return []
+        with self._lock:
+            found = dict(self._conn.execute(
+                f"SELECT id, profile FROM candidates WHERE model = ? AND id IN ({','.join('?' * len(candidate_ids))})",
+                (self.model_name, *candidate_ids)
+            ).fetchall())
+        return [CandidateProfile.model_validate_json(found[cid]) if cid in found else None for cid in candidate_ids]
+
+    def iter_batches(self, batch_size: int) -> Iterator[Tuple[List[str], List[CandidateProfile], np.ndarray]]:
+        """Stored candidates as (ids, profiles, vectors) batches, oldest first, reading one batch at a time"""
+        last_row = 0
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT rowid, id, profile, vector FROM candidates WHERE model = ? AND rowid > ? ORDER BY rowid LIMIT ?",
+                    (self.model_name, last_row, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_row = rows[-1][0]
+            yield ([cid for _, cid, _, _ in rows],
+                   [CandidateProfile.model_validate_json(profile) for _, _, profile, _ in rows],
+                   np.stack([np.frombuffer(vector, dtype=np.float32) for _, _, _, vector in rows]))
+
+    def remove(self, candidate_id: str) -> bool:
+        """Delete a candidate; returns False if it wasn't stored"""
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM candidates WHERE id = ? AND model = ?", (candidate_id, self.model_name)
+            ).rowcount
+            if deleted and self._index is not None:
+                self._index.remove_ids(np.array([job_faiss_id(candidate_id)], dtype=np.int64))
+        return bool(deleted)
+
+    def _refresh(self):
+        """Add rows written since the last refresh to the index; caller holds the lock"""
+        rows = self._conn.execute(
+            "SELECT rowid, faiss_id, vector FROM candidates WHERE model = ? AND rowid > ? ORDER BY rowid",
+            (self.model_name, self._last_row)
+        ).fetchall()
+        if not rows:
+            return
+        vectors = prepare_vectors(np.stack([np.frombuffer(vector, dtype=np.float32) for _, _, vector in rows]),
+                                  self.index_config)
+        ids = np.array([faiss_id for _, faiss_id, _ in rows], dtype=np.int64)
+        if self._index is None:
+            self._index = faiss.index_factory(vectors.shape[1], self.index_config.factory_string(),
+                                              self.index_config.faiss_metric)
+        # Replaced candidates are re-added with their new vector
+        self._index.remove_ids(ids)
+        self._index.add_with_ids(vectors, ids)
+        self._last_row = rows[-1][0]
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        top_k: int,
+        similarities: Optional[List[Dict[str, float]]] = None
+    ) -> List[List[Tuple[str, CandidateProfile]]]:
+        """
+        Nearest stored candidates for one or more job vectors, as (candidate id, profile)
+        pairs. When given, `similarities` receives each row's candidate id to cosine
+        similarity mapping.
+        """
+        vectors = prepare_vectors(vectors, self.index_config)
+        with self._lock:
+            self._refresh()
+            if self._index is None or not self._index.ntotal:
+                if similarities is not None:
+                    similarities.extend({} for _ in vectors)
+                return [[] for _ in vectors]
+            D, I = self._index.search(vectors, top_k)
+            ids = sorted({int(faiss_id) for row in I for faiss_id in row if faiss_id >= 0})
+            rows = self._conn.execute(
+                f"SELECT faiss_id, id, profile FROM candidates WHERE model = ? AND faiss_id IN ({','.join('?' * len(ids))})",
+                (self.model_name, *ids)
+            ).fetchall() if ids else []
+        # Candidates another process removed since the index was built are no longer in the table
+        found = {faiss_id: (cid, CandidateProfile.model_validate_json(profile)) for faiss_id, cid, profile in rows}
+        if similarities is not None:
+            similarities.extend(
+                {found[int(faiss_id)][0]: float(similarity) for faiss_id, similarity in zip(row, scores)
+                 if int(faiss_id) in found}
+                for row, scores in zip(I, search_similarities(D, self.index_config))
+            )
+        return [[found[int(faiss_id)] for faiss_id in row if int(faiss_id) in found] for row in I]
@@ -0,0 +1,141 @@
+from typing import Dict, Iterable, List, Optional
+import hashlib
+import numpy as np
+import faiss
+from models import JobPosting
+from .columns import JobColumns, job_faiss_id
+from .index import IndexConfig, build_index, configure_search, index_vectors, prepare_vectors, supports_removal
+from .skills import SkillIndex
+from .store import index_fingerprint
+
+# Compact a snapshot's string table once this share of it belongs to replaced or removed postings
+COMPACT_DEAD_SHARE = 0.25
+
+
+def build_job_index(vectors: np.ndarray, ids: List[int], index_config: IndexConfig) -> faiss.Index:
+    """Build an index over job vectors that is addressed by job FAISS ids"""
+    return build_index(vectors, ids, index_config)
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the job catalog and its FAISS index.
+
+    Updates never touch a published snapshot: `apply` copies the index,
+    changes the copy and returns a new snapshot, so a request that grabbed a
+    snapshot sees the same jobs and vectors for its whole lifetime.
+    """
+
+    def __init__(
+        self,
+        jobs: JobColumns,
+        keys: np.ndarray,
+        index: faiss.Index,
+        index_config: IndexConfig,
+        skills: SkillIndex = None
+    ):
+        # Postings stay in columns; a JobPosting is only built for the rows a request reads
+        self.jobs = jobs
+        # Embedding key per catalog row, as ASCII bytes
+        self.keys = keys
+        self.index = index
+        self.index_config = index_config
+        self.index_version = index_version(jobs.faiss_ids, keys, index_config)
+        self._version = None
+        self.skills = skills if skills is not None else SkillIndex(jobs)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the full catalog content, including fields that are not embedded"""
+        if self._version is None:
+            order = np.argsort(self.jobs.faiss_ids, kind="stable")
+            digest = hashlib.sha256(self.index_version.encode("ascii"))
+            digest.update(np.ascontiguousarray(self.jobs.faiss_ids[order]).tobytes())
+            digest.update(np.ascontiguousarray(self.jobs.digests[order]).tobytes())
+            self._version = digest.hexdigest()
+        return self._version
+
+    def __contains__(self, job_id: str) -> bool:
+        return self.jobs.find(job_id) is not None
+
+    def get(self, job_id: str) -> JobPosting:
+        row = self.jobs.find(job_id)
+        if row is None:
+            raise KeyError(job_id)
+        return self.jobs.job(row)
+
+    def digest(self, job_id: str) -> Optional[bytes]:
+        """Content digest of a posting, or None if it isn't in the catalog"""
+        row = self.jobs.find(job_id)
+        return None if row is None else bytes(self.jobs.digests[row])
+
+    def embedding_key(self, faiss_id: int) -> Optional[str]:
+        row = self.jobs.find_rows(np.array([faiss_id], dtype=np.int64))[0]
+        return None if row < 0 else self.keys[row].decode("ascii")
+
+    def apply(
+        self,
+        upserts: Dict[int, JobPosting],
+        keys: Dict[int, str],
+        vectors: Dict[int, np.ndarray],
+        removals: Iterable[int] = ()
+    ) -> "CatalogSnapshot":
+        """Return a new snapshot with jobs upserted or removed; only ids in `vectors` are re-indexed"""
+        removals = [faiss_id for faiss_id in removals if faiss_id in self.jobs]
+        replaced = [faiss_id for faiss_id in vectors if faiss_id in self.jobs]
+
+        index = self.index
+        stale = removals + replaced
+        if stale and not supports_removal(self.index):
+            # Graph indexes can't delete nodes, so rebuild from the vectors they already hold
+            ids, current = index_vectors(self.index)
+            keep = ~np.isin(ids, stale)
+            ids, current = list(ids[keep]), current[keep]
+            for faiss_id, vector in vectors.items():
+                ids.append(faiss_id)
+                current = np.vstack([current, vector[None, :]])
+            index = build_index(current, ids, self.index_config)
+        elif stale or vectors:
+            index = faiss.clone_index(self.index)
+            configure_search(index, self.index_config)
+            if stale:
+                index.remove_ids(np.array(stale, dtype=np.int64))
+            if vectors:
+                ids = list(vectors)
+                index.add_with_ids(prepare_vectors(np.stack([vectors[i] for i in ids]), self.index_config),
+                                   np.array(ids, dtype=np.int64))
+
+        # Upserted rows are appended after the current ones, then picked in catalog order:
+        # replaced postings keep their place and new postings go at the end
+        added = JobColumns.from_jobs(upserts.values())
+        combined = self.jobs.concat(added)
+        added_keys = np.array(
+            [keys.get(faiss_id) or self.embedding_key(faiss_id) for faiss_id in upserts], dtype="S64"
+        ).reshape(-1)
+        combined_keys = np.concatenate([np.asarray(self.keys), added_keys])
+        rows = np.arange(len(self.jobs))
+        if len(added):
+            existing = self.jobs.find_rows(added.faiss_ids)
+            rows[existing[existing >= 0]] = len(self.jobs) + np.flatnonzero(existing >= 0)
+            rows = np.concatenate([rows, len(self.jobs) + np.flatnonzero(existing < 0)])
+        if removals:
+            rows = rows[~np.isin(combined.faiss_ids[rows], removals)]
+        jobs = combined.take(rows)
+        # take shares the string table, so strings of replaced and removed postings pile up until compacted
+        if jobs.dead_bytes > COMPACT_DEAD_SHARE * len(jobs.strings):
+            jobs = jobs.compact()
+        return CatalogSnapshot(jobs, combined_keys[rows], index, self.index_config,
+                               skills=self.skills.apply(jobs, added, rows))
+
+
+def index_version(faiss_ids: np.ndarray, keys: np.ndarray, index_config: IndexConfig) -> str:
+    """Fingerprint of the indexed vectors and index layout, independent of insertion order"""
+    order = np.argsort(faiss_ids, kind="stable")
+    return index_fingerprint(
+        [f"{faiss_id}:{key}" for faiss_id, key in zip(np.asarray(faiss_ids)[order].tolist(),
+                                                       np.char.decode(np.asarray(keys)[order], "ascii").tolist())],
+        index_config.build_key()
+    )
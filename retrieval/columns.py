@@ -0,0 +1,346 @@
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+import hashlib
+import json
+import os
+import numpy as np
+from models import JobPosting, Skill
+
+# Bump when the on-disk column layout changes
+COLUMNS_FORMAT = 1
+
+# Strings stored per posting in the string table, in order
+TEXT_FIELDS = ("id", "title", "description")
+
+
+def job_faiss_id(job_id: str) -> int:
+    """Stable 63-bit FAISS id for a job posting id"""
+    return int.from_bytes(hashlib.sha256(job_id.encode("utf-8")).digest()[:8], "big") & (2 ** 63 - 1)
+
+
+def job_digest(job: JobPosting) -> bytes:
+    """16-byte digest of a posting's full content, used to fingerprint catalogs and detect changed postings"""
+    return hashlib.sha256(job.model_dump_json().encode("utf-8")).digest()[:16]
+
+
+class SkillColumns(NamedTuple):
+    """CSR skill lists: row i's skills are entries offsets[i]:offsets[i + 1] of the other arrays"""
+    offsets: np.ndarray  # int64, one more than the row count
+    names: np.ndarray    # int32 ids into JobColumns.skill_names
+    levels: np.ndarray   # int16 codes into JobColumns.levels, -1 when unset
+    years: np.ndarray    # float64, NaN when unset
+
+
+def _csr_positions(offsets: np.ndarray, rows: np.ndarray):
+    """(new offsets, flat positions) selecting the given rows' entries of a CSR array, row after row"""
+    starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+    new_offsets = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    positions = np.arange(new_offsets[-1]) - np.repeat(new_offsets[:-1], counts) + np.repeat(starts, counts)
+    return new_offsets, positions
+
+
+def _cat(arrays: List[np.ndarray], dtype) -> np.ndarray:
+    return np.concatenate(arrays).astype(dtype, copy=False) if arrays else np.empty(0, dtype=dtype)
+
+
+class JobColumns(Mapping):
+    """
+    Array-backed job catalog: FAISS id -> JobPosting, built on access.
+
+    Postings are held as NumPy columns instead of pydantic objects. Ids, titles
+    and descriptions are offsets into one UTF-8 string table, skill names and
+    levels are interned, and skill lists are CSR arrays. Saved columns are
+    loaded with `mmap_mode="r"`, so worker processes share the same pages, and
+    a `JobPosting` is only built for the rows a caller actually reads.
+    """
+
+    def __init__(
+        self,
+        faiss_ids: np.ndarray,
+        text_refs: np.ndarray,
+        strings: np.ndarray,
+        string_offsets: np.ndarray,
+        required: SkillColumns,
+        preferred: SkillColumns,
+        has_preferred: np.ndarray,
+        min_experience: np.ndarray,
+        digests: np.ndarray,
+        skill_names: List[str],
+        levels: List[str]
+    ):
+        self.faiss_ids = faiss_ids
+        self.text_refs = text_refs
+        self.strings = strings
+        self.string_offsets = string_offsets
+        self.required = required
+        self.preferred = preferred
+        self.has_preferred = has_preferred
+        self.min_experience = min_experience
+        self.digests = digests
+        self.skill_names = skill_names
+        self.levels = levels
+        self._order = None
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[JobPosting]) -> "JobColumns":
+        """Pack postings into columns; ids are expected to be unique"""
+        skill_names: Dict[str, int] = {}
+        levels: Dict[str, int] = {}
+        faiss_ids, parts, digests, min_experience, has_preferred = [], [], [], [], []
+        packed = {"required": ([0], [], [], []), "preferred": ([0], [], [], [])}
+
+        for job in jobs:
+            faiss_ids.append(job_faiss_id(job.id))
+            parts.extend(getattr(job, field).encode("utf-8") for field in TEXT_FIELDS)
+            digests.append(job_digest(job))
+            min_experience.append(np.nan if job.min_experience_years is None else job.min_experience_years)
+            has_preferred.append(job.preferred_skills is not None)
+            for kind, skills in (("required", job.required_skills), ("preferred", job.preferred_skills or [])):
+                offsets, names, codes, years = packed[kind]
+                for skill in skills:
+                    names.append(skill_names.setdefault(skill.name, len(skill_names)))
+                    codes.append(-1 if skill.level is None else levels.setdefault(skill.level, len(levels)))
+                    years.append(np.nan if skill.years is None else skill.years)
+                offsets.append(len(names))
+
+        lengths = np.fromiter((len(part) for part in parts), dtype=np.int64, count=len(parts))
+        return cls(
+            faiss_ids=np.array(faiss_ids, dtype=np.int64),
+            text_refs=np.arange(len(parts), dtype=np.int64).reshape(-1, len(TEXT_FIELDS)),
+            strings=np.frombuffer(b"".join(parts), dtype=np.uint8),
+            string_offsets=np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+            required=cls._skill_columns(*packed["required"]),
+            preferred=cls._skill_columns(*packed["preferred"]),
+            has_preferred=np.array(has_preferred, dtype=bool),
+            min_experience=np.array(min_experience, dtype=np.float64),
+            digests=np.frombuffer(b"".join(digests), dtype=np.uint8).reshape(-1, 16),
+            skill_names=list(skill_names),
+            levels=list(levels)
+        )
+
+    @staticmethod
+    def _skill_columns(offsets, names, codes, years) -> SkillColumns:
+        return SkillColumns(np.array(offsets, dtype=np.int64), np.array(names, dtype=np.int32),
+                            np.array(codes, dtype=np.int16), np.array(years, dtype=np.float64))
+
+    # Mapping interface: FAISS id -> JobPosting
+
+    def __len__(self) -> int:
+        return len(self.faiss_ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return (int(faiss_id) for faiss_id in self.faiss_ids)
+
+    def __getitem__(self, faiss_id: int) -> JobPosting:
+        return self.job(int(self.rows_of([faiss_id])[0]))
+
+    def __contains__(self, faiss_id) -> bool:
+        return self.find_rows(np.array([faiss_id], dtype=np.int64))[0] >= 0
+
+    def values(self) -> List[JobPosting]:
+        return list(self.iter_jobs())
+
+    def iter_jobs(self) -> Iterator[JobPosting]:
+        """Postings in row order, built one at a time"""
+        return (self.job(row) for row in range(len(self)))
+
+    # Row access
+
+    def find_rows(self, faiss_ids: np.ndarray) -> np.ndarray:
+        """Row of each FAISS id, -1 for ids not in the catalog"""
+        if self._order is None:
+            self._order = np.argsort(self.faiss_ids, kind="stable")
+        if not len(self):
+            return np.full(len(faiss_ids), -1, dtype=np.int64)
+        ordered = self.faiss_ids[self._order]
+        positions = np.minimum(np.searchsorted(ordered, faiss_ids), len(self) - 1)
+        return np.where(ordered[positions] == faiss_ids, self._order[positions], -1)
+
+    def rows_of(self, faiss_ids: Sequence[int]) -> np.ndarray:
+        rows = self.find_rows(np.asarray(faiss_ids, dtype=np.int64))
+        if (rows < 0).any():
+            raise KeyError(int(np.asarray(faiss_ids)[rows < 0][0]))
+        return rows
+
+    def find(self, job_id: str) -> Optional[int]:
+        """Row of a posting id, or None"""
+        row = int(self.find_rows(np.array([job_faiss_id(job_id)], dtype=np.int64))[0])
+        return row if row >= 0 and self.text(row, "id") == job_id else None
+
+    def text(self, row: int, field: str) -> str:
+        ref = self.text_refs[row, TEXT_FIELDS.index(field)]
+        return bytes(self.strings[self.string_offsets[ref]:self.string_offsets[ref + 1]]).decode("utf-8")
+
+    def _skills(self, columns: SkillColumns, row: int) -> List[Skill]:
+        start, end = columns.offsets[row], columns.offsets[row + 1]
+        return [
+            Skill(
+                name=self.skill_names[name],
+                level=self.levels[code] if code >= 0 else None,
+                years=None if np.isnan(years) else float(years)
+            )
+            for name, code, years in zip(columns.names[start:end].tolist(), columns.levels[start:end].tolist(),
+                                         columns.years[start:end].tolist())
+        ]
+
+    def job(self, row: int) -> JobPosting:
+        """Build the posting stored in a row"""
+        min_experience = float(self.min_experience[row])
+        return JobPosting(
+            id=self.text(row, "id"),
+            title=self.text(row, "title"),
+            description=self.text(row, "description"),
+            required_skills=self._skills(self.required, row),
+            preferred_skills=self._skills(self.preferred, row) if self.has_preferred[row] else None,
+            min_experience_years=None if np.isnan(min_experience) else min_experience
+        )
+
+    # Building new columns; published columns are never modified
+
+    def take(self, rows: Sequence[int]) -> "JobColumns":
+        """Columns holding the given rows, in the given order; the string table is shared, not copied"""
+        rows = np.asarray(rows, dtype=np.int64)
+        return JobColumns(
+            faiss_ids=self.faiss_ids[rows],
+            text_refs=self.text_refs[rows],
+            strings=self.strings,
+            string_offsets=self.string_offsets,
+            required=self._take_skills(self.required, rows),
+            preferred=self._take_skills(self.preferred, rows),
+            has_preferred=self.has_preferred[rows],
+            min_experience=self.min_experience[rows],
+            digests=self.digests[rows],
+            skill_names=self.skill_names,
+            levels=self.levels
+        )
+
+    @staticmethod
+    def _take_skills(columns: SkillColumns, rows: np.ndarray) -> SkillColumns:
+        offsets, positions = _csr_positions(columns.offsets, rows)
+        return SkillColumns(offsets, columns.names[positions], columns.levels[positions], columns.years[positions])
+
+    def concat(self, other: "JobColumns") -> "JobColumns":
+        """Rows of self followed by rows of other"""
+        return JobColumns.concatenate([self, other])
+
+    @staticmethod
+    def concatenate(parts: Sequence["JobColumns"]) -> "JobColumns":
+        """Rows of every part in order, with interned names and string table offsets remapped in one pass"""
+        skill_names: Dict[str, int] = {}
+        levels: Dict[str, int] = {}
+        name_maps, level_maps = [], []
+        for part in parts:
+            name_maps.append(np.array([skill_names.setdefault(name, len(skill_names)) for name in part.skill_names],
+                                      dtype=np.int32))
+            # A trailing -1 entry keeps unset levels unset
+            level_maps.append(np.array([levels.setdefault(level, len(levels)) for level in part.levels] + [-1],
+                                       dtype=np.int16))
+
+        def shifted(arrays: List[np.ndarray], sizes: List[int]) -> List[np.ndarray]:
+            """Each array plus the running total of the sizes before it"""
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+            return [array + start for array, start in zip(arrays, starts)]
+
+        def merge(kind: str) -> SkillColumns:
+            columns = [getattr(part, kind) for part in parts]
+            offsets = shifted([c.offsets[1:] for c in columns], [c.offsets[-1] for c in columns])
+            return SkillColumns(
+                np.concatenate([[0]] + offsets).astype(np.int64),
+                _cat([names[c.names] for names, c in zip(name_maps, columns)], np.int32),
+                _cat([codes[c.levels] for codes, c in zip(level_maps, columns)], np.int16),
+                _cat([c.years for c in columns], np.float64)
+            )
+
+        string_counts = [len(part.string_offsets) - 1 for part in parts]
+        string_offsets = shifted([part.string_offsets[1:] for part in parts], [len(part.strings) for part in parts])
+        return JobColumns(
+            faiss_ids=_cat([part.faiss_ids for part in parts], np.int64),
+            text_refs=np.concatenate([np.empty((0, len(TEXT_FIELDS)), dtype=np.int64)]
+                                     + shifted([part.text_refs for part in parts], string_counts)),
+            strings=_cat([part.strings for part in parts], np.uint8),
+            string_offsets=np.concatenate([[0]] + string_offsets).astype(np.int64),
+            required=merge("required"),
+            preferred=merge("preferred"),
+            has_preferred=_cat([part.has_preferred for part in parts], bool),
+            min_experience=_cat([part.min_experience for part in parts], np.float64),
+            digests=np.concatenate([np.empty((0, 16), dtype=np.uint8)] + [part.digests for part in parts]),
+            skill_names=list(skill_names),
+            levels=list(levels)
+        )
+
+    @property
+    def dead_bytes(self) -> int:
+        """String table bytes no row refers to any more, e.g. the strings of replaced or removed postings"""
+        refs = self.text_refs.ravel()
+        return len(self.strings) - int((self.string_offsets[refs + 1] - self.string_offsets[refs]).sum())
+
+    def compact(self) -> "JobColumns":
+        """Copy with a string table holding only strings still referenced, in row order"""
+        refs = self.text_refs.ravel()
+        if np.array_equal(refs, np.arange(len(self.string_offsets) - 1)):
+            return self
+        string_offsets, positions = _csr_positions(np.asarray(self.string_offsets), refs)
+        compacted = self.take(np.arange(len(self)))
+        compacted.text_refs = np.arange(len(refs), dtype=np.int64).reshape(-1, len(TEXT_FIELDS))
+        compacted.strings = np.asarray(self.strings)[positions]
+        compacted.string_offsets = string_offsets
+        return compacted
+
+    # Persistence
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {
+            "faiss_ids": self.faiss_ids,
+            "text_refs": self.text_refs,
+            "strings": self.strings,
+            "string_offsets": self.string_offsets,
+            "has_preferred": self.has_preferred,
+            "min_experience": self.min_experience,
+            "digests": self.digests
+        }
+        for kind in ("required", "preferred"):
+            for field, array in getattr(self, kind)._asdict().items():
+                arrays[f"{kind}_{field}"] = array
+        return arrays
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays().values())
+
+    def save(self, directory: str):
+        """Write one .npy file per column plus the interned vocabularies"""
+        os.makedirs(directory, exist_ok=True)
+        columns = self.compact()
+        for name, array in columns.arrays().items():
+            np.save(os.path.join(directory, f"{name}.npy"), np.ascontiguousarray(array))
+        with open(os.path.join(directory, "meta.json"), "w") as f:
+            json.dump({"format": COLUMNS_FORMAT, "rows": len(columns),
+                       "skill_names": columns.skill_names, "levels": columns.levels}, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True) -> Optional["JobColumns"]:
+        """Load saved columns, memory-mapped read-only by default; None if missing or from another format"""
+        try:
+            with open(os.path.join(directory, "meta.json")) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("format") != COLUMNS_FORMAT:
+            return None
+
+        def load(name: str) -> np.ndarray:
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r" if mmap else None)
+
+        return cls(
+            faiss_ids=load("faiss_ids"),
+            text_refs=load("text_refs"),
+            strings=load("strings"),
+            string_offsets=load("string_offsets"),
+            required=SkillColumns(*(load(f"required_{field}") for field in SkillColumns._fields)),
+            preferred=SkillColumns(*(load(f"preferred_{field}") for field in SkillColumns._fields)),
+            has_preferred=load("has_preferred"),
+            min_experience=load("min_experience"),
+            digests=load("digests"),
+            skill_names=meta["skill_names"],
+            levels=meta["levels"]
+        )
@@ -0,0 +1,319 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+import time
+import numpy as np
+import faiss
+from pydantic import BaseModel
+import config
+
+INDEX_KINDS = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# cosine indexes normalized vectors for inner-product search, so search scores are cosine similarities
+INDEX_METRICS = ("cosine", "l2")
+# How a candidate's query vectors (profile and resume chunks) combine into one similarity per job
+POOLING_MODES = ("max", "mean")
+
+# k-means wants roughly this many training points per IVF list
+MIN_POINTS_PER_LIST = 39
+
+
+class IndexConfig(BaseModel):
+    """FAISS index backend and its build/search parameters"""
+    kind: str = "flat"
+    metric: str = "cosine"
+    nlist: int = 1024            # IVF: number of inverted lists
+    nprobe: int = 16             # IVF: lists scanned per query
+    pq_m: int = 64               # IVF-PQ: sub-quantizers per vector
+    pq_bits: int = 8             # IVF-PQ: bits per sub-quantizer code
+    hnsw_m: int = 32             # HNSW: graph neighbours per node
+    ef_construction: int = 200   # HNSW: build-time beam width
+    ef_search: int = 64          # HNSW: query-time beam width
+    max_train_points: int = 100_000
+
+    @classmethod
+    def from_env(cls) -> "IndexConfig":
+        return cls(
+            kind=config.INDEX_KIND,
+            metric=config.INDEX_METRIC,
+            nlist=config.INDEX_NLIST,
+            nprobe=config.INDEX_NPROBE,
+            pq_m=config.INDEX_PQ_M,
+            pq_bits=config.INDEX_PQ_BITS,
+            hnsw_m=config.INDEX_HNSW_M,
+            ef_construction=config.INDEX_EF_CONSTRUCTION,
+            ef_search=config.INDEX_EF_SEARCH
+        )
+
+    def resolve(self, count: int, dimension: int) -> "IndexConfig":
+        """Adapt the configuration to the catalog size, falling back to flat when it is too small to train"""
+        if self.kind not in INDEX_KINDS:
+            raise ValueError(f"Unknown index kind '{self.kind}', expected one of {', '.join(INDEX_KINDS)}")
+        if self.metric not in INDEX_METRICS:
+            raise ValueError(f"Unknown index metric '{self.metric}', expected one of {', '.join(INDEX_METRICS)}")
+        if self.kind in ("ivf_flat", "ivf_pq"):
+            nlist = min(self.nlist, count // MIN_POINTS_PER_LIST)
+            if nlist < 2 or (self.kind == "ivf_pq" and count < 2 ** self.pq_bits):
+                print(f"Catalog of {count} jobs is too small to train {self.kind}; using flat index")
+                return self.model_copy(update={"kind": "flat"})
+            if self.kind == "ivf_pq" and dimension % self.pq_m:
+                raise ValueError(f"pq_m={self.pq_m} must divide the embedding dimension {dimension}")
+            return self.model_copy(update={"nlist": nlist})
+        return self
+
+    def factory_string(self) -> str:
+        """FAISS index_factory description; every layout accepts caller-provided ids"""
+        if self.kind == "ivf_flat":
+            return f"IVF{self.nlist},Flat"
+        if self.kind == "ivf_pq":
+            return f"IVF{self.nlist},PQ{self.pq_m}x{self.pq_bits}"
+        if self.kind == "hnsw":
+            return f"IDMap2,HNSW{self.hnsw_m},Flat"
+        return "IDMap2,Flat"
+
+    def build_key(self) -> str:
+        """Identifies the build-time layout; search-time parameters are applied after loading"""
+        key = self.factory_string()
+        if self.kind == "hnsw":
+            key += f",efC{self.ef_construction}"
+        if self.metric == "cosine":
+            key += ",cosine"
+        return key
+
+    @property
+    def faiss_metric(self) -> int:
+        return faiss.METRIC_INNER_PRODUCT if self.metric == "cosine" else faiss.METRIC_L2
+
+
+def prepare_vectors(vectors: np.ndarray, index_config: IndexConfig) -> np.ndarray:
+    """Contiguous float32 vectors as the index expects them: unit length for cosine indexes"""
+    vectors = np.array(vectors, dtype=np.float32, order="C", ndmin=2)
+    if index_config.metric == "cosine":
+        faiss.normalize_L2(vectors)
+    return vectors
+
+
+def search_similarities(scores: np.ndarray, index_config: IndexConfig) -> np.ndarray:
+    """
+    Cosine similarities from index search scores. Cosine indexes return them
+    directly; L2 indexes return squared distances, which map to cosine as
+    1 - d / 2 for unit-length embeddings such as OpenAI's.
+    """
+    scores = np.asarray(scores, dtype=np.float32)
+    return scores if index_config.metric == "cosine" else 1.0 - scores / 2.0
+
+
+def pool_similarities(
+    similarities: np.ndarray,
+    ids: np.ndarray,
+    owners: np.ndarray,
+    weights: np.ndarray,
+    pooling: str = "max"
+) -> List[Dict[int, float]]:
+    """
+    One similarity per id and owner from a multi-vector search, best first.
+    Row i of `similarities`/`ids` is a query of owner `owners[i]` weighted
+    `weights[i]`. `max` keeps each id's best weighted similarity over the
+    owner's rows; `mean` takes the weighted mean, where a row that didn't
+    return the id counts its lowest returned similarity, an upper bound.
+    """
+    pooled: List[Dict[int, float]] = [{} for _ in range(int(owners.max()) + 1 if len(owners) else 0)]
+    for owner, group in enumerate(pooled):
+        rows = np.flatnonzero(owners == owner)
+        found = [{int(i): float(s) for i, s in zip(ids[row], similarities[row]) if i >= 0} for row in rows]
+        candidates = set().union(*found)
+        for faiss_id in candidates:
+            if pooling == "max":
+                group[faiss_id] = float(max(weights[row] * hits[faiss_id] for row, hits in zip(rows, found) if faiss_id in hits))
+            else:
+                total = sum(weights[row] * hits.get(faiss_id, min(hits.values(), default=0.0)) for row, hits in zip(rows, found))
+                group[faiss_id] = float(total / weights[rows].sum())
+        pooled[owner] = dict(sorted(group.items(), key=lambda item: item[1], reverse=True))
+    return pooled
+
+
+def _inner_index(index: faiss.Index) -> faiss.Index:
+    """Unwrap an ID map to the index that holds the vectors"""
+    index = faiss.downcast_index(index)
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def configure_search(index: faiss.Index, index_config: IndexConfig) -> faiss.Index:
+    """
+    Apply query-time parameters, which are not reliably persisted with the index.
+
+    Parameters are matched to the index actually built, which may be a flat
+    fallback for catalogs too small to train the configured kind.
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(index_config.nprobe, ivf.nlist)
+    inner = _inner_index(index)
+    if isinstance(inner, faiss.IndexHNSW):
+        inner.hnsw.efSearch = index_config.ef_search
+    return index
+
+
+def search_parameters(index: faiss.Index, index_config: IndexConfig, allowed_ids: np.ndarray) -> faiss.SearchParameters:
+    """Restrict a search to the given ids inside the scan, keeping the configured query-time parameters"""
+    selector = faiss.IDSelectorBatch(np.ascontiguousarray(allowed_ids, dtype=np.int64))
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=min(index_config.nprobe, ivf.nlist))
+    if isinstance(_inner_index(index), faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index_config.ef_search)
+    return faiss.SearchParameters(sel=selector)
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """Whether vectors can be removed in place; HNSW graphs can't delete nodes"""
+    return not isinstance(_inner_index(index), faiss.IndexHNSW)
+
+
+def training_sample(count: int, max_points: int) -> Optional[np.ndarray]:
+    """Sorted rows to train on when there are more than max_points vectors, else None for all of them"""
+    if count <= max_points:
+        return None
+    return np.sort(np.random.default_rng(0).choice(count, max_points, replace=False))
+
+
+class IndexBuilder:
+    """
+    Fill an index chunk by chunk so the full vector matrix never has to be in memory.
+
+    Index kinds that need training are trained by `train`, or else on the first
+    `max_train_points` vectors added, which are buffered until then.
+    """
+
+    def __init__(self, index_config: IndexConfig, count: int):
+        self.index_config = index_config
+        self.count = count
+        self.index: Optional[faiss.Index] = None
+        self._pending: List[Tuple[np.ndarray, np.ndarray]] = []
+
+    @property
+    def needs_training(self) -> bool:
+        return self.index_config.kind in ("ivf_flat", "ivf_pq") and (self.index is None or not self.index.is_trained)
+
+    def _create(self, dimension: int):
+        self.index_config = self.index_config.resolve(self.count, dimension)
+        self.index = faiss.index_factory(dimension, self.index_config.factory_string(), self.index_config.faiss_metric)
+        if self.index_config.kind == "hnsw":
+            _inner_index(self.index).hnsw.efConstruction = self.index_config.ef_construction
+
+    def train(self, vectors: np.ndarray) -> "IndexBuilder":
+        vectors = prepare_vectors(vectors, self.index_config)
+        if self.index is None:
+            self._create(vectors.shape[1])
+        if not self.index.is_trained:
+            self.index.train(vectors)
+        for pending, ids in self._pending:
+            self.index.add_with_ids(pending, ids)
+        self._pending = []
+        return self
+
+    def add(self, vectors: np.ndarray, ids: Sequence[int]) -> "IndexBuilder":
+        vectors = prepare_vectors(vectors, self.index_config)
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.index is None:
+            self._create(vectors.shape[1])
+        if self.index.is_trained:
+            self.index.add_with_ids(vectors, ids)
+            return self
+        self._pending.append((vectors, ids))
+        if sum(len(pending) for pending, _ in self._pending) >= min(self.count, self.index_config.max_train_points):
+            self.train(np.concatenate([pending for pending, _ in self._pending])[:self.index_config.max_train_points])
+        return self
+
+    def finish(self) -> faiss.Index:
+        if self.index is None:
+            raise ValueError("No vectors were added to the index")
+        if self._pending:
+            self.train(np.concatenate([pending for pending, _ in self._pending]))
+        return configure_search(self.index, self.index_config)
+
+
+def build_index(vectors: np.ndarray, ids: Sequence[int], index_config: IndexConfig) -> faiss.Index:
+    """Train (when needed) and fill an index of the configured kind"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    builder = IndexBuilder(index_config, len(vectors))
+    if builder.needs_training:
+        sample = training_sample(len(vectors), index_config.max_train_points)
+        builder.train(vectors if sample is None else vectors[sample])
+    return builder.add(vectors, ids).finish()
+
+
+def index_vectors(index: faiss.Index) -> Tuple[np.ndarray, np.ndarray]:
+    """Recover (ids, vectors) from an ID-mapped index, e.g. to rebuild a graph index without removal support"""
+    index = faiss.downcast_index(index)
+    ids = faiss.vector_to_array(index.id_map)
+    vectors = _inner_index(index).reconstruct_n(0, index.ntotal)
+    return ids, vectors
+
+
+def index_memory_bytes(index: faiss.Index) -> int:
+    """Serialized size of an index, a close proxy for its resident memory"""
+    return int(faiss.serialize_index(index).size)
+
+
+def evaluate_indexes(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    index_configs: List[IndexConfig],
+    k: int = 10
+) -> List[Dict]:
+    """
+    Recall-vs-latency report for each configuration against exact flat search.
+
+    Returns one row per configuration with build time, recall@k relative to
+    the flat index, per-query latency percentiles and serialized index size.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    ids = np.arange(len(vectors), dtype=np.int64)
+
+    # Exact search with each metric in use is the ground truth for indexes of that metric
+    truths = {}
+    for metric in {index_config.metric for index_config in index_configs}:
+        exact_config = IndexConfig(kind="flat", metric=metric)
+        exact = build_index(vectors, ids, exact_config)
+        truths[metric] = exact.search(prepare_vectors(queries, exact_config), k)[1]
+
+    report = []
+    built: Dict[str, faiss.Index] = {}
+    for index_config in index_configs:
+        resolved = index_config.resolve(len(vectors), vectors.shape[1])
+        truth = truths[resolved.metric]
+        queries_prepared = prepare_vectors(queries, resolved)
+        build_seconds: Optional[float] = None
+        # Configurations that only differ in search parameters share one build
+        index = built.get(resolved.build_key())
+        if index is None:
+            start = time.perf_counter()
+            index = build_index(vectors, ids, resolved)
+            build_seconds = time.perf_counter() - start
+            built[resolved.build_key()] = index
+        configure_search(index, resolved)
+
+        latencies = []
+        found = np.empty_like(truth)
+        for row, query in enumerate(queries_prepared):
+            start = time.perf_counter()
+            _, found[row:row + 1] = index.search(query[None, :], k)
+            latencies.append(time.perf_counter() - start)
+
+        recall = np.mean([
+            len(set(found[row]) & set(truth[row])) / k for row in range(len(queries))
+        ])
+        report.append({
+            "kind": resolved.kind,
+            "metric": resolved.metric,
+            "index": resolved.factory_string(),
+            "nprobe": resolved.nprobe if resolved.kind in ("ivf_flat", "ivf_pq") else None,
+            "ef_search": resolved.ef_search if resolved.kind == "hnsw" else None,
+            "build_seconds": build_seconds,
+            f"recall_at_{k}": float(recall),
+            "latency_ms_p50": float(np.percentile(latencies, 50) * 1000),
+            "latency_ms_p95": float(np.percentile(latencies, 95) * 1000),
+            "memory_bytes": index_memory_bytes(index)
+        })
+    return report
@@ -0,0 +1,249 @@
+from typing import Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+import json
+import os
+import re
+import struct
+import zlib
+from pydantic import ValidationError
+from models import JobPosting
+
+CATALOG_FORMATS = ("json", "jsonl", "chunked")
+
+# Chunked binary catalogs: magic, then (record count, payload bytes) headers each followed by zlib-compressed JSON lines
+CHUNKED_MAGIC = b"JOBCAT\x01\n"
+CHUNK_HEADER = struct.Struct("<II")
+CHUNKED_EXTENSIONS = (".jcat",)
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+# Characters read per refill of the streaming JSON parser, and the largest single record it will buffer
+READ_SIZE = 1 << 16
+MAX_RECORD_CHARS = 1 << 24
+WHITESPACE = re.compile(r"\s*")
+
+# Stands in for a line that isn't valid JSON, already reported by the line reader
+MALFORMED = object()
+
+
+class CatalogLoadError(ValueError):
+    """The catalog file as a whole can't be read: missing, not in a known format or structurally broken"""
+
+
+class CatalogRecordError(NamedTuple):
+    """A catalog record that was skipped, by 1-based position in the file"""
+    record: int
+    job_id: Optional[str]
+    error: str
+
+    def __str__(self) -> str:
+        return f"record {self.record}" + (f" ({self.job_id})" if self.job_id else "") + f": {self.error}"
+
+
+def catalog_format(path: str) -> str:
+    """Catalog format from the file extension, falling back to the chunked magic bytes, then JSON"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in JSONL_EXTENSIONS:
+        return "jsonl"
+    if extension in CHUNKED_EXTENSIONS:
+        return "chunked"
+    try:
+        with open(path, "rb") as f:
+            if f.read(len(CHUNKED_MAGIC)) == CHUNKED_MAGIC:
+                return "chunked"
+    except FileNotFoundError:
+        pass
+    return "json"
+
+
+def parse_job(data, record: int, errors: List[CatalogRecordError]) -> Optional[JobPosting]:
+    """Validate one raw record; invalid records are appended to `errors` and skipped"""
+    if not isinstance(data, dict):
+        errors.append(CatalogRecordError(record, None, f"expected an object, got {type(data).__name__}"))
+        return None
+    job_id = data.get("id") if isinstance(data.get("id"), str) else None
+    try:
+        return JobPosting.model_validate(data)
+    except ValidationError as e:
+        detail = "; ".join(f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors())
+        errors.append(CatalogRecordError(record, job_id, detail))
+        return None
+
+
+def _iter_json_array(f: TextIO) -> Iterator:
+    """
+    Decode the elements of a `{"jobs": [...]}` document (or a bare top-level
+    array) one at a time, holding only the current record and a read buffer.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        data = f.read(READ_SIZE)
+        eof = not data
+        buffer, pos = buffer[pos:] + data, 0
+        return not eof
+
+    def skip_whitespace() -> Optional[str]:
+        nonlocal pos
+        while True:
+            pos = WHITESPACE.match(buffer, pos).end()
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return None
+
+    start = skip_whitespace()
+    if start == "{":
+        while True:
+            match = re.search(r'"jobs"\s*:\s*\[', buffer[pos:])
+            if match:
+                pos += match.end()
+                break
+            if len(buffer) - pos > MAX_RECORD_CHARS or not fill():
+                raise CatalogLoadError('no "jobs" array found')
+    elif start == "[":
+        pos += 1
+    else:
+        raise CatalogLoadError("expected a JSON object with a \"jobs\" array or a JSON array")
+
+    record = 0
+    while True:
+        char = skip_whitespace()
+        if char is None:
+            raise CatalogLoadError(f"unterminated jobs array after record {record}")
+        if char == "]":
+            return
+        if record:
+            if char != ",":
+                raise CatalogLoadError(f"expected ',' or ']' after record {record}")
+            pos += 1
+            if skip_whitespace() is None:
+                raise CatalogLoadError(f"unterminated jobs array after record {record}")
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A value ending at the buffer edge may continue in the next read
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError as e:
+                if eof or len(buffer) - pos > MAX_RECORD_CHARS:
+                    raise CatalogLoadError(f"malformed JSON in record {record + 1}: {e.msg}") from e
+            if not fill() and pos >= len(buffer):
+                raise CatalogLoadError(f"unterminated jobs array after record {record}")
+        pos = end
+        record += 1
+        yield value
+
+
+def _iter_jsonl(lines: Iterable[str], errors: List[CatalogRecordError]) -> Iterator:
+    """One JSON value per non-blank line; a malformed line only loses that record and yields MALFORMED"""
+    record = 0
+    for line in lines:
+        if not line.strip():
+            continue
+        record += 1
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            errors.append(CatalogRecordError(record, None, f"malformed JSON: {e.msg}"))
+            yield MALFORMED
+
+
+def _iter_chunk_lines(f) -> Iterator[str]:
+    """Record lines of a chunked binary catalog, decompressing one chunk at a time"""
+    if f.read(len(CHUNKED_MAGIC)) != CHUNKED_MAGIC:
+        raise CatalogLoadError("not a chunked job catalog")
+    chunk = 0
+    while True:
+        header = f.read(CHUNK_HEADER.size)
+        if not header:
+            return
+        chunk += 1
+        if len(header) < CHUNK_HEADER.size:
+            raise CatalogLoadError(f"truncated header of chunk {chunk}")
+        count, size = CHUNK_HEADER.unpack(header)
+        payload = f.read(size)
+        if len(payload) < size:
+            raise CatalogLoadError(f"truncated chunk {chunk}")
+        try:
+            lines = zlib.decompress(payload).decode("utf-8").split("\n")
+        except (zlib.error, UnicodeDecodeError) as e:
+            raise CatalogLoadError(f"corrupt chunk {chunk}: {e}") from e
+        if len(lines) != count:
+            raise CatalogLoadError(f"chunk {chunk} holds {len(lines)} records, header says {count}")
+        yield from lines
+
+
+def iter_job_records(path: str, errors: List[CatalogRecordError] = None) -> Iterator[Tuple[int, JobPosting]]:
+    """
+    Stream (record number, posting) for the valid records of a JSON, JSON Lines
+    or chunked binary catalog.
+
+    Records that fail validation are skipped and reported in `errors`; a file
+    that can't be read as a catalog at all raises CatalogLoadError.
+    """
+    errors = [] if errors is None else errors
+    catalog = catalog_format(path)
+    try:
+        with open(path, "rb" if catalog == "chunked" else "r", encoding=None if catalog == "chunked" else "utf-8") as f:
+            if catalog == "chunked":
+                records = _iter_jsonl(_iter_chunk_lines(f), errors)
+            elif catalog == "jsonl":
+                records = _iter_jsonl(f, errors)
+            else:
+                records = _iter_json_array(f)
+            for record, data in enumerate(records, 1):
+                if data is MALFORMED:
+                    continue
+                job = parse_job(data, record, errors)
+                if job is not None:
+                    yield record, job
+    except (OSError, UnicodeDecodeError) as e:
+        raise CatalogLoadError(f"can't read job catalog {path}: {e}") from e
+
+
+def iter_job_catalog(path: str, errors: List[CatalogRecordError] = None) -> Iterator[JobPosting]:
+    """Stream the valid postings of a catalog file; see iter_job_records"""
+    return (job for _, job in iter_job_records(path, errors))
+
+
+def write_job_catalog(jobs: Iterable[JobPosting], path: str, chunk_size: int = 10000):
+    """Stream postings to `path` in the format its extension selects, replacing the file atomically"""
+    catalog = catalog_format(path)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        if catalog == "chunked":
+            with open(tmp_path, "wb") as f:
+                f.write(CHUNKED_MAGIC)
+                lines = []
+                for job in jobs:
+                    lines.append(job.model_dump_json(exclude_none=True))
+                    if len(lines) == chunk_size:
+                        _write_chunk(f, lines)
+                        lines = []
+                if lines:
+                    _write_chunk(f, lines)
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if catalog == "jsonl":
+                    for job in jobs:
+                        f.write(job.model_dump_json(exclude_none=True) + "\n")
+                else:
+                    # Same layout as json.dump(..., indent=4) of {"jobs": [...]}, one posting at a time
+                    f.write('{\n    "jobs": [')
+                    for i, job in enumerate(jobs):
+                        record = json.dumps(job.model_dump(exclude_none=True), indent=4).replace("\n", "\n        ")
+                        f.write(("," if i else "") + "\n        " + record)
+                    f.write("\n    ]\n}")
+    except BaseException:
+        # A failing source stream leaves the current catalog untouched
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, path)
+
+
+def _write_chunk(f, lines: List[str]):
+    payload = zlib.compress("\n".join(lines).encode("utf-8"))
+    f.write(CHUNK_HEADER.pack(len(lines), len(payload)))
+    f.write(payload)
@@ -0,0 +1,322 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import copy
+import re
+import numpy as np
+from models import CandidateProfile
+from .columns import JobColumns, SkillColumns, _csr_positions
+
+# Common spellings mapped to one vocabulary entry
+SKILL_ALIASES = {
+    "golang": "go",
+    "js": "javascript",
+    "ts": "typescript",
+    "k8s": "kubernetes",
+    "postgres": "postgresql",
+    "nodejs": "node.js",
+    "node": "node.js",
+    "ml": "machine learning",
+    "amazon web services": "aws",
+    "sklearn": "scikit-learn",
+    "cicd": "ci/cd",
+    "ci cd": "ci/cd",
+}
+
+# Relative strength of a skill level; unknown levels count as intermediate
+LEVEL_WEIGHTS = {
+    "beginner": 1 / 3,
+    "junior": 1 / 3,
+    "intermediate": 2 / 3,
+    "advanced": 0.85,
+    "senior": 1.0,
+    "expert": 1.0,
+}
+DEFAULT_LEVEL_WEIGHT = LEVEL_WEIGHTS["intermediate"]
+
+# Weight of required vs preferred skill coverage in the pre-score
+REQUIRED_WEIGHT = 0.75
+
+
+def normalize_skill(name: str) -> str:
+    """Canonical vocabulary form of a skill name: lower case, single spaces, aliases resolved"""
+    name = re.sub(r"\s+", " ", name.strip().lower())
+    return SKILL_ALIASES.get(name, name)
+
+
+def level_weight(level: Optional[str]) -> float:
+    return LEVEL_WEIGHTS.get((level or "").strip().lower(), DEFAULT_LEVEL_WEIGHT)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[int]:
+    """Merge ranked id lists by summed 1 / (k + rank); ids ranked well by several lists come first"""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking):
+            fused[int(item)] = fused.get(int(item), 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused, key=lambda item: -fused[item])
+
+
+class SkillScores(NamedTuple):
+    """Pre-scores for a set of catalog rows, one array entry per row"""
+    score: np.ndarray              # overall 0-1 fit from skills and experience
+    required_coverage: np.ndarray  # level-weighted share of required skills the candidate has
+    required_met: np.ndarray       # required skills the candidate has at any level
+    required_total: np.ndarray
+    preferred_coverage: np.ndarray
+    experience_gap: np.ndarray     # years below the posting's minimum, 0 when met or unknown
+
+
+class SkillIndex:
+    """
+    Interned skill vocabulary, per-posting skill arrays and an inverted index for one catalog snapshot.
+
+    Required and preferred skills follow the catalog's CSR columns: row i's skill
+    ids are `skills[offsets[i]:offsets[i + 1]]` with matching level weights, so a
+    candidate can be scored against many postings with a few array operations.
+    The inverted index maps each skill to the sorted rows that list it; posting
+    lists stay compact for large catalogs and are expanded to row bitmaps only
+    for the skills a query uses. Catalog updates derive a new index with
+    `apply` instead of rebuilding it.
+    """
+
+    def __init__(self, columns: JobColumns):
+        self.columns = columns
+        self.vocabulary: Dict[str, int] = {}
+        self.faiss_ids = columns.faiss_ids
+        # The catalog interns names as written; map each to its normalized vocabulary entry
+        name_skills = np.array([self.skill_id(name, add=True) for name in columns.skill_names], dtype=np.int32)
+        # Unset levels are coded -1, which picks the trailing default weight
+        level_weights = np.array([level_weight(level) for level in columns.levels] + [DEFAULT_LEVEL_WEIGHT], dtype=np.float32)
+        self.required = self._pack(columns.required, name_skills, level_weights)
+        self.preferred = self._pack(columns.preferred, name_skills, level_weights)
+        self.min_experience = columns.min_experience
+        self.postings = self._invert(self.required, self.preferred)
+        self.required_postings = self._invert(self.required)
+
+    def __len__(self) -> int:
+        return len(self.faiss_ids)
+
+    def apply(self, columns: JobColumns, added: JobColumns, rows: np.ndarray) -> "SkillIndex":
+        """
+        Index for `columns`, whose row i is row `rows[i]` of this index's rows followed by `added`'s.
+
+        Only the added postings are interned and packed, and only the posting
+        lists of skills they list, or that the replaced and removed rows listed,
+        are rebuilt; other lists are shared with this index unless removals
+        renumbered the rows.
+        """
+        index = copy.copy(self)
+        index.columns = columns
+        index.faiss_ids = columns.faiss_ids
+        index.min_experience = columns.min_experience
+        index.vocabulary = dict(self.vocabulary)
+        name_skills = np.array([index.skill_id(name, add=True) for name in added.skill_names], dtype=np.int32)
+        level_weights = np.array([level_weight(level) for level in added.levels] + [DEFAULT_LEVEL_WEIGHT], dtype=np.float32)
+        required = self._pack(added.required, name_skills, level_weights)
+        preferred = self._pack(added.preferred, name_skills, level_weights)
+        index.required = self._take_packed(self._concat_packed(self.required, required), rows)
+        index.preferred = self._take_packed(self._concat_packed(self.preferred, preferred), rows)
+
+        # New row of every old and added row, -1 for rows that were replaced or removed
+        new_rows = np.full(len(self) + len(added), -1, dtype=np.int64)
+        new_rows[np.asarray(rows, dtype=np.int64)] = np.arange(len(rows))
+        index.postings = self._update_postings(self.postings, new_rows, (self.required, self.preferred), (required, preferred))
+        index.required_postings = self._update_postings(self.required_postings, new_rows, (self.required,), (required,))
+        return index
+
+    def _update_postings(self, postings: Dict[int, np.ndarray], new_rows: np.ndarray,
+                         packed_lists, added_lists) -> Dict[int, np.ndarray]:
+        """Posting lists renumbered by `new_rows`, with the added rows' skills merged in"""
+        count = len(self)
+        added = self._invert(*added_lists)
+        kept = np.flatnonzero(new_rows[:count] >= 0)
+        if np.array_equal(new_rows[kept], kept):
+            # Surviving rows keep their numbers, so only skills of dropped or added rows change
+            dropped = np.flatnonzero(new_rows[:count] < 0)
+            touched = set(added)
+            for offsets, ids, _ in packed_lists:
+                touched.update(np.unique(ids[_csr_positions(offsets, dropped)[1]]).tolist())
+            updated = dict(postings)
+        else:
+            touched, updated = set(postings) | set(added), {}
+        empty = np.empty(0, dtype=np.int64)
+        for skill in touched:
+            rows = new_rows[np.concatenate([postings.get(skill, empty), count + added.get(skill, empty)])]
+            rows = np.unique(rows[rows >= 0]).astype(np.int32)
+            if len(rows):
+                updated[skill] = rows
+            else:
+                updated.pop(skill, None)
+        return updated
+
+    def skill_id(self, name: str, add: bool = False) -> Optional[int]:
+        name = normalize_skill(name)
+        if add and name not in self.vocabulary:
+            self.vocabulary[name] = len(self.vocabulary)
+        return self.vocabulary.get(name)
+
+    @staticmethod
+    def _pack(skills: SkillColumns, name_skills: np.ndarray, level_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(offsets, skill ids, level weights) for the catalog's CSR skill columns"""
+        return (np.asarray(skills.offsets), name_skills[skills.names], level_weights[skills.levels])
+
+    @staticmethod
+    def _concat_packed(first, second) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Packed skills of first's rows followed by second's"""
+        offsets = np.concatenate([first[0], second[0][1:] + first[0][-1]]).astype(np.int64)
+        return (offsets, np.concatenate([first[1], second[1]]), np.concatenate([first[2], second[2]]))
+
+    @staticmethod
+    def _take_packed(packed, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        offsets, positions = _csr_positions(packed[0], np.asarray(rows, dtype=np.int64))
+        return (offsets, packed[1][positions], packed[2][positions])
+
+    @staticmethod
+    def _invert(*packed_lists) -> Dict[int, np.ndarray]:
+        """Skill id -> sorted unique rows listing it, built with one sort instead of per-row appends"""
+        count = max(len(packed_lists[0][0]) - 1, 1)
+        skills = np.concatenate([ids for _, ids, _ in packed_lists]).astype(np.int64)
+        rows = np.concatenate([np.repeat(np.arange(len(offsets) - 1), np.diff(offsets)) for offsets, _, _ in packed_lists])
+        pairs = np.unique(skills * count + rows)
+        skills, rows = pairs // count, (pairs % count).astype(np.int32)
+        boundaries = np.flatnonzero(np.diff(skills)) + 1
+        return {int(group_skills[0]): group_rows
+                for group_skills, group_rows in zip(np.split(skills, boundaries), np.split(rows, boundaries))
+                if len(group_rows)}
+
+    def bitmap(self, names: Iterable[str]) -> np.ndarray:
+        """Rows listing every given skill as required or preferred; unknown skills match no posting"""
+        mask = np.ones(len(self), dtype=bool)
+        for name in names:
+            skill_id = self.skill_id(name)
+            if skill_id not in self.postings:
+                return np.zeros(len(self), dtype=bool)
+            skill_mask = np.zeros(len(self), dtype=bool)
+            skill_mask[self.postings[skill_id]] = True
+            mask &= skill_mask
+        return mask
+
+    def faiss_ids_with_all(self, names: Iterable[str]) -> np.ndarray:
+        return self.faiss_ids[self.bitmap(names)]
+
+    def skill_candidates(self, profile: CandidateProfile, limit: int, mask: np.ndarray = None) -> np.ndarray:
+        """
+        FAISS ids of the postings that best fit the candidate's skills, best first.
+
+        Postings are counted by required skills the candidate lists, using only
+        the posting lists of those skills; the best counts are then ranked by the
+        full level- and experience-aware pre-score.
+        """
+        counts = np.zeros(len(self), dtype=np.int32)
+        for skill_id in {self.skill_id(skill.name) for skill in profile.skills} - {None}:
+            rows = self.required_postings.get(skill_id)
+            if rows is not None:
+                counts[rows] += 1
+        if mask is not None:
+            counts[~mask] = 0
+        rows = np.flatnonzero(counts)
+        if len(rows) > 4 * limit:
+            rows = rows[np.argpartition(-counts[rows], 4 * limit)[:4 * limit]]
+        if not len(rows):
+            return np.empty(0, dtype=np.int64)
+        scores = self.score(profile, rows).score
+        order = np.lexsort((-counts[rows], -scores))[:limit]
+        return self.faiss_ids[rows[order]]
+
+    def candidate_vector(self, profile: CandidateProfile) -> np.ndarray:
+        """Candidate level weight per vocabulary skill, 0 for skills the candidate doesn't list"""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for skill in profile.skills:
+            skill_id = self.skill_id(skill.name)
+            if skill_id is not None:
+                vector[skill_id] = max(vector[skill_id], level_weight(skill.level))
+        return vector
+
+    @staticmethod
+    def _coverage(packed, rows: np.ndarray, candidate: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-row (level-weighted coverage, skills met, skill count) without a Python loop over rows"""
+        offsets, ids, weights = packed
+        starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+        # Flat positions of every row's skills, row after row
+        owners = np.repeat(np.arange(len(rows)), counts)
+        positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + starts[owners]
+        have = candidate[ids[positions]]
+        credit = np.minimum(1.0, have / weights[positions])
+        covered = np.bincount(owners, weights=credit, minlength=len(rows))
+        met = np.bincount(owners, weights=have > 0, minlength=len(rows)).astype(np.int32)
+        # Postings without skills of this kind don't hold a candidate back
+        coverage = np.where(counts > 0, covered / np.maximum(counts, 1), 1.0)
+        return coverage, met, counts
+
+    @staticmethod
+    def _combine(required, met, total, preferred, preferred_total, minimum, years) -> SkillScores:
+        """Blend coverages with the experience gap; arrays broadcast, and unknown years (NaN) never count as a gap"""
+        # fmax ignores NaN, so a missing minimum or unknown years leaves no gap
+        gap = np.fmax(minimum - years, 0.0)
+        experience = np.clip(1.0 - gap / np.maximum(np.nan_to_num(minimum), 1.0), 0.0, 1.0)
+        skills = np.where(preferred_total > 0, REQUIRED_WEIGHT * required + (1 - REQUIRED_WEIGHT) * preferred, required)
+        shape = np.broadcast(skills, experience).shape
+        # Per-row values stay broadcast views rather than copies when scoring many candidates
+        return SkillScores(
+            score=(skills * experience).astype(np.float32, copy=False),
+            required_coverage=np.broadcast_to(required, shape).astype(np.float32, copy=False),
+            required_met=np.broadcast_to(met, shape).astype(np.int32, copy=False),
+            required_total=np.broadcast_to(total, shape).astype(np.int32, copy=False),
+            preferred_coverage=np.broadcast_to(preferred, shape).astype(np.float32, copy=False),
+            experience_gap=np.broadcast_to(gap, shape).astype(np.float32, copy=False)
+        )
+
+    def score(self, profile: CandidateProfile, rows: Sequence[int]) -> SkillScores:
+        """Skill-overlap and experience pre-scores of a candidate against catalog rows"""
+        rows = np.asarray(rows, dtype=np.int64)
+        candidate = self.candidate_vector(profile)
+        required, met, total = self._coverage(self.required, rows, candidate)
+        preferred, _, preferred_total = self._coverage(self.preferred, rows, candidate)
+        years = np.nan if profile.experience_years is None else profile.experience_years
+        return self._combine(required, met, total, preferred, preferred_total, self.min_experience[rows], years)
+
+    @staticmethod
+    def _coverage_matrix(packed, rows: np.ndarray, candidates: np.ndarray,
+                         count_met: bool = True) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+        """
+        `_coverage` for many candidates at once: (candidates × rows) coverage and
+        skills met, and the per-row skill count. Credit min(1, have / weight) only
+        depends on the posting's level weight, and catalogs use a handful of levels,
+        so each level is one matrix product against that level's skill incidence.
+        """
+        offsets, ids, weights = packed
+        starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+        owners = np.repeat(np.arange(len(rows)), counts)
+        positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + starts[owners]
+        skills, levels = ids[positions], weights[positions]
+        covered = np.zeros((len(candidates), len(rows)), dtype=np.float32)
+        # Only skills some posting in the block lists take part in the products
+        used, columns = np.unique(skills, return_inverse=True)
+        have = candidates[:, used]
+        for weight in np.unique(levels):
+            incidence = np.zeros((len(used), len(rows)), dtype=np.float32)
+            selected = levels == weight
+            np.add.at(incidence, (columns[selected], owners[selected]), 1.0)
+            covered += np.minimum(1.0, have / weight) @ incidence
+        met = None
+        if count_met:
+            incidence = np.zeros((len(used), len(rows)), dtype=np.float32)
+            np.add.at(incidence, (columns, owners), 1.0)
+            met = ((have > 0).astype(np.float32) @ incidence).astype(np.int32)
+        covered /= np.maximum(counts, 1).astype(np.float32)
+        # Postings without skills of this kind don't hold a candidate back
+        covered[:, counts == 0] = 1.0
+        return covered, met, counts
+
+    def score_matrix(self, profiles: Sequence[CandidateProfile], rows: Sequence[int]) -> SkillScores:
+        """`score` for every candidate against every row, as (candidates × rows) arrays"""
+        rows = np.asarray(rows, dtype=np.int64)
+        candidates = np.stack([self.candidate_vector(profile) for profile in profiles]) if profiles else \
+            np.zeros((0, len(self.vocabulary)), dtype=np.float32)
+        required, met, total = self._coverage_matrix(self.required, rows, candidates)
+        preferred, _, preferred_total = self._coverage_matrix(self.preferred, rows, candidates, count_met=False)
+        years = np.array([np.nan if profile.experience_years is None else profile.experience_years
+                          for profile in profiles], dtype=np.float32)[:, None]
+        return self._combine(required, met, total, preferred, preferred_total, self.min_experience[rows][None, :], years)
+
+    def score_jobs(self, profile: CandidateProfile, faiss_ids: Sequence[int]) -> SkillScores:
+        return self.score(profile, self.columns.rows_of(faiss_ids))
@@ -0,0 +1,227 @@
+from typing import Callable, List, Optional, Sequence, Tuple
+import hashlib
+import json
+import os
+import re
+import shutil
+from contextlib import contextmanager
+import numpy as np
+import faiss
+from .columns import JobColumns
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None
+
+# A sha256 hex digest plus newline
+KEY_LINE_WIDTH = 65
+
+
+def embedding_key(text: str, model_name: str) -> str:
+    """Content address of an embedding: hash of the embedding model name and the text"""
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_model_name(embeddings) -> str:
+    """Identify an embeddings client by model name and output dimensions"""
+    name = getattr(embeddings, "model", None) or type(embeddings).__name__
+    dimensions = getattr(embeddings, "dimensions", None)
+    return f"{name}-{dimensions}" if dimensions else name
+
+
+def file_fingerprint(path: str) -> str:
+    """sha256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_fingerprint(keys: Sequence[str], *parts: str) -> str:
+    """Fingerprint of an index built from the given embedding keys, in order"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    for key in keys:
+        digest.update(key.encode("ascii"))
+    return digest.hexdigest()
+
+
+class EmbeddingStore:
+    """
+    Content-addressed on-disk embedding cache with serialized FAISS indexes.
+
+    Vectors live in an append-only float32 file per embedding model, which is
+    memory-mapped on load so worker processes share the page cache. Rows are
+    addressed by `embedding_key`, so unchanged texts are never re-embedded.
+    FAISS indexes are written next to the vectors under their fingerprint, and
+    job catalogs as memory-mappable columns with their embedding keys under the
+    catalog file's content hash.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        self.model_name = model_name
+        self.directory = os.path.join(directory, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.keys_path = os.path.join(self.directory, "keys.txt")
+        self.meta_path = os.path.join(self.directory, "meta.json")
+        self.index_dir = os.path.join(self.directory, "indexes")
+        self.catalog_dir = os.path.join(self.directory, "catalogs")
+        os.makedirs(self.index_dir, exist_ok=True)
+        os.makedirs(self.catalog_dir, exist_ok=True)
+
+        self.dimension: Optional[int] = None
+        self.rows = {}
+        self._vectors = np.empty((0, 0), dtype=np.float32)
+        self._load()
+
+    @contextmanager
+    def _lock(self):
+        """Serialize writers across processes sharing the store directory"""
+        with open(os.path.join(self.directory, ".lock"), "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load(self):
+        """Map the vectors written so far, reading only the keys appended since the last load"""
+        if not all(os.path.exists(path) for path in (self.meta_path, self.keys_path, self.vectors_path)):
+            return
+        if self.dimension is None:
+            with open(self.meta_path) as f:
+                self.dimension = json.load(f)["dimension"]
+
+        # Keys are written after their vectors, so only rows with a key are complete
+        row_count = min(os.path.getsize(self.keys_path) // KEY_LINE_WIDTH,
+                        os.path.getsize(self.vectors_path) // (4 * self.dimension))
+        if row_count <= len(self.rows):
+            return
+        with open(self.keys_path, "rb") as f:
+            f.seek(len(self.rows) * KEY_LINE_WIDTH)
+            keys = f.read((row_count - len(self.rows)) * KEY_LINE_WIDTH).decode("ascii").split()
+        self.rows.update((key, row) for row, key in enumerate(keys, start=len(self.rows)))
+        self._map()
+
+    def _map(self):
+        self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r",
+                                  shape=(len(self.rows), self.dimension))
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.rows
+
+    def get(self, keys: Sequence[str]) -> np.ndarray:
+        """Return the stored vectors for keys that are all present"""
+        return np.asarray(self._vectors[[self.rows[key] for key in keys]], dtype=np.float32)
+
+    def put(self, keys: Sequence[str], vectors: np.ndarray):
+        """Append vectors for new keys and remap the store"""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        with self._lock():
+            # Another worker may have appended since we loaded
+            self._load()
+            if self.dimension is None:
+                self.dimension = int(vectors.shape[1])
+                with open(self.meta_path, "w") as f:
+                    json.dump({"model": self.model_name, "dimension": self.dimension}, f)
+            elif vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match store dimension {self.dimension}"
+                )
+
+            new = {key: vector for key, vector in zip(keys, vectors) if key not in self.rows}
+            if new:
+                with open(self.vectors_path, "r+b" if os.path.exists(self.vectors_path) else "wb") as f:
+                    # Drop any partial rows left behind by an interrupted writer
+                    f.truncate(len(self.rows) * 4 * self.dimension)
+                    f.seek(0, os.SEEK_END)
+                    f.write(np.stack(list(new.values())).tobytes())
+                # Keys are fixed width, so the key list can be trimmed to the loaded rows and appended
+                with open(self.keys_path, "r+" if os.path.exists(self.keys_path) else "w") as f:
+                    f.truncate(len(self.rows) * KEY_LINE_WIDTH)
+                    f.seek(0, os.SEEK_END)
+                    f.write("".join(f"{key}\n" for key in new))
+                self.rows.update((key, row) for row, key in enumerate(new, start=len(self.rows)))
+                self._map()
+
+    def embed_documents(self, texts: Sequence[str], embed_fn: Callable[[List[str]], List[List[float]]]) -> np.ndarray:
+        """Embed texts, calling embed_fn only for texts not already in the store"""
+        keys = [embedding_key(text, self.model_name) for text in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.rows and key not in missing:
+                missing[key] = text
+
+        if missing:
+            vectors = np.array(embed_fn(list(missing.values())), dtype=np.float32)
+            self.put(list(missing), vectors)
+        return self.get(keys)
+
+    def index_path(self, fingerprint: str) -> str:
+        return os.path.join(self.index_dir, f"{fingerprint}.faiss")
+
+    def load_index(self, fingerprint: str) -> Optional[faiss.Index]:
+        """Memory-map a previously saved index, or return None; IVF indexes are read into memory"""
+        path = self.index_path(fingerprint)
+        if not os.path.exists(path):
+            return None
+        try:
+            index = faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError:
+            # Index types without mmap support are read into memory instead
+            return faiss.read_index(path)
+        if faiss.try_extract_index_ivf(index) is not None:
+            # Mapped IVF lists are OnDiskInvertedLists, which clone_index can't copy for catalog updates
+            return faiss.read_index(path)
+        return index
+
+    def save_index(self, index: faiss.Index, fingerprint: str):
+        """Serialize an index atomically under its fingerprint"""
+        path = self.index_path(fingerprint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        faiss.write_index(index, tmp_path)
+        os.replace(tmp_path, path)
+
+    def remove_index(self, fingerprint: str):
+        """Delete one saved index; other catalogs and index configurations share the directory"""
+        try:
+            os.remove(self.index_path(fingerprint))
+        except FileNotFoundError:
+            pass
+
+    def catalog_path(self, fingerprint: str) -> str:
+        return os.path.join(self.catalog_dir, fingerprint)
+
+    def load_catalog(self, fingerprint: str) -> Optional[Tuple[JobColumns, np.ndarray]]:
+        """Memory-map previously saved catalog columns and their embedding keys, or return None"""
+        path = self.catalog_path(fingerprint)
+        columns = JobColumns.load(path)
+        if columns is None:
+            return None
+        return columns, np.load(os.path.join(path, "embedding_keys.npy"), mmap_mode="r")
+
+    def save_catalog(self, fingerprint: str, columns: JobColumns, keys: np.ndarray):
+        """Write catalog columns and embedding keys, publishing the directory in one rename"""
+        path = self.catalog_path(fingerprint)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        columns.save(tmp_path)
+        np.save(os.path.join(tmp_path, "embedding_keys.npy"), np.ascontiguousarray(keys))
+        try:
+            os.rename(tmp_path, path)
+        except OSError:
+            # Another worker published the same catalog first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def remove_catalog(self, fingerprint: str):
+        """Delete one saved catalog; other catalog files share the directory"""
+        shutil.rmtree(self.catalog_path(fingerprint), ignore_errors=True)
@@ -1,3 +1,4 @@
+import json
 import streamlit as st
 import requests
 from io import BytesIO
@@ -19,52 +20,88 @@ st.write("Upload a resume to find matching job opportunities")
 # File upload
 uploaded_file = st.file_uploader("Choose a resume PDF", type="pdf")
 
+STAGE_LABELS = {
+    "ingest": "Resume read",
+    "extract": "Profile extracted",
+    "classify": "Skills classified",
+    "match": "All matches scored"
+}
+
+STATUS_COLORS = {
+    "auto_matched": "🟢",
+    "recruiter_review": "🟡",
+    "rejected": "🔴"
+}
+
+
+def render_match(match):
+    with st.expander(f"📋 {match['matched_job']['title']} (Score: {match['confidence_score']:.2f})"):
+        # Job details
+        st.write("### Job Details")
+        st.write(f"**Description:** {match['matched_job']['description']}")
+        st.write("**Required Skills:**")
+        for skill in match['matched_job']['required_skills']:
+            st.write(f"- {skill['name']} ({skill.get('level')})")
+        
+        if match['matched_job'].get('preferred_skills'):
+            st.write("**Preferred Skills:**")
+            for skill in match['matched_job']['preferred_skills']:
+                st.write(f"- {skill['name']} ({skill.get('level')})")
+        
+        # Match analysis
+        st.write("### Match Analysis")
+        st.write(match['reasoning'])
+        
+        # Status
+        st.write(f"**Status:** {STATUS_COLORS.get(match['status'], '⚪')} {match['status']}")
+
+
+def render_matches(placeholder, matches):
+    """Redraw the results in ranking order; jobs still being scored leave gaps that fill in as they arrive"""
+    with placeholder.container():
+        st.subheader("🎉 Matching Results")
+        for position in sorted(matches):
+            render_match(matches[position])
+
+
 if uploaded_file:
-    # Show spinner during processing
-    with st.spinner("Analyzing resume..."):
-        try:
-            # Prepare file for upload
-            files = {"resume": ("resume.pdf", uploaded_file, "application/pdf")}
-            
-            # Call API
-            response = requests.post(
-                "http://localhost:8000/api/v1/match/resume",
-                files=files
-            )
+    # Stream progress and results from the API as each stage and scoring call finishes
+    status = st.status("Analyzing resume...", expanded=True)
+    results = st.empty()
+    matches = {}
+    try:
+        # Prepare file for upload
+        files = {"resume": ("resume.pdf", uploaded_file, "application/pdf")}
+        
+        # Call the streaming API; events arrive as NDJSON lines
+        with requests.post(
+            "http://localhost:8000/api/v1/match/resume/stream",
+            files=files,
+            stream=True
+        ) as response:
             response.raise_for_status()
-            matches = response.json()
-            
-            # Display results
-            st.subheader("🎉 Matching Results")
-            
-            for match in matches:
-                with st.expander(f"📋 {match['matched_job']['title']} (Score: {match['confidence_score']:.2f})"):
-                    # Job details
-                    st.write("### Job Details")
-                    st.write(f"**Description:** {match['matched_job']['description']}")
-                    st.write("**Required Skills:**")
-                    for skill in match['matched_job']['required_skills']:
-                        st.write(f"- {skill['name']} ({skill['level']})")
-                    
-                    if match['matched_job'].get('preferred_skills'):
-                        st.write("**Preferred Skills:**")
-                        for skill in match['matched_job']['preferred_skills']:
-                            st.write(f"- {skill['name']} ({skill['level']})")
-                    
-                    # Match analysis
-                    st.write("### Match Analysis")
-                    st.write(match['reasoning'])
-                    
-                    # Status
-                    status_color = {
-                        "auto_matched": "🟢",
-                        "recruiter_review": "🟡",
-                        "rejected": "🔴"
-                    }
-                    st.write(f"**Status:** {status_color.get(match['status'], '⚪')} {match['status']}")
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                if event["event"] == "stage":
+                    status.write(f"✅ {STAGE_LABELS.get(event['stage'], event['stage'])} ({event['seconds']:.1f}s)")
+                    if event["stage"] == "classify":
+                        status.update(label="Scoring job matches...")
+                elif event["event"] == "match":
+                    matches[event["position"]] = event["match"]
+                    render_matches(results, matches)
+                elif event["event"] == "complete":
+                    # Final ranking after QA review
+                    render_matches(results, dict(enumerate(event["job_matches"])))
+                    status.update(label=f"Done in {event['seconds']:.1f}s", state="complete", expanded=False)
+                elif event["event"] == "error":
+                    status.update(label="Matching failed", state="error")
+                    st.error(f"Error: {event['error']}")
                     
-        except requests.exceptions.RequestException as e:
-            st.error(f"Error: {str(e)}")
+    except requests.exceptions.RequestException as e:
+        status.update(label="Matching failed", state="error")
+        st.error(f"Error: {str(e)}")
             
 # Add sidebar with info
 with st.sidebar:
@@ -0,0 +1,136 @@
+import json
+import shutil
+import pytest
+from langchain_core.messages import AIMessage
+import config
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from models import CandidateProfile, GraphState, JobPosting, Skill
+
+
+@pytest.fixture(autouse=True)
+def isolated_embedding_cache(tmp_path, monkeypatch):
+    """Keep test runs from reading or writing the shared embedding cache"""
+    monkeypatch.setattr(config, "EMBEDDING_CACHE_DIR", str(tmp_path / "index_cache"))
+    monkeypatch.setattr(config, "CANDIDATE_STORE_PATH", "")
+    monkeypatch.setattr(config, "SIMILARITY_LOG_PATH", "")
+    monkeypatch.setattr(config, "SIMILARITY_CALIBRATION_PATH", str(tmp_path / "similarity_calibration.json"))
+
+
+@pytest.fixture(autouse=True)
+def no_shared_result_cache(monkeypatch):
+    """Agents only cache stage results in tests that pass a cache explicitly"""
+    from pipeline.cache import reset_result_cache
+    monkeypatch.setattr(config, "RESULT_CACHE_BACKEND", "")
+    reset_result_cache()
+    yield
+    reset_result_cache()
+
+
+@pytest.fixture(autouse=True)
+def no_shared_llm_cache(monkeypatch):
+    """Agents built without a model get a fresh, unmemoized shared client"""
+    from llm.client import reset_chat_model
+    monkeypatch.setattr(config, "LLM_CACHE_BACKEND", "")
+    reset_chat_model()
+    yield
+    reset_chat_model()
+
+
+class RecordingEmbeddings(FakeEmbeddings):
+    """benchmarks.fakes.FakeEmbeddings that records every document batch, and can fail or refuse single queries"""
+
+    def __init__(self, fail=False, queries=True, **kwargs):
+        super().__init__(**kwargs)
+        self.fail = fail
+        self.queries = queries
+        # One list of texts per embed_documents call, and every text embedded
+        self.batches = []
+        self.embedded = []
+
+    def _record(self, texts):
+        self.batches.append(list(texts))
+        self.embedded.extend(texts)
+        if self.fail:
+            raise RuntimeError("embeddings unavailable")
+
+    def embed_documents(self, texts):
+        self._record(texts)
+        return super().embed_documents(texts)
+
+    async def aembed_documents(self, texts):
+        self._record(texts)
+        return await super().aembed_documents(texts)
+
+    def embed_query(self, text):
+        if not self.queries:
+            raise AssertionError("texts should be embedded in batches, not one by one")
+        return self._vector(text).tolist()
+
+
+class FixedScoreChatModel(FakeChatModel):
+    """
+    benchmarks.fakes.FakeChatModel that gives every match analysis the same
+    score, tracks concurrent calls and fails for prompts naming a job in `fail_for`
+    """
+
+    def __init__(self, delay=0.1, fail_for=(), score=0.95):
+        super().__init__(latency=delay)
+        self.fail_for = fail_for
+        self.fixed_score = score
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, messages, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().ainvoke(messages, **kwargs)
+        finally:
+            self.in_flight -= 1
+
+    def _respond(self, prompt):
+        if any(title in prompt for title in self.fail_for):
+            self.calls += 1
+            raise RuntimeError("LLM unavailable")
+        if "Analyze the match between this candidate and job." in prompt:
+            self.calls += 1
+            return AIMessage(content=json.dumps({"confidence_score": self.fixed_score, "reasoning": "Strong match"}))
+        return super()._respond(prompt)
+
+
+def new_job(job_id="platform-eng-01", description="Build our internal developer platform."):
+    return JobPosting(
+        id=job_id,
+        title="Platform Engineer",
+        description=description,
+        required_skills=[Skill(name="Kubernetes", level="expert")],
+        min_experience_years=4
+    )
+
+
+@pytest.fixture
+def candidate_state():
+    return GraphState(
+        candidate_profile=CandidateProfile(
+            name="Test Engineer",
+            title="ML Engineer",
+            skills=[Skill(name="Python", level="expert"), Skill(name="PyTorch", level="expert")],
+            experience_years=6
+        )
+    )
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    path = tmp_path / "job_catalog.json"
+    shutil.copy("data/job_catalog.json", path)
+    return str(path)
+
+
+@pytest.fixture
+def agent(catalog_path):
+    """Match agent over a writable copy of the sample catalog"""
+    from agents.match import MatchAgent
+    agent = MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=catalog_path)
+    agent.load()
+    return agent
@@ -0,0 +1,62 @@
+import pytest
+from agents.extract import ExtractAgent
+from agents.ingest import IngestAgent
+from agents.match import MatchAgent, candidate_text
+from benchmarks.fakes import FakeChatModel
+from benchmarks.synthetic import make_resumes
+from graph import BatchMatcher
+from models import CandidateProfile
+from pipeline.pdf import clean_text
+from conftest import FixedScoreChatModel, RecordingEmbeddings
+
+
+@pytest.fixture
+def batch_matcher(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    model = FixedScoreChatModel(delay=0.01)
+    embeddings = RecordingEmbeddings(queries=False)
+    match_agent = MatchAgent(model=model, embeddings=embeddings)
+    match_agent.load()
+    embeddings.batches.clear()
+    return BatchMatcher(
+        match_agent=match_agent,
+        ingest_agent=IngestAgent(model=model),
+        extract_agent=ExtractAgent(model=model),
+        chunk_size=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_embeds_each_chunk_once(batch_matcher):
+    model = FakeChatModel()
+    batch_matcher.ingest_agent = IngestAgent(model=model)
+    batch_matcher.extract_agent = ExtractAgent(model=model)
+    resumes = make_resumes(5)
+    agent = batch_matcher.match_agent
+
+    results = [result async for result in batch_matcher.match_resumes(resumes, top_k=3)]
+
+    assert sorted(result.index for result in results) == list(range(5))
+    assert all(len(result.job_matches) == 3 and result.error is None for result in results)
+    # Five resumes in chunks of two: one embed_documents call per chunk, with each resume's
+    # profile text and resume sections, identical texts embedded once
+    expected = []
+    for start in range(0, 5, 2):
+        texts = []
+        for _, content in resumes[start:start + 2]:
+            text = clean_text(content.decode("utf-8"))
+            profile = CandidateProfile(**FakeChatModel.extract_profile(text))
+            texts += [candidate_text(profile)] + [chunk.text for chunk in agent.resume_chunks(text)]
+        expected.append(list(dict.fromkeys(texts)))
+    assert agent.embeddings.batches == expected
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_per_resume_errors(batch_matcher):
+    with open("data/resume_sample.txt") as f:
+        resume = f.read()
+
+    results = {result.index: result async for result in batch_matcher.match_resumes([("ok.txt", resume), ("empty.txt", "")])}
+
+    assert results[0].job_matches and results[0].filename == "ok.txt"
+    assert results[1].job_matches is None and results[1].error == "No resume data provided"
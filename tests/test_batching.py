@@ -0,0 +1,38 @@
+import asyncio
+import pytest
+from llm import EmbeddingBatcher
+from conftest import RecordingEmbeddings
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_call():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=64, max_wait_ms=20)
+
+    texts = [f"candidate {i}" for i in range(10)]
+    vectors = await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    assert embeddings.batches == [texts]
+    assert vectors == [embeddings.embed_query(text) for text in texts]
+    assert batcher.stats()["mean_batch_size"] == 10
+
+
+@pytest.mark.asyncio
+async def test_batches_are_capped_at_max_size():
+    embeddings = RecordingEmbeddings()
+    batcher = EmbeddingBatcher(embeddings, max_batch_size=4, max_wait_ms=20)
+
+    await batcher.embed_many([f"candidate {i}" for i in range(10)])
+
+    assert [len(call) for call in embeddings.batches] == [4, 4, 2]
+    assert batcher.stats()["largest_batch"] == 4
+
+
+@pytest.mark.asyncio
+async def test_failure_reaches_every_caller_in_the_batch():
+    batcher = EmbeddingBatcher(RecordingEmbeddings(fail=True), max_wait_ms=20)
+
+    results = await asyncio.gather(batcher.embed("a"), batcher.embed("b"), return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.stats()["errors"] == 1
@@ -0,0 +1,53 @@
+import numpy as np
+import pyarrow.parquet as pq
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from benchmarks.synthetic import make_jobs, make_resume
+from agents.match import MatchAgent, candidate_text
+from models import CandidateProfile
+from retrieval import BulkMatcher, JobColumns, SkillIndex, candidate_id, write_job_catalog
+from retrieval.bulk import normalize_rows
+
+
+def test_score_matrix_matches_per_candidate_scores():
+    index = SkillIndex(JobColumns.from_jobs(make_jobs(200, seed=1)))
+    profiles = [CandidateProfile(**FakeChatModel.extract_profile(make_resume(i))) for i in range(12)]
+    profiles[3].experience_years = None
+    rows = np.arange(200)
+
+    matrix = index.score_matrix(profiles, rows)
+    for i, profile in enumerate(profiles):
+        scores = index.score(profile, rows)
+        for field in scores._fields:
+            np.testing.assert_allclose(getattr(matrix, field)[i], getattr(scores, field), atol=1e-5)
+
+
+def test_bulk_matcher_keeps_exact_top_k_per_candidate_and_job(tmp_path):
+    catalog = tmp_path / "catalog.jsonl"
+    write_job_catalog(make_jobs(300, seed=2), str(catalog))
+    embeddings = FakeEmbeddings(dimensions=64)
+    agent = MatchAgent(model=object(), embeddings=embeddings, catalog_path=str(catalog))
+    snapshot = agent.load()
+    profiles = [CandidateProfile(**FakeChatModel.extract_profile(make_resume(i, seed=3))) for i in range(40)]
+    vectors = np.array(embeddings.embed_documents([candidate_text(profile) for profile in profiles]), dtype=np.float32)
+    batches = ([[candidate_id(p) for p in profiles[i:i + 16]], profiles[i:i + 16], vectors[i:i + 16]]
+               for i in range(0, len(profiles), 16))
+
+    # Blocks smaller than both sides, so merging across blocks is exercised
+    summary = BulkMatcher(snapshot, agent.job_vectors, top_k=5, job_block=64, workers=2).run(batches, str(tmp_path / "out"))
+
+    assert summary["pairs_scored"] == 40 * 300
+    similarity = normalize_rows(vectors) @ normalize_rows(agent.job_vectors(np.arange(300))).T
+    expected = 0.5 * similarity + 0.5 * snapshot.skills.score_matrix(profiles, np.arange(300)).score
+    job_ids = [snapshot.jobs.text(row, "id") for row in range(300)]
+
+    by_candidate = pq.read_table(summary["candidate_top_jobs"]).to_pylist()
+    assert len(by_candidate) == 40 * 5
+    first = [row for row in by_candidate if row["candidate_id"] == candidate_id(profiles[0])]
+    assert [row["rank"] for row in first] == [1, 2, 3, 4, 5]
+    np.testing.assert_allclose([row["score"] for row in first], np.sort(expected[0])[::-1][:5], atol=1e-5)
+    assert first[0]["job_id"] == job_ids[int(np.argmax(expected[0]))]
+
+    by_job = pq.read_table(summary["job_top_candidates"]).to_pylist()
+    assert len(by_job) == 300 * 5
+    top = [row for row in by_job if row["job_id"] == job_ids[7]]
+    np.testing.assert_allclose([row["score"] for row in top], np.sort(expected[:, 7])[::-1][:5], atol=1e-5)
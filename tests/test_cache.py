@@ -0,0 +1,127 @@
+import json
+import time
+import pytest
+from langchain_core.messages import AIMessage
+from agents.extract import ExtractAgent
+from agents.ingest import IngestAgent
+from agents.match import MatchAgent
+from models import GraphState, JobPosting, Skill
+from pipeline import MemoryLRUCache, ResultCache, SQLiteCache
+from conftest import FixedScoreChatModel, RecordingEmbeddings
+
+RESUME = "John Smith\nBackend engineer with 7 years of Python, PostgreSQL and AWS.\nExperience: Acme Corp 2017-2024"
+
+
+class ResumeChatModel(FixedScoreChatModel):
+    """Answers validation, extraction and scoring prompts"""
+    def __init__(self):
+        super().__init__(delay=0)
+
+    async def ainvoke(self, messages):
+        content = messages[0].content
+        if "valid resume" in content:
+            self.calls += 1
+            return AIMessage(content="VALID")
+        if "Extract structured information" in content:
+            self.calls += 1
+            return AIMessage(content=json.dumps({
+                "name": "John Smith", "title": "Backend Engineer", "experience_years": 7,
+                "skills": [{"name": "Python"}, {"name": "PostgreSQL"}], "education": []
+            }))
+        return await super().ainvoke(messages)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryLRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("a") == "1"
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryLRUCache(ttl=0.05)
+    cache.set("a", "1")
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_and_evicts(tmp_path):
+    path = str(tmp_path / "results.sqlite3")
+    cache = SQLiteCache(path, max_entries=2, touch_interval=0)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    reopened = SQLiteCache(path, max_entries=2)
+    assert reopened.get("a") == "1"
+    assert reopened.get("b") is None
+    assert reopened.get("c") == "3"
+
+
+def test_sqlite_cache_checks_its_size_every_few_writes(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "results.sqlite3"), max_entries=4, evict_every=3)
+    for key in "abcde":
+        cache.set(key, key)
+    # Five entries until the sixth write runs eviction
+    assert len(cache) == 5
+    cache.set("f", "f")
+    assert len(cache) == 4
+    assert cache.get("a") is None and cache.get("f") == "f"
+
+
+@pytest.mark.asyncio
+async def test_reupload_skips_extraction_and_llm_calls(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    model = ResumeChatModel()
+    cache = ResultCache(MemoryLRUCache())
+    ingest = IngestAgent(model=model, cache=cache)
+    extract = ExtractAgent(model=model, cache=cache)
+
+    first = await extract(await ingest(GraphState(resume_text=RESUME.encode())))
+    calls = model.calls
+    second = await extract(await ingest(GraphState(resume_text=RESUME.encode())))
+
+    assert calls == 2
+    assert model.calls == calls
+    assert second.resume_hash == first.resume_hash
+    assert second.candidate_profile == first.candidate_profile
+    assert cache.hits["extraction"] == 1 and cache.hits["profile"] == 1
+
+
+@pytest.mark.asyncio
+async def test_catalog_change_only_invalidates_matches(candidate_state):
+    model = ResumeChatModel()
+    cache = ResultCache(MemoryLRUCache())
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), cache=cache)
+
+    first = await agent.get_matches(candidate_state, top_k=3)
+    second = await agent.get_matches(candidate_state, top_k=3)
+    assert model.calls == 3
+    assert second == first
+
+    agent.add_jobs([JobPosting(id="job-new", title="Data Engineer", description="Pipelines",
+                               required_skills=[Skill(name="Python")])])
+    await agent.get_matches(candidate_state, top_k=3)
+
+    assert model.calls == 6
+    assert cache.hits["matches"] == 1 and cache.misses["matches"] == 2
+    # The candidate embedding survives the catalog change
+    assert cache.hits["embedding"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_scoring_is_not_cached(candidate_state):
+    model = FixedScoreChatModel(delay=0, fail_for=("ML Engineer",))
+    cache = ResultCache(MemoryLRUCache())
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), cache=cache)
+
+    await agent.get_matches(candidate_state, top_k=5)
+    assert cache.misses["matches"] == 1
+    await agent.get_matches(candidate_state, top_k=5)
+    assert cache.hits["matches"] == 0
@@ -0,0 +1,105 @@
+import json
+import numpy as np
+import pytest
+import config
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from agents.match import MatchAgent, candidate_text
+from models import CandidateProfile, GraphState, MatchStatus, Skill
+from retrieval import IndexConfig, ScoredPairLog, SimilarityCalibration, job_faiss_id, pooling_key, suggest_floor
+
+
+@pytest.fixture
+def candidate():
+    return CandidateProfile(name="c", title="ML Engineer", experience_years=6, skills=[
+        Skill(name="Python", level="expert"), Skill(name="PyTorch", level="expert")
+    ])
+
+
+def test_calibration_is_monotone_and_only_loads_for_its_model(tmp_path):
+    rng = np.random.default_rng(0)
+    similarities = rng.uniform(0, 1, 2000)
+    scores = np.clip(similarities + rng.normal(0, 0.2, 2000), 0, 1)
+
+    calibration = SimilarityCalibration.fit(similarities, scores, "model-a", "cosine", bins=20)
+
+    assert np.all(np.diff(calibration.scores) >= 0)
+    assert calibration.predict(0.1) < calibration.predict(0.5) < calibration.predict(0.9)
+    assert calibration.predict(-5) == calibration.scores[0]
+    path = str(tmp_path / "calibration.json")
+    calibration.save(path)
+    assert SimilarityCalibration.load(path, "model-a", "cosine").version == calibration.version
+    assert SimilarityCalibration.load(path, "model-b", "cosine") is None
+    assert SimilarityCalibration.load(path, "model-a", "l2") is None
+    # The floor keeps all but 1% of the pairs scored 0.6 or better
+    floor = suggest_floor(similarities, scores, 0.6, 0.01)
+    assert np.mean(similarities[scores >= 0.6] < floor) <= 0.01
+
+
+@pytest.mark.asyncio
+async def test_cosine_search_reports_similarities_and_logs_scored_pairs(candidate, tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    monkeypatch.setattr(config, "SIMILARITY_LOG_PATH", str(tmp_path / "similarity_log.jsonl"))
+    embeddings = FakeEmbeddings()
+    agent = MatchAgent(model=FakeChatModel(), embeddings=embeddings, index_config=IndexConfig(metric="cosine"))
+
+    matches = await agent.get_matches(GraphState(candidate_profile=candidate), top_k=3)
+
+    query = np.array(embeddings.embed_query(candidate_text(candidate)))
+    for match in matches:
+        job = np.array(agent.job_vectors(np.array([agent.snapshot.jobs.find(match.matched_job.id)]))[0])
+        expected = query @ job / (np.linalg.norm(query) * np.linalg.norm(job))
+        assert match.similarity == pytest.approx(expected, abs=1e-4)
+        assert match.calibrated_score is None
+    logged = list(ScoredPairLog(config.SIMILARITY_LOG_PATH).read(agent.embedding_model, "cosine"))
+    assert sorted(logged) == sorted((match.similarity, match.confidence_score) for match in matches)
+
+
+@pytest.mark.asyncio
+async def test_jobs_below_similarity_floor_are_rejected_without_llm_calls(candidate, tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    monkeypatch.setattr(config, "SIMILARITY_LOG_PATH", str(tmp_path / "similarity_log.jsonl"))
+    pooling = pooling_key(config.RESUME_MAX_CHUNKS, config.RESUME_CHUNK_CHARS, config.RESUME_CHUNK_POOLING)
+    # Fitted without resume chunks, the calibration doesn't apply to chunked searches
+    SimilarityCalibration.fit([0.0, 1.0], [0.1, 0.9], "fake-embedding-256", "cosine").save(config.SIMILARITY_CALIBRATION_PATH)
+    assert MatchAgent(model=FakeChatModel(), embeddings=FakeEmbeddings()).calibration is None
+    calibration = SimilarityCalibration.fit([0.0, 0.5, 1.0], [0.1, 0.4, 0.9], "fake-embedding-256", "cosine",
+                                            pooling=pooling)
+    calibration.save(config.SIMILARITY_CALIBRATION_PATH)
+    monkeypatch.setattr(config, "MATCH_MIN_SIMILARITY", 0.5)
+    model = FakeChatModel()
+    calls = []
+    original = model.ainvoke
+
+    async def counting(messages, **kwargs):
+        calls.append(messages)
+        return await original(messages, **kwargs)
+
+    model.ainvoke = counting
+    agent = MatchAgent(model=model, embeddings=FakeEmbeddings())
+    assert agent.calibration is not None
+    jobs = agent.jobs
+    similarities = {job_faiss_id(job.id): (0.9 if i == 0 else 0.2) for i, job in enumerate(jobs)}
+
+    matches = await agent.rank_matches(candidate, jobs, top_k=len(jobs), snapshot=agent.snapshot, similarities=similarities)
+
+    assert len(calls) == 1
+    rejected = [match for match in matches if match.reasoning.startswith("Embedding similarity")]
+    assert len(rejected) == len(jobs) - 1
+    assert all(match.status == MatchStatus.REJECTED and match.similarity == 0.2 for match in rejected)
+    assert rejected[0].calibrated_score == pytest.approx(calibration.predict(0.2))
+    # Only the pair the LLM scored is logged for calibration
+    with open(config.SIMILARITY_LOG_PATH) as f:
+        assert [(record["job_id"], record["pooling"]) for record in map(json.loads, f)] == [(jobs[0].id, pooling)]
+
+
+def test_scored_pair_log_rotates_past_its_size_cap(tmp_path):
+    log = ScoredPairLog(str(tmp_path / "pairs.jsonl"), max_bytes=200)
+    for i in range(20):
+        log.append([{"similarity": i / 20, "confidence_score": 0.5, "embedding_model": "m", "metric": "cosine"}])
+
+    assert (tmp_path / "pairs.jsonl.1").exists()
+    assert all(path.stat().st_size < 400 for path in tmp_path.iterdir())
+    pairs = list(log.read("m", "cosine"))
+    # Only the latest rotation is kept, read before the current file
+    assert pairs[-1][0] == pytest.approx(0.95) and len(pairs) < 20
+    assert [similarity for similarity, _ in pairs] == sorted(similarity for similarity, _ in pairs)
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from agents.match import MatchAgent, candidate_text
+from models import CandidateProfile, MatchStatus, Skill
+from retrieval import CandidateStore, candidate_id
+
+
+def profile(name, title, *skills, years=6):
+    return CandidateProfile(name=name, title=title, skills=[Skill(name=skill, level="expert") for skill in skills],
+                            experience_years=years)
+
+
+def test_store_replaces_removes_and_sees_other_writers(tmp_path):
+    path = str(tmp_path / "candidates.sqlite3")
+    store = CandidateStore(path, "fake-embeddings")
+    ada, bob = profile("Ada", "ML Engineer", "Python"), profile("Bob", "iOS Developer", "Swift")
+    vectors = np.eye(4, dtype=np.float32)
+
+    assert store.add([ada, bob], vectors[:2]) == [candidate_id(ada), candidate_id(bob)]
+    assert [cid for cid, _ in store.search(vectors[:1], 2)[0]] == [candidate_id(ada), candidate_id(bob)]
+
+    # Another worker process replaces Ada's vector and adds a third candidate
+    other = CandidateStore(path, "fake-embeddings")
+    cara = profile("Cara", "Data Engineer", "Spark")
+    other.add([ada, cara], vectors[2:4])
+    assert len(store) == 3
+    assert store.search(vectors[2:3], 1)[0][0] == (candidate_id(ada), ada)
+
+    assert store.remove(candidate_id(bob)) and not store.remove(candidate_id(bob))
+    assert store.get([candidate_id(bob), candidate_id(cara)]) == [None, cara]
+    assert candidate_id(bob) not in [cid for cid, _ in store.search(vectors[1:2], 3)[0]]
+    # Vectors of another embedding model are never mixed in
+    assert CandidateStore(path, "other-model").search(vectors[:1], 3) == [[]]
+
+
+@pytest.mark.asyncio
+async def test_match_candidates_ranks_stored_candidates_for_a_job(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    candidates = CandidateStore(str(tmp_path / "candidates.sqlite3"), "fake-embedding-256")
+    agent = MatchAgent(model=FakeChatModel(), embeddings=FakeEmbeddings(), candidates=candidates)
+    pool = [
+        profile("Ada", "Senior ML Engineer", "Python", "PyTorch", "Machine Learning"),
+        profile("Bob", "iOS Developer", "Swift", "Objective-C"),
+        profile("Cara", "Backend Engineer", "Python", "PostgreSQL"),
+    ]
+    # Matching resumes is what fills the store
+    await agent.embed_candidates(pool)
+    assert len(candidates) == 3
+
+    matches = await agent.match_candidates("ml-eng-01", top_k=2)
+
+    assert [match.candidate_profile.name for match in matches][0] == "Ada"
+    assert len(matches) == 2 and all(match.matched_job.id == "ml-eng-01" for match in matches)
+    assert matches[0].candidate_id == candidate_id(pool[0])
+    assert matches[0].status == MatchStatus.AUTO_MATCHED
+    # Similarities are cosine, like those of job searches
+    job = agent.job_vectors(np.array([agent.snapshot.jobs.find("ml-eng-01")]))[0]
+    ada = np.array(agent.embeddings.embed_query(candidate_text(pool[0])))
+    assert matches[0].similarity == pytest.approx(ada @ job / (np.linalg.norm(ada) * np.linalg.norm(job)), abs=1e-4)
+    with pytest.raises(KeyError):
+        await agent.match_candidates("no-such-job")
+
+    # Candidates under the similarity floor are rejected without an LLM call
+    monkeypatch.setattr(agent, "similarity_floor", matches[0].similarity + 0.01)
+    assert all(match.reasoning.startswith("Embedding similarity") for match in await agent.match_candidates("ml-eng-01"))
+
+
+def test_store_keys_candidates_by_resume_hash_and_expires_them(tmp_path):
+    store = CandidateStore(str(tmp_path / "candidates.sqlite3"), "fake-embeddings", ttl=60)
+    vectors = np.eye(4, dtype=np.float32)
+    first, reextracted = profile("Ada", "ML Engineer", "Python"), profile("Ada", "ML Engineer", "Python", "PyTorch")
+
+    # The same upload extracted twice, e.g. by another model, stays one candidate
+    store.add([first], vectors[:1], ["a" * 64])
+    assert store.add([reextracted], vectors[1:2], ["a" * 64]) == ["a" * 32]
+    store.add([profile("Bob", "iOS Developer", "Swift")], vectors[2:3])
+    assert len(store) == 2 and store.get(["a" * 32]) == [reextracted]
+    assert len(store.search(vectors[1:2], 2)[0]) == 2
+
+    store._conn.execute("UPDATE candidates SET added_at = 0 WHERE id = ?", ("a" * 32,))
+    assert store.prune() == 1
+    assert [cid for cid, _ in store.search(vectors[1:2], 2)[0]] == [candidate_id(profile("Bob", "iOS Developer", "Swift"))]
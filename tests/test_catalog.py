@@ -0,0 +1,123 @@
+import shutil
+import numpy as np
+import pytest
+from agents.match import MatchAgent, load_job_catalog
+from models import CandidateProfile, Skill
+from benchmarks.synthetic import make_jobs
+from retrieval import IndexConfig, SkillIndex, write_job_catalog
+from conftest import RecordingEmbeddings, new_job
+
+
+def test_add_job_embeds_only_new_posting(agent):
+    agent.embeddings.embedded.clear()
+    agent.add_jobs([new_job()])
+
+    assert len(agent.embeddings.embedded) == 1
+    assert agent.index.ntotal == 11
+    assert agent.snapshot.get("platform-eng-01").title == "Platform Engineer"
+
+    with pytest.raises(ValueError):
+        agent.add_jobs([new_job()])
+
+
+def test_update_reembeds_only_when_text_changes(agent):
+    agent.add_jobs([new_job()])
+    agent.embeddings.embedded.clear()
+
+    agent.update_job(new_job().model_copy(update={"min_experience_years": 6}))
+    assert agent.embeddings.embedded == []
+    assert agent.snapshot.get("platform-eng-01").min_experience_years == 6
+
+    agent.update_job(new_job(description="Run our Kubernetes fleet."))
+    assert len(agent.embeddings.embedded) == 1
+    assert agent.index.ntotal == 11
+
+    with pytest.raises(KeyError):
+        agent.update_job(new_job(job_id="missing"))
+
+
+def test_remove_job_keeps_old_snapshot_consistent(agent):
+    before = agent.snapshot
+    agent.remove_jobs(["ml-eng-01"])
+
+    assert "ml-eng-01" not in agent.snapshot
+    assert agent.index.ntotal == 9
+    # A request holding the earlier snapshot still sees the full catalog and index
+    assert "ml-eng-01" in before
+    assert before.index.ntotal == 10
+    assert before.version != agent.snapshot.version
+
+
+def test_updates_compact_strings_and_patch_the_skill_index(agent):
+    agent.add_jobs([new_job()])
+    for version in range(20):
+        agent.update_job(new_job(description=f"Run our Kubernetes fleet, take {version}. " * 50).model_copy(
+            update={"required_skills": [Skill(name=f"Tool {version}", level="expert")]}))
+    agent.remove_jobs(["ml-eng-01"])
+
+    jobs = agent.snapshot.jobs
+    # Replaced descriptions don't accumulate in the shared string table
+    assert jobs.dead_bytes <= 0.25 * len(jobs.strings)
+    assert agent.snapshot.get("platform-eng-01").required_skills[0].name == "Tool 19"
+
+    # The patched index answers like one built from scratch
+    patched, rebuilt = agent.snapshot.skills, SkillIndex(jobs)
+    for name in ["kubernetes", "python", "tool 0", "tool 19", "pytorch"]:
+        assert np.array_equal(patched.bitmap([name]), rebuilt.bitmap([name])), name
+    rows = np.arange(len(jobs))
+    candidate = CandidateProfile(name="Ops", title="SRE", experience_years=5,
+                                 skills=[Skill(name="Tool 19", level="expert"), Skill(name="Python", level="advanced")])
+    assert np.allclose(patched.score(candidate, rows).score, rebuilt.score(candidate, rows).score)
+
+
+def test_persisted_changes_survive_restart(agent, catalog_path):
+    agent.add_jobs([new_job()], persist=True)
+    agent.remove_jobs(["ml-eng-01"], persist=True)
+
+    ids = {job.id for job in load_job_catalog(catalog_path)}
+    assert "platform-eng-01" in ids and "ml-eng-01" not in ids
+
+    embeddings = RecordingEmbeddings()
+    restarted = MatchAgent(model=object(), embeddings=embeddings, catalog_path=catalog_path)
+    assert embeddings.embedded == []
+    assert restarted.snapshot.version == agent.snapshot.version
+
+
+def test_reload_applies_file_edits(agent, catalog_path):
+    other = MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=catalog_path)
+    other.add_jobs([new_job()], persist=True)
+
+    agent.reload_catalog()
+    assert "platform-eng-01" in agent.snapshot
+    assert agent.snapshot.version == other.snapshot.version
+
+
+def test_persisting_keeps_indexes_of_other_catalogs(agent, catalog_path, tmp_path):
+    other_path = tmp_path / "other_catalog.json"
+    shutil.copy("data/job_catalog.json", other_path)
+    other = MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=str(other_path))
+    other.remove_jobs(["ml-eng-01"])
+    other.add_jobs([new_job("other-01")], persist=True)
+    before = agent.snapshot.index_version
+    assert agent.store.load_index(other.snapshot.index_version) is not None
+
+    agent.add_jobs([new_job()], persist=True)
+
+    # The other catalog's index stays; this catalog's superseded one goes
+    assert agent.store.load_index(other.snapshot.index_version) is not None
+    assert agent.store.load_index(agent.snapshot.index_version) is not None
+    assert agent.store.load_index(before) is None
+
+
+def test_updates_after_restart_with_a_saved_ivf_index(tmp_path):
+    path = str(tmp_path / "catalog.jsonl")
+    write_job_catalog(list(make_jobs(400)), path)
+    index_config = IndexConfig(kind="ivf_flat", nlist=4)
+    MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=path, index_config=index_config).load()
+
+    restarted = MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=path, index_config=index_config)
+    assert restarted.store.load_index(restarted.snapshot.index_version) is not None
+    restarted.add_jobs([new_job()])
+    restarted.remove_jobs([new_job().id])
+
+    assert restarted.index.ntotal == 400
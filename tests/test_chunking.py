@@ -0,0 +1,104 @@
+import os
+import numpy as np
+import pytest
+import config
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from agents.match import MatchAgent, candidate_text
+from models import CandidateProfile, GraphState, Skill
+from pipeline import SECTION_WEIGHTS, MemoryLRUCache, ResultCache, chunk_resume
+from pipeline.pdf import clean_text
+from retrieval import pool_similarities
+
+with open(os.path.join(config.ROOT_DIR, "data", "resume_sample.txt")) as f:
+    RESUME = f.read()
+
+
+def test_chunk_resume_splits_cleaned_text_into_sections():
+    # Ingest collapses all whitespace, so headings are found inline
+    chunks = chunk_resume(clean_text(RESUME), max_chars=300)
+
+    assert [chunk.section for chunk in chunks][:3] == ["summary", "skills", "experience"]
+    assert {"experience", "education"} <= {chunk.section for chunk in chunks}
+    assert all(40 <= len(chunk.text) <= 300 for chunk in chunks)
+    assert chunks[1].text.startswith("SKILLS Programming Languages: Python")
+    # "Programming Languages:" and "Frameworks:" are not section headings
+    assert sum(chunk.section == "skills" for chunk in chunks) == 1
+
+    # Over the limit, lower-weighted sections go first
+    kept = chunk_resume(clean_text(RESUME), max_chars=300, max_chunks=4)
+    assert len(kept) == 4 and "education" not in {chunk.section for chunk in kept}
+
+
+def test_pool_similarities_max_and_mean():
+    similarities = np.array([[0.9, 0.5], [0.8, 0.7], [0.6, 0.1]])
+    ids = np.array([[1, 2], [3, 1], [2, -1]])
+    owners, weights = np.array([0, 0, 1]), np.array([1.0, 0.5, 1.0])
+
+    pooled = pool_similarities(similarities, ids, owners, weights, "max")
+    assert pooled == [{1: 0.9, 2: 0.5, 3: pytest.approx(0.4)}, {2: pytest.approx(0.6)}]
+    assert list(pooled[0]) == [1, 2, 3]
+    mean = pool_similarities(similarities, ids, owners, weights, "mean")
+    # Job 3 is missing from the first row, which counts its lowest returned similarity
+    assert mean[0][3] == pytest.approx((0.5 + 0.5 * 0.8) / 1.5)
+    assert mean[0][1] == pytest.approx((0.9 + 0.5 * 0.7) / 1.5)
+
+
+@pytest.mark.asyncio
+async def test_get_matches_searches_profile_and_resume_sections_together(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    embeddings = FakeEmbeddings()
+    agent = MatchAgent(model=FakeChatModel(), embeddings=embeddings, retrieval_mode="dense")
+    searches = []
+    run = agent.search_executor.run
+
+    async def counting(fn, *args):
+        searches.append(len(args[0]))
+        return await run(fn, *args)
+
+    monkeypatch.setattr(agent.search_executor, "run", counting)
+    profile = CandidateProfile(name="Jane Doe", title="Senior Software Engineer", experience_years=8,
+                               skills=[Skill(name="Python", level="expert")])
+    resume_text = clean_text(RESUME)
+    agent.load()
+    calls = embeddings.calls
+
+    matches = await agent.get_matches(GraphState(candidate_profile=profile, resume_text=resume_text), top_k=3)
+
+    chunks = agent.resume_chunks(resume_text)
+    assert chunks
+    # One embedding call and one index search for the profile and every section
+    assert embeddings.calls - calls == 1
+    assert searches == [1 + len(chunks)]
+    queries = np.array(embeddings.embed_documents([candidate_text(profile)] + [chunk.text for chunk in chunks]))
+    weights = np.array([1.0] + [SECTION_WEIGHTS[chunk.section] for chunk in chunks])
+    for match in matches:
+        job = agent.job_vectors(np.array([agent.snapshot.jobs.find(match.matched_job.id)]))[0]
+        cosine = queries @ job / (np.linalg.norm(queries, axis=1) * np.linalg.norm(job))
+        assert match.similarity == pytest.approx(float(np.max(weights * cosine)), abs=1e-4)
+
+
+def test_resume_chunks_fit_the_embedding_input_limit():
+    embeddings = FakeEmbeddings()
+    embeddings.max_chars = 300
+    agent = MatchAgent(model=FakeChatModel(), embeddings=embeddings)
+
+    chunks = agent.resume_chunks(clean_text(RESUME))
+
+    assert agent.resume_chunk_chars == 300
+    assert chunks and all(len(chunk.text) <= 300 for chunk in chunks)
+
+
+@pytest.mark.asyncio
+async def test_cached_matches_are_keyed_by_resume_sections(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    agent = MatchAgent(model=FakeChatModel(), embeddings=FakeEmbeddings(), cache=ResultCache(MemoryLRUCache()))
+    profile = CandidateProfile(name="Jane Doe", title="Senior Software Engineer", experience_years=8,
+                               skills=[Skill(name="Python", level="expert")])
+    resume_text = clean_text(RESUME)
+
+    matches = await agent.get_matches(GraphState(candidate_profile=profile, resume_text=resume_text), top_k=3)
+
+    assert agent.cached_matches(profile, 3, agent.snapshot, resume_text=resume_text) == matches
+    # The same profile extracted from a resume with other sections is searched again
+    other = resume_text.replace("EXPERIENCE", "EXPERIENCE Led the Kubernetes migration of the billing platform.")
+    assert agent.cached_matches(profile, 3, agent.snapshot, resume_text=other) is None
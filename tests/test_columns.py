@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from agents.match import MatchAgent, load_job_catalog
+from models import JobPosting, Skill
+from retrieval import JobColumns, job_faiss_id
+from conftest import RecordingEmbeddings, new_job
+
+
+@pytest.fixture
+def jobs():
+    return load_job_catalog("data/job_catalog.json") + [
+        JobPosting(id="bare", title="Tester", description="Ünïcode ✓", required_skills=[Skill(name="Go", years=2.5)])
+    ]
+
+
+def test_columns_round_trip_postings(jobs):
+    columns = JobColumns.from_jobs(jobs)
+
+    assert len(columns) == len(jobs)
+    assert columns.values() == jobs
+    assert columns[job_faiss_id("bare")].preferred_skills is None
+    assert columns.find("bare") == len(jobs) - 1 and columns.find("missing") is None
+    # Skill names and levels are interned once for the whole catalog
+    assert len(columns.skill_names) < len(columns.required.names) + len(columns.preferred.names)
+    with pytest.raises(KeyError):
+        columns[job_faiss_id("missing")]
+
+
+def test_saved_columns_are_memory_mapped(jobs, tmp_path):
+    JobColumns.from_jobs(jobs).save(str(tmp_path))
+    loaded = JobColumns.load(str(tmp_path))
+
+    assert isinstance(loaded.strings, np.memmap) and isinstance(loaded.required.names, np.memmap)
+    assert loaded.values() == jobs
+
+
+def test_take_and_concat_remap_strings_and_names(jobs, tmp_path):
+    columns = JobColumns.from_jobs(jobs[:3])
+    other = JobColumns.from_jobs(jobs[3:])
+
+    combined = columns.concat(other).take([4, 0, 2])
+    assert combined.values() == [jobs[4], jobs[0], jobs[2]]
+
+    # Saving drops strings of rows no longer referenced
+    combined.save(str(tmp_path))
+    loaded = JobColumns.load(str(tmp_path))
+    assert loaded.values() == combined.values()
+    assert loaded.strings.nbytes < combined.strings.nbytes
+
+
+def test_restart_maps_catalog_columns_from_the_store(agent, catalog_path, monkeypatch):
+    agent.add_jobs([new_job()], persist=True)
+
+    def fail(*args):
+        raise AssertionError("catalog JSON parsed again")
+
+    monkeypatch.setattr("agents.match.load_job_catalog", fail)
+    restarted = MatchAgent(model=object(), embeddings=RecordingEmbeddings(), catalog_path=catalog_path)
+
+    assert isinstance(restarted.snapshot.jobs.faiss_ids, np.memmap)
+    assert restarted.snapshot.version == agent.snapshot.version
+    assert restarted.snapshot.get("platform-eng-01") == new_job()
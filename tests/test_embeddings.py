@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+import config
+from agents.match import MatchAgent
+from benchmarks.fakes import FakeChatModel
+from benchmarks.synthetic import make_jobs
+from llm import HashingEmbeddings, create_embeddings
+from retrieval import write_job_catalog
+
+
+def test_hashing_embeddings_are_normalized_and_independent_of_batching():
+    texts = ["Senior Python engineer: PyTorch, machine learning", "Python ML engineer with PyTorch experience",
+             "iOS developer, Swift and Objective-C", "C# and Go", ""]
+    single = HashingEmbeddings(dimensions=128).embed_array(texts)
+    threaded = HashingEmbeddings(dimensions=128, batch_size=2, workers=3).embed_array(texts)
+
+    np.testing.assert_allclose(single, threaded, atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(single[:4], axis=1), 1.0, atol=1e-5)
+    assert not single[4].any()
+    similarity = single @ single.T
+    assert similarity[0, 1] > similarity[0, 2] + 0.2
+    assert HashingEmbeddings(dimensions=128).embed_query("c# and go") == pytest.approx(single[3].tolist(), abs=1e-6)
+
+
+def test_create_embeddings_from_settings(monkeypatch):
+    monkeypatch.setattr(config, "EMBEDDING_DIMENSIONS", 64)
+    embeddings = create_embeddings("hashing")
+    assert embeddings.dimensions == 64 and len(embeddings.embed_query("python")) == 64
+    with pytest.raises(ValueError):
+        create_embeddings("no-such-backend")
+    monkeypatch.setattr(config, "EMBEDDING_ONNX_PATH", "")
+    with pytest.raises(ValueError):
+        create_embeddings("onnx")
+
+
+def test_changing_dimensions_builds_a_separate_index(tmp_path):
+    catalog = tmp_path / "catalog.jsonl"
+    write_job_catalog(make_jobs(50, seed=4), str(catalog))
+
+    small = MatchAgent(model=FakeChatModel(), embeddings=HashingEmbeddings(dimensions=64), catalog_path=str(catalog)).load()
+    large = MatchAgent(model=FakeChatModel(), embeddings=HashingEmbeddings(dimensions=128), catalog_path=str(catalog)).load()
+
+    assert (small.index.d, large.index.d) == (64, 128)
+    assert small.index_version != large.index_version
+    # Reloading with the first dimension reuses its own cached index
+    again = MatchAgent(model=FakeChatModel(), embeddings=HashingEmbeddings(dimensions=64), catalog_path=str(catalog)).load()
+    assert again.index_version == small.index_version and again.index.ntotal == 50
@@ -0,0 +1,42 @@
+import asyncio
+import threading
+import pytest
+from pipeline import BoundedExecutor
+from pipeline.pdf import extract_resume_text
+
+
+@pytest.mark.asyncio
+async def test_queue_bound_limits_outstanding_work():
+    executor = BoundedExecutor("test", kind="thread", max_workers=2, max_queue=3)
+    release = threading.Event()
+    peak = 0
+
+    def blocking():
+        nonlocal peak
+        peak = max(peak, executor.in_flight)
+        release.wait(1)
+
+    tasks = [asyncio.ensure_future(executor.run(blocking)) for _ in range(6)]
+    await asyncio.sleep(0.05)
+    assert executor.in_flight == 3
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert peak <= 3
+    assert executor.stats()["completed"] == 6
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_extracts_text():
+    executor = BoundedExecutor("test", kind="process", max_workers=1)
+    try:
+        text = await executor.run(extract_resume_text, b"Jane Doe\n\nPython   engineer")
+    finally:
+        executor.shutdown()
+    assert text == "Jane Doe Python engineer"
+
+
+def test_unknown_executor_kind():
+    with pytest.raises(ValueError):
+        BoundedExecutor("test", kind="fiber")
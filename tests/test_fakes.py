@@ -0,0 +1,44 @@
+import pytest
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from benchmarks.synthetic import make_jobs, make_resume
+from agents.match import MatchAgent
+from graph import create_talent_match_graph
+from models import GraphState
+from retrieval import write_job_catalog
+
+
+def test_fake_chat_model_extracts_synthetic_resumes():
+    resume = make_resume(3)
+    profile = FakeChatModel.extract_profile(resume)
+
+    assert profile["name"] == resume.splitlines()[0]
+    assert profile["title"] in resume
+    assert profile["experience_years"] is not None
+    assert profile["skills"] and all(skill["name"] in resume for skill in profile["skills"])
+
+
+def test_fake_embeddings_are_deterministic_and_word_sensitive():
+    embeddings = FakeEmbeddings(dimensions=64)
+    a, b, c = embeddings.embed_documents(["Python Kafka engineer", "Python Kafka engineer", "iOS Swift developer"])
+    assert a == b
+    assert sum(x * y for x, y in zip(a, b)) > sum(x * y for x, y in zip(a, c))
+
+
+@pytest.mark.asyncio
+async def test_graph_runs_offline_on_synthetic_inputs(tmp_path, monkeypatch):
+    # Agents refuse to start without a key, though nothing here reaches the API
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+    catalog = tmp_path / "catalog.jsonl"
+    write_job_catalog(make_jobs(50), str(catalog))
+    model = FakeChatModel()
+    agent = MatchAgent(model=model, embeddings=FakeEmbeddings(dimensions=64), catalog_path=str(catalog))
+    graph = create_talent_match_graph(match_agent=agent, model=model)
+
+    final_state = await graph.ainvoke(GraphState(resume_text=make_resume(7).encode()))
+
+    assert not final_state.get("error")
+    assert final_state["candidate_profile"].name == make_resume(7).splitlines()[0]
+    assert final_state["job_matches"]
+    assert set(final_state["metrics"].stages) == {"ingest", "extract", "classify", "match", "qa"}
+    # Validation, extraction and one scoring call per match
+    assert model.calls == 2 + len(final_state["job_matches"])
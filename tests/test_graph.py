@@ -1,43 +1,62 @@
 import pytest
+from langchain_core.messages import AIMessage
+from agents.match import MatchAgent
+from benchmarks.fakes import FakeChatModel, FakeEmbeddings
+from benchmarks.synthetic import make_resume
 from models import GraphState, CandidateProfile, Skill
 from graph import create_talent_match_graph
 
-@pytest.fixture
-def sample_resume_text():
-    with open("data/resume_sample.txt", "r") as f:
-        return f.read()
+
+class RejectingChatModel(FakeChatModel):
+    """Flags every resume it is asked to validate as garbage"""
+
+    def _respond(self, prompt: str) -> AIMessage:
+        if "valid resume" in prompt:
+            return AIMessage(content="INVALID")
+        return super()._respond(prompt)
+
 
 @pytest.fixture
-def sample_state(sample_resume_text):
-    return GraphState(
-        resume_text=sample_resume_text
+def offline(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "offline")
+
+
+def offline_graph(model=None):
+    model = model or FakeChatModel()
+    return create_talent_match_graph(
+        match_agent=MatchAgent(model=model, embeddings=FakeEmbeddings()),
+        model=model
     )
 
+
 @pytest.mark.asyncio
-async def test_workflow_success(sample_state):
+async def test_workflow_success(offline):
     """Test successful workflow execution"""
-    graph = create_talent_match_graph()
-    final_state = await graph.ainvoke(sample_state)
-    
+    graph = offline_graph()
+    final_state = GraphState(**await graph.ainvoke(GraphState(resume_text=make_resume(0))))
+
     assert not final_state.error
     assert final_state.current_step == "complete"
     assert final_state.candidate_profile is not None
     assert len(final_state.job_matches) > 0
 
+
 @pytest.mark.asyncio
-async def test_workflow_invalid_resume():
+async def test_workflow_invalid_resume(offline):
     """Test workflow with invalid resume"""
-    graph = create_talent_match_graph()
+    graph = offline_graph(RejectingChatModel())
     state = GraphState(resume_text="Not a valid resume")
-    
-    final_state = await graph.ainvoke(state)
-    assert final_state.error is not None
+
+    final_state = GraphState(**await graph.ainvoke(state))
+    assert final_state.error == "Invalid resume format detected"
+    assert final_state.candidate_profile is None
+
 
 @pytest.mark.asyncio
-async def test_match_scoring():
+async def test_match_scoring(offline):
     """Test match scoring and status assignment"""
-    graph = create_talent_match_graph()
-    
+    agent = MatchAgent(model=FakeChatModel(), embeddings=FakeEmbeddings())
+
     # Create a profile that should match ML Engineer role
     state = GraphState(
         candidate_profile=CandidateProfile(
@@ -51,15 +70,15 @@ async def test_match_scoring():
             experience_years=6
         )
     )
-    
-    final_state = await graph.ainvoke(state)
-    
+
+    final_state = await agent(state)
+
     assert not final_state.error
     assert len(final_state.job_matches) > 0
-    
+
     # Check if at least one match has high confidence
     high_confidence_matches = [
-        m for m in final_state.job_matches 
+        m for m in final_state.job_matches
         if m.confidence_score >= 0.8
     ]
-    assert len(high_confidence_matches) > 0 
\ No newline at end of file
+    assert len(high_confidence_matches) > 0
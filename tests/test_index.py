@@ -0,0 +1,78 @@
+import faiss
+import numpy as np
+import pytest
+from models import JobPosting, Skill
+from retrieval import CatalogSnapshot, IndexConfig, JobColumns, build_index, evaluate_indexes
+from retrieval.index import IndexBuilder
+
+
+@pytest.fixture
+def vectors():
+    return np.random.default_rng(0).standard_normal((2000, 16)).astype(np.float32)
+
+
+SMALL_CONFIGS = {
+    "flat": IndexConfig(kind="flat"),
+    "ivf_flat": IndexConfig(kind="ivf_flat", nlist=16, nprobe=16),
+    "ivf_pq": IndexConfig(kind="ivf_pq", nlist=16, nprobe=16, pq_m=4, pq_bits=4),
+    "hnsw": IndexConfig(kind="hnsw", hnsw_m=8, ef_search=64),
+}
+
+
+@pytest.mark.parametrize("kind", list(SMALL_CONFIGS))
+def test_backends_return_caller_ids(vectors, kind):
+    ids = np.arange(len(vectors)) + 1000
+    index = build_index(vectors, ids, SMALL_CONFIGS[kind])
+
+    _, found = index.search(vectors[:5], 5)
+    assert index.ntotal == len(vectors)
+    assert set(found.ravel()) <= set(ids)
+    if kind != "ivf_pq":
+        assert list(found[:, 0]) == list(ids[:5])
+
+
+def test_small_catalog_falls_back_to_flat(vectors):
+    index = build_index(vectors[:10], range(10), SMALL_CONFIGS["ivf_flat"])
+    assert faiss.try_extract_index_ivf(index) is None
+
+
+def test_search_parameters_are_applied(vectors):
+    index = build_index(vectors, range(len(vectors)), IndexConfig(kind="ivf_flat", nlist=16, nprobe=3))
+    assert faiss.extract_index_ivf(index).nprobe == 3
+
+
+def test_chunked_build_matches_single_build(vectors):
+    index_config = IndexConfig(kind="ivf_flat", nlist=16, nprobe=16, max_train_points=800)
+    builder = IndexBuilder(index_config, len(vectors))
+    for start in range(0, len(vectors), 300):
+        builder.add(vectors[start:start + 300], range(start, min(start + 300, len(vectors))))
+    index = builder.finish()
+
+    assert index.ntotal == len(vectors)
+    _, found = index.search(vectors[:5], 1)
+    assert list(found[:, 0]) == list(range(5))
+
+
+def test_hnsw_snapshot_rebuilds_on_removal(vectors):
+    jobs = JobColumns.from_jobs(
+        JobPosting(id=str(i), title="t", description="d", required_skills=[Skill(name="Go")]) for i in range(50)
+    )
+    keys = np.array([f"key-{i}" for i in range(50)], dtype="S64")
+    ids = jobs.faiss_ids.tolist()
+    snapshot = CatalogSnapshot(jobs, keys, build_index(vectors[:50], ids, SMALL_CONFIGS["hnsw"]), SMALL_CONFIGS["hnsw"])
+
+    updated = snapshot.apply({}, {}, {}, removals=[ids[3], ids[4]])
+    assert updated.index.ntotal == 48
+    assert len(updated) == 48 and "3" not in updated
+    _, found = updated.index.search(vectors[3:4], 5)
+    assert ids[3] not in found[0] and ids[4] not in found[0]
+    assert snapshot.index.ntotal == 50
+
+
+def test_recall_report_against_flat(vectors):
+    report = evaluate_indexes(vectors, vectors[:20], [SMALL_CONFIGS["flat"], SMALL_CONFIGS["ivf_flat"]], k=5)
+
+    assert [row["kind"] for row in report] == ["flat", "ivf_flat"]
+    assert report[0]["recall_at_5"] == 1.0
+    assert report[1]["recall_at_5"] > 0.9
+    assert all(row["memory_bytes"] > 0 for row in report)
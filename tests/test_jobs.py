@@ -0,0 +1,126 @@
+import asyncio
+import pytest
+from models import CandidateProfile, JobPosting, MatchResult, MatchStatus
+from pipeline import JobStore, MatchQueue, QueueFullError
+
+
+def match_for(content: bytes) -> MatchResult:
+    return MatchResult(
+        candidate_profile=CandidateProfile(name=content.decode(), title="Engineer", experience_years=5, skills=[]),
+        matched_job=JobPosting(id="job-1", title="Engineer", description="Engineer", required_skills=[]),
+        confidence_score=0.8,
+        reasoning="fits",
+        status=MatchStatus.RECRUITER_REVIEW
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "queue.sqlite3"), result_ttl=60)
+
+
+def test_store_claims_by_priority_then_age(store):
+    low = store.submit(b"low")
+    high = store.submit(b"high", priority=5)
+    later = store.submit(b"later")
+
+    assert store.get(later).queue_position == 2
+    assert [store.claim()[0] for _ in range(3)] == [high, low, later]
+    assert store.claim() is None
+    assert store.counts()["running"] == 3
+
+
+def test_store_bounds_waiting_jobs(store):
+    store.submit(b"a", max_pending=2)
+    store.submit(b"b", max_pending=2)
+    with pytest.raises(QueueFullError):
+        store.submit(b"c", max_pending=2)
+
+    # Running jobs no longer count against the bound
+    store.claim()
+    store.submit(b"c", max_pending=2)
+    assert store.counts()["queued"] == 2
+
+
+def test_store_cancels_and_requeues(store):
+    queued = store.submit(b"a", must_have=["Python"])
+    running = store.submit(b"b")
+    assert store.claim()[0] == queued
+    assert not store.cancel(queued)
+    assert store.cancel(running)
+    assert store.get(running).status == "cancelled"
+
+    # A restart finds the job its process was running and queues it again
+    assert store.requeue_orphans() == 1
+    assert store.claim() == (queued, b"a", ["Python"])
+
+
+def test_store_fails_jobs_that_keep_losing_their_worker(tmp_path):
+    store = JobStore(str(tmp_path / "queue.sqlite3"), max_attempts=2)
+    job_id = store.submit(b"crashes workers")
+
+    store.claim()
+    assert store.requeue_orphans() == 1
+    store.claim()
+    assert store.requeue_orphans() == 0
+
+    job = store.get(job_id)
+    assert job.status == "failed" and "2 attempts" in job.error
+    assert store.claim() is None
+
+
+def test_store_prunes_only_old_finished_jobs(store):
+    finished, waiting = store.submit(b"a"), store.submit(b"b")
+    store.claim()
+    store.finish(finished, matches=[])
+    store._conn.execute("UPDATE jobs SET finished_at = 0, submitted_at = 0")
+
+    assert store.prune() == 1
+    assert store.get(finished) is None and store.get(waiting).status == "queued"
+
+
+@pytest.mark.asyncio
+async def test_queue_runs_jobs_and_keeps_results(store):
+    async def runner(content, must_have):
+        await asyncio.sleep(0.01)
+        if content == b"bad":
+            raise ValueError("No candidate profile extracted")
+        return [match_for(content)]
+
+    queue = MatchQueue(runner, store=store, workers=2, max_pending=10, poll_interval=0.05)
+    good = await queue.submit(b"alice", filename="alice.txt")
+    bad = await queue.submit(b"bad")
+    assert good.status == "queued" and good.filename == "alice.txt"
+    try:
+        for _ in range(100):
+            if all(job.status in ("succeeded", "failed") for job in [await queue.get(good.id), await queue.get(bad.id)]):
+                break
+            await asyncio.sleep(0.02)
+    finally:
+        await queue.stop()
+
+    done = await queue.get(good.id)
+    assert done.status == "succeeded"
+    assert done.job_matches[0].candidate_profile.name == "alice"
+    failed = await queue.get(bad.id)
+    assert failed.status == "failed" and failed.error == "No candidate profile extracted"
+    assert queue.stats()["completed"] == 1 and queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stopping_requeues_running_jobs(store):
+    started = asyncio.Event()
+
+    async def runner(content, must_have):
+        started.set()
+        await asyncio.sleep(10)
+
+    queue = MatchQueue(runner, store=store, workers=1, poll_interval=0.05)
+    job = await queue.submit(b"slow")
+    await asyncio.wait_for(started.wait(), 1)
+    await queue.stop()
+
+    assert not queue.running
+    assert (await queue.get(job.id)).status == "queued"
+    # A clean shutdown doesn't use up one of the job's attempts
+    assert store._conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job.id,)).fetchone()[0] == 0
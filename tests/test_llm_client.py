@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from langchain_core.messages import HumanMessage
+from llm import CachedChatModel
+from pipeline import MemoryLRUCache, SQLiteCache
+from conftest import FixedScoreChatModel
+
+
+@pytest.mark.asyncio
+async def test_identical_prompts_are_memoized():
+    model = FixedScoreChatModel()
+    client = CachedChatModel(model, MemoryLRUCache())
+
+    first = await client.ainvoke([HumanMessage(content="score job1")])
+    second = await client.ainvoke([HumanMessage(content="score job1")])
+    await client.ainvoke([HumanMessage(content="score job2")])
+
+    assert second.content == first.content
+    assert model.calls == 2
+    assert client.stats()["hits"] == 1 and client.stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_prompts_share_one_call():
+    model = FixedScoreChatModel(delay=0.1)
+    client = CachedChatModel(model, MemoryLRUCache())
+
+    responses = await asyncio.gather(*(client.ainvoke([HumanMessage(content="score job1")]) for _ in range(5)))
+
+    assert model.calls == 1
+    assert client.coalesced == 4
+    assert len({response.content for response in responses}) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_are_not_cached():
+    model = FixedScoreChatModel(fail_for=("job1",))
+    client = CachedChatModel(model, MemoryLRUCache())
+
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            await client.ainvoke([HumanMessage(content="score job1")])
+
+    assert model.calls == 2
+    assert client.errors == 2
+
+
+@pytest.mark.asyncio
+async def test_persistent_cache_survives_restart(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    model = FixedScoreChatModel()
+    await CachedChatModel(model, SQLiteCache(path)).ainvoke([HumanMessage(content="score job1")])
+
+    restarted = CachedChatModel(model, SQLiteCache(path))
+    await restarted.ainvoke([HumanMessage(content="score job1")])
+
+    assert model.calls == 1
+    assert restarted.hits == 1
@@ -0,0 +1,74 @@
+import json
+import pytest
+import config
+from agents.match import MatchAgent, load_job_catalog
+from retrieval import CatalogLoadError, iter_job_catalog, write_job_catalog
+from retrieval import loader
+from conftest import RecordingEmbeddings
+
+
+@pytest.fixture
+def jobs():
+    return load_job_catalog("data/job_catalog.json")
+
+
+def test_json_is_streamed_record_by_record(jobs, monkeypatch):
+    # Tiny reads force records to span many buffer refills
+    monkeypatch.setattr(loader, "READ_SIZE", 7)
+    assert list(iter_job_catalog("data/job_catalog.json")) == jobs
+
+
+def test_formats_round_trip(jobs, tmp_path):
+    for name in ("catalog.json", "catalog.jsonl", "catalog.jcat"):
+        path = str(tmp_path / name)
+        write_job_catalog(jobs, path, chunk_size=3)
+        assert list(iter_job_catalog(path)) == jobs
+
+    truncated = tmp_path / "truncated.jcat"
+    truncated.write_bytes((tmp_path / "catalog.jcat").read_bytes()[:-10])
+    with pytest.raises(CatalogLoadError):
+        list(iter_job_catalog(str(truncated)))
+
+
+def test_invalid_records_are_reported_not_replaced(jobs, tmp_path):
+    records = [job.model_dump(exclude_none=True) for job in jobs[:3]]
+    del records[1]["title"]
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({"jobs": records + ["not a job"]}))
+
+    errors = []
+    loaded = load_job_catalog(str(path), errors)
+
+    assert [job.id for job in loaded] == [jobs[0].id, jobs[2].id]
+    assert [(error.record, error.job_id) for error in errors] == [(2, jobs[1].id), (4, None)]
+    assert "title" in errors[0].error
+
+    lines = tmp_path / "catalog.jsonl"
+    lines.write_text(json.dumps(records[0]) + "\n{broken\n\n" + json.dumps(records[2]) + "\n")
+    errors = []
+    assert len(load_job_catalog(str(lines), errors)) == 2
+    assert [error.record for error in errors] == [2]
+
+
+def test_unreadable_catalogs_raise(tmp_path):
+    broken = tmp_path / "catalog.json"
+    broken.write_text('{"jobs": [{"id": "a"}, {"id": ')
+    with pytest.raises(CatalogLoadError):
+        load_job_catalog(str(broken))
+    with pytest.raises(CatalogLoadError):
+        load_job_catalog(str(tmp_path / "missing.json"))
+
+
+def test_agent_indexes_catalog_in_chunks(jobs, tmp_path, monkeypatch):
+    path = str(tmp_path / "catalog.jsonl")
+    # A repeated id keeps the later record
+    write_job_catalog(jobs + [jobs[0].model_copy(update={"title": "Renamed"})], path)
+    monkeypatch.setattr(config, "CATALOG_CHUNK_SIZE", 3)
+    embeddings = RecordingEmbeddings()
+
+    agent = MatchAgent(model=object(), embeddings=embeddings, catalog_path=path)
+
+    assert len(agent.snapshot) == agent.index.ntotal == len(jobs)
+    assert agent.snapshot.get(jobs[0].id).title == "Renamed"
+    assert [(error.record, error.job_id) for error in agent.catalog_errors] == [(1, jobs[0].id)]
+    assert max(len(call) for call in embeddings.batches) <= 3
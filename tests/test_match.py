@@ -0,0 +1,109 @@
+import asyncio
+import json
+import re
+import time
+import pytest
+from langchain_core.messages import AIMessage
+from agents.match import MatchAgent, DEFAULT_MATCH_ANALYSIS
+from models import MatchStatus
+from conftest import FixedScoreChatModel, RecordingEmbeddings
+
+
+@pytest.mark.asyncio
+async def test_scoring_runs_concurrently(candidate_state):
+    """Scoring latency tracks the slowest call, not the sum of calls"""
+    model = FixedScoreChatModel(delay=0.2)
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), max_concurrency=5)
+
+    start = time.perf_counter()
+    matches = await agent.get_matches(candidate_state, top_k=5)
+    elapsed = time.perf_counter() - start
+
+    assert len(matches) == 5
+    assert elapsed < 0.6
+    assert model.max_in_flight == 5
+
+
+@pytest.mark.asyncio
+async def test_scoring_respects_concurrency_limit(candidate_state):
+    model = FixedScoreChatModel(delay=0.05)
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), max_concurrency=2)
+
+    await agent.get_matches(candidate_state, top_k=5)
+    assert model.max_in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_single_failure_falls_back_for_that_job_only(candidate_state):
+    agent = MatchAgent(model=FixedScoreChatModel(delay=0.01), embeddings=RecordingEmbeddings())
+    first = await agent.get_matches(candidate_state, top_k=5)
+
+    failing_title = first[2].matched_job.title
+    agent.model = FixedScoreChatModel(delay=0.01, fail_for=(failing_title,))
+    matches = await agent.get_matches(candidate_state, top_k=5)
+
+    # Results keep the retrieval order
+    assert [m.matched_job.id for m in matches] == [m.matched_job.id for m in first]
+    for match in matches:
+        if match.matched_job.title == failing_title:
+            assert match.confidence_score == DEFAULT_MATCH_ANALYSIS["confidence_score"]
+            assert match.status == MatchStatus.REJECTED
+        else:
+            assert match.status == MatchStatus.AUTO_MATCHED
+
+
+@pytest.mark.asyncio
+async def test_scoring_timeout_falls_back(candidate_state):
+    agent = MatchAgent(model=FixedScoreChatModel(delay=1.0), embeddings=RecordingEmbeddings(), scoring_timeout=0.05)
+
+    matches = await agent.get_matches(candidate_state, top_k=3)
+    assert [m.reasoning for m in matches] == [DEFAULT_MATCH_ANALYSIS["reasoning"]] * 3
+
+
+class BatchScoringModel(FixedScoreChatModel):
+    """Answers batched prompts with a score per job id, leaving out the ids in `omit`"""
+    def __init__(self, omit=()):
+        super().__init__(delay=0.01)
+        self.omit = omit
+        self.prompts = []
+
+    async def ainvoke(self, messages):
+        content = messages[0].content
+        self.prompts.append(content)
+        if "Job ID:" not in content:
+            return await super().ainvoke(messages)
+        job_ids = re.findall(r"Job ID: (\S+)", content)
+        return AIMessage(content=json.dumps({"matches": [
+            {"job_id": job_id, "confidence_score": 0.7, "reasoning": f"Partial match for {job_id}"}
+            for job_id in reversed(job_ids) if job_id not in self.omit
+        ]}))
+
+
+@pytest.mark.asyncio
+async def test_batched_scoring_uses_one_call(candidate_state):
+    model = BatchScoringModel()
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), scoring_mode="batched")
+
+    matches = await agent.get_matches(candidate_state, top_k=5)
+
+    assert len(model.prompts) == 1
+    assert model.prompts[0].count("- Skills:") == 1
+    # Results keep the retrieval order even though the response lists jobs in reverse
+    assert [m.reasoning for m in matches] == [f"Partial match for {m.matched_job.id}" for m in matches]
+    assert all(m.status == MatchStatus.RECRUITER_REVIEW for m in matches)
+
+
+@pytest.mark.asyncio
+async def test_invalid_batched_entries_fall_back_to_per_job_calls(candidate_state):
+    agent = MatchAgent(model=FixedScoreChatModel(delay=0.01), embeddings=RecordingEmbeddings())
+    retrieved = [m.matched_job.id for m in await agent.get_matches(candidate_state, top_k=5)]
+
+    model = BatchScoringModel(omit=retrieved[:2])
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), scoring_mode="batched")
+    matches = await agent.get_matches(candidate_state, top_k=5)
+
+    # One batched call plus one per-job call for each job missing from the response
+    assert len(model.prompts) == 3
+    assert [m.matched_job.id for m in matches] == retrieved
+    assert [m.status for m in matches[:2]] == [MatchStatus.AUTO_MATCHED] * 2
+    assert [m.status for m in matches[2:]] == [MatchStatus.RECRUITER_REVIEW] * 3
@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from llm import CachedChatModel
+from models import GraphState, RunMetrics
+from pipeline import MemoryLRUCache
+from pipeline.metrics import MetricsRegistry, registry, server_timing, timed, timed_node
+
+
+def test_registry_renders_prometheus_text():
+    metrics = MetricsRegistry()
+    metrics.counter("jobs_total", "Jobs")
+    metrics.histogram("wait_seconds", "Wait", buckets=(0.1, 1.0))
+    metrics.gauge("queue_jobs", "Queued", "status", lambda: {"queued": 3})
+
+    metrics.inc("jobs_total", kind='a"b')
+    metrics.inc("jobs_total", 2, kind='a"b')
+    for value in (0.05, 0.5, 5.0):
+        metrics.observe("wait_seconds", value, stage="match")
+
+    lines = metrics.render().splitlines()
+    assert "# TYPE jobs_total counter" in lines
+    assert 'jobs_total{kind="a\\"b"} 3' in lines
+    # Buckets are cumulative and end with +Inf
+    assert 'wait_seconds_bucket{stage="match",le="0.1"} 1' in lines
+    assert 'wait_seconds_bucket{stage="match",le="1"} 2' in lines
+    assert 'wait_seconds_bucket{stage="match",le="+Inf"} 3' in lines
+    assert 'wait_seconds_count{stage="match"} 3' in lines
+    assert 'queue_jobs{status="queued"} 3' in lines
+
+
+@pytest.mark.asyncio
+async def test_timed_node_records_stages_and_nested_operations():
+    async def node(state):
+        with timed("search"):
+            await asyncio.sleep(0.01)
+        # Tasks started inside the node record against the same run
+        await asyncio.gather(*(asyncio.ensure_future(call()) for _ in range(2)))
+        state.error = "No matching jobs found"
+        return state
+
+    async def call():
+        with timed("llm"):
+            await asyncio.sleep(0)
+
+    before = registry.render()
+    state = await timed_node("match", node)(GraphState())
+
+    assert state.metrics.stages["match"] >= 0.01
+    assert state.metrics.operations["search"] >= 0.01
+    assert state.metrics.calls == {"search": 1, "llm": 2}
+    assert before != registry.render()
+    assert 'talentmatch_stage_errors_total{stage="match"}' in registry.render()
+
+    header = server_timing(state.metrics)
+    assert header.startswith("match;dur=")
+    assert 'llm;dur=' in header and 'desc="2 calls"' in header
+
+
+@pytest.mark.asyncio
+async def test_timed_node_records_raising_nodes_as_errors():
+    async def node(state):
+        with timed("llm"):
+            raise ValueError("model unavailable")
+
+    def errors():
+        line = next((line for line in registry.render().splitlines()
+                     if line.startswith('talentmatch_stage_errors_total{stage="raising"}')), None)
+        return float(line.split()[-1]) if line else 0.0
+
+    before = errors()
+    state = GraphState()
+    with pytest.raises(ValueError):
+        await timed_node("raising", node)(state)
+
+    assert errors() == before + 1
+    assert "raising" in state.metrics.stages and state.metrics.calls == {"llm": 1}
+
+
+@pytest.mark.asyncio
+async def test_chat_client_records_tokens_and_cache_hits():
+    class UsageModel:
+        async def ainvoke(self, messages):
+            return AIMessage(content="ok", usage_metadata={"input_tokens": 12, "output_tokens": 3, "total_tokens": 15})
+
+    client = CachedChatModel(UsageModel(), MemoryLRUCache())
+    state = GraphState()
+
+    async def node(state):
+        for _ in range(2):
+            await client.ainvoke([HumanMessage(content="score this")])
+        return state
+
+    state = await timed_node("extract", node)(state)
+
+    assert state.metrics.input_tokens == 12 and state.metrics.output_tokens == 3
+    assert state.metrics.calls["llm"] == 1
+    assert state.metrics.cache_hits == {"llm": 1} and state.metrics.cache_misses == {"llm": 1}
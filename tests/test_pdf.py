@@ -0,0 +1,75 @@
+import pytest
+from benchmarks.synthetic import make_pdf
+from pipeline import BoundedExecutor, PdfExtractor, extract_pdf, extract_resume_text
+
+
+@pytest.fixture
+def executor():
+    executor = BoundedExecutor("test-ingest", kind="thread", max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+def test_budget_stops_reading_pages_early():
+    text, report = extract_pdf(make_pdf(30), char_budget=5000)
+
+    assert len(text) == 5000
+    assert report.truncated
+    assert report.page_count == 30
+    assert report.pages_read < 30
+    assert [page.page for page in report.pages] == list(range(1, report.pages_read + 1))
+
+
+def test_whole_document_within_budget():
+    text, report = extract_pdf(make_pdf(3), char_budget=1_000_000)
+
+    assert not report.truncated
+    assert report.pages_read == 3
+    assert "Experience item 2.44" in text
+    assert all(page.seconds >= 0 and page.chars > 0 for page in report.pages)
+
+
+@pytest.mark.asyncio
+async def test_parallel_ranges_match_sequential(executor):
+    pdf = make_pdf(12)
+    extractor = PdfExtractor(executor=executor, char_budget=1_000_000, parallel_min_pages=5, pages_per_task=3)
+
+    text, report = await extractor.extract(pdf)
+
+    assert report.parallel
+    assert text == extract_resume_text(pdf, char_budget=1_000_000)
+
+
+@pytest.mark.asyncio
+async def test_parallel_ranges_parse_document_once_per_worker(executor, monkeypatch):
+    calls = []
+    run = executor.run
+
+    async def counting(fn, *args):
+        calls.append(args[1:3])
+        return await run(fn, *args)
+
+    monkeypatch.setattr(executor, "run", counting)
+    extractor = PdfExtractor(executor=executor, char_budget=1_000_000, parallel_min_pages=5, pages_per_task=3)
+
+    _, report = await extractor.extract(make_pdf(12))
+
+    assert report.pages_read == 12
+    assert [args for args in calls if len(args) == 2] == [(0, 6), (6, 12)]
+
+
+@pytest.mark.asyncio
+async def test_parallel_ranges_respect_budget(executor):
+    extractor = PdfExtractor(executor=executor, char_budget=3000, parallel_min_pages=5, pages_per_task=2)
+
+    text, report = await extractor.extract(make_pdf(40))
+
+    assert len(text) == 3000
+    assert report.truncated and report.pages_read < 40
+
+
+@pytest.mark.asyncio
+async def test_text_uploads_skip_pdf_parsing(executor):
+    text, report = await PdfExtractor(executor=executor).extract(b"Jane Doe\n  Python")
+    assert text == "Jane Doe Python"
+    assert report is None
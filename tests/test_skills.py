@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+from agents.match import MatchAgent
+from models import CandidateProfile, JobPosting, MatchStatus, Skill
+from retrieval import JobColumns, SkillIndex, job_faiss_id, normalize_skill
+from conftest import FixedScoreChatModel, RecordingEmbeddings
+
+
+def job(job_id, required, preferred=None, min_years=None):
+    return JobPosting(
+        id=job_id, title=job_id, description=job_id,
+        required_skills=[Skill(name=name, level=level) for name, level in required],
+        preferred_skills=[Skill(name=name, level=level) for name, level in preferred] if preferred else None,
+        min_experience_years=min_years
+    )
+
+
+@pytest.fixture
+def skill_index():
+    jobs = [
+        job("backend", [("Python", "expert"), ("PostgreSQL", "intermediate")], [("AWS", "intermediate")], 5),
+        job("frontend", [("React", "expert"), ("TypeScript", "expert")], min_years=4),
+        job("platform", [("Kubernetes", "expert"), ("Go", "intermediate")], min_years=10),
+    ]
+    return SkillIndex(JobColumns.from_jobs(jobs))
+
+
+def test_normalize_skill_resolves_aliases():
+    assert normalize_skill("  K8s ") == "kubernetes"
+    assert normalize_skill("Postgres") == normalize_skill("PostgreSQL")
+    assert normalize_skill("Machine   Learning") == "machine learning"
+
+
+def test_score_weights_levels_and_experience(skill_index):
+    profile = CandidateProfile(name="c", title="Backend", experience_years=6, skills=[
+        Skill(name="python", level="expert"), Skill(name="Postgres", level="beginner"), Skill(name="k8s", level="expert")
+    ])
+    scores = skill_index.score(profile, np.arange(3))
+
+    # PostgreSQL at beginner level covers half of the intermediate requirement
+    assert scores.required_coverage[0] == pytest.approx((1.0 + 0.5) / 2)
+    assert scores.required_met.tolist() == [2, 0, 1]
+    assert scores.required_total.tolist() == [2, 2, 2]
+    assert scores.preferred_coverage[0] == 0.0
+    assert scores.experience_gap.tolist() == [0.0, 0.0, 4.0]
+    assert scores.score[1] == 0.0
+    assert scores.score[2] == pytest.approx(0.5 * (1 - 4 / 10))
+
+
+@pytest.mark.asyncio
+async def test_prescreen_skips_llm_for_clear_cases():
+    model = FixedScoreChatModel(delay=0)
+    calls = []
+    original = model.ainvoke
+
+    async def counting(messages):
+        calls.append(messages)
+        return await original(messages)
+
+    model.ainvoke = counting
+    agent = MatchAgent(model=model, embeddings=RecordingEmbeddings(), prescore=True)
+    profile = CandidateProfile(name="c", title="Frontend Engineer", experience_years=6, skills=[
+        Skill(name="React", level="expert"), Skill(name="TypeScript", level="expert"),
+        Skill(name="JavaScript", level="expert"), Skill(name="Node.js", level="expert"), Skill(name="GraphQL", level="expert"),
+        Skill(name="Webpack", level="expert"), Skill(name="Frontend Architecture", level="expert")
+    ])
+
+    jobs = agent.jobs
+    matches = await agent.rank_matches(profile, jobs, top_k=len(jobs), snapshot=agent.snapshot)
+
+    by_id = {m.matched_job.id: m for m in matches}
+    frontend = next(j for j in jobs if "Frontend" in j.title)
+    assert by_id[frontend.id].status == MatchStatus.AUTO_MATCHED
+    assert by_id[frontend.id].reasoning.startswith("Skill pre-screen")
+    rejected = [m for m in matches if m.reasoning.startswith("Skill pre-screen: has")]
+    assert rejected and all(m.status == MatchStatus.REJECTED for m in rejected)
+    assert len(calls) == len(jobs) - len(rejected) - 1
+
+
+@pytest.mark.asyncio
+async def test_prescreen_prefers_viable_jobs_from_wider_set():
+    agent = MatchAgent(model=FixedScoreChatModel(delay=0), embeddings=RecordingEmbeddings(), prescore=True)
+    profile = CandidateProfile(name="c", title="Backend Engineer", experience_years=6, skills=[
+        Skill(name="Python", level="expert"), Skill(name="AWS", level="expert"), Skill(name="Docker", level="expert")
+    ])
+    jobs = agent.jobs
+    screened = agent.prescreen(profile, jobs, agent.snapshot)
+    viable = [job.id for job, result in zip(jobs, screened) if result is None or result.status != MatchStatus.REJECTED]
+    assert 3 <= len(viable) < len(jobs)
+
+    matches = await agent.rank_matches(profile, jobs, top_k=3, snapshot=agent.snapshot)
+
+    # Rejected jobs early in the retrieved list give way to viable jobs further down
+    assert [m.matched_job.id for m in matches] == viable[:3]
+
+
+def test_inverted_index_bitmaps(skill_index):
+    rows = {job_id: skill_index.columns.find(job_id) for job_id in ("backend", "frontend", "platform")}
+
+    assert skill_index.postings[skill_index.skill_id("aws")].tolist() == [rows["backend"]]
+    assert skill_index.bitmap(["Python", "AWS"]).tolist() == [True, False, False]
+    assert not skill_index.bitmap(["Python", "Rust"]).any()
+    assert skill_index.faiss_ids_with_all(["golang"]).tolist() == [job_faiss_id("platform")]
+
+
+@pytest.mark.asyncio
+async def test_must_have_skills_filter_inside_the_search(candidate_state):
+    agent = MatchAgent(model=FixedScoreChatModel(delay=0), embeddings=RecordingEmbeddings())
+    candidate_state.must_have_skills = ["k8s"]
+
+    matches = await agent.get_matches(candidate_state, top_k=5)
+
+    assert matches
+    for match in matches:
+        job = match.matched_job
+        names = {normalize_skill(s.name) for s in job.required_skills + (job.preferred_skills or [])}
+        assert "kubernetes" in names
+
+
+@pytest.mark.asyncio
+async def test_hybrid_retrieval_adds_skill_matches():
+    profile = CandidateProfile(name="c", title="Systems Engineer", experience_years=10, skills=[
+        Skill(name="C++", level="expert"), Skill(name="Assembly", level="expert"), Skill(name="Linux Kernel", level="expert")
+    ])
+    dense = MatchAgent(model=FixedScoreChatModel(delay=0), embeddings=RecordingEmbeddings(), retrieval_mode="dense")
+    hybrid = MatchAgent(model=FixedScoreChatModel(delay=0), embeddings=RecordingEmbeddings(), retrieval_mode="hybrid")
+    # An embedding of an unrelated profile stands in for one that ranks the skill match low
+    vectors = await dense.embed_candidates([CandidateProfile(name="c", title="Frontend Developer", skills=[
+        Skill(name="React", level="expert"), Skill(name="CSS", level="expert")
+    ])])
+    systems = next(job for job in dense.jobs if "C++" in job.title)
+
+    for top_k in range(2, len(dense.jobs)):
+        dense_jobs = (await dense.retrieve([profile], vectors, top_k))[0]
+        if systems not in dense_jobs:
+            break
+    hybrid_jobs = (await hybrid.retrieve([profile], vectors, top_k))[0]
+
+    assert systems not in dense_jobs
+    assert systems in hybrid_jobs
+
+
+def test_prescreen_and_hybrid_retrieval_are_opt_in():
+    agent = MatchAgent(model=FixedScoreChatModel(delay=0), embeddings=RecordingEmbeddings())
+    assert not agent.prescore
+    assert agent.retrieval_mode == "dense"
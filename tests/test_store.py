@@ -0,0 +1,74 @@
+import asyncio
+import numpy as np
+import pytest
+from agents.match import MatchAgent
+from retrieval import EmbeddingStore
+from conftest import RecordingEmbeddings
+
+
+def test_store_only_embeds_new_texts(tmp_path):
+    embeddings = RecordingEmbeddings()
+    store = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    first = store.embed_documents(["a", "b", "c"], embeddings.embed_documents)
+
+    # A fresh store on the same directory sees the persisted vectors
+    reopened = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    second = reopened.embed_documents(["a", "b", "changed"], embeddings.embed_documents)
+
+    assert embeddings.embedded == ["a", "b", "c", "changed"]
+    np.testing.assert_array_equal(first[:2], second[:2])
+    assert len(reopened) == 4
+
+
+def test_store_is_keyed_by_model(tmp_path):
+    embeddings = RecordingEmbeddings()
+    EmbeddingStore(str(tmp_path), "model-a").embed_documents(["a"], embeddings.embed_documents)
+    EmbeddingStore(str(tmp_path), "model-b").embed_documents(["a"], embeddings.embed_documents)
+
+    assert embeddings.embedded == ["a", "a"]
+
+
+def test_writers_read_only_the_keys_appended_since_their_last_load(tmp_path):
+    first = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    second = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    first.put(["a" * 64, "b" * 64], np.array([[1.0, 0.0], [0.0, 1.0]]))
+    second.put(["c" * 64, "c" * 64, "a" * 64], np.array([[2.0, 2.0], [2.0, 2.0], [9.0, 9.0]]))
+
+    # The second writer picked up the first one's rows before appending, and wrote a repeated key once
+    assert second.rows == {"a" * 64: 0, "b" * 64: 1, "c" * 64: 2}
+    np.testing.assert_array_equal(second.get(["a" * 64, "c" * 64]), [[1.0, 0.0], [2.0, 2.0]])
+    first.put(["d" * 64], np.array([[3.0, 3.0]]))
+    assert len(first) == 4 and first.rows["c" * 64] == 2
+    assert len(EmbeddingStore(str(tmp_path), "fake-embeddings")) == 4
+
+
+def test_store_rejects_dimension_change(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    store.put(["k1"], np.zeros((1, 4)))
+    with pytest.raises(ValueError):
+        store.put(["k2"], np.zeros((1, 8)))
+
+
+def test_agent_loads_prebuilt_index(tmp_path):
+    store = EmbeddingStore(str(tmp_path), "fake-embeddings")
+    embeddings = RecordingEmbeddings()
+    MatchAgent(model=object(), embeddings=embeddings, store=store).load()
+    assert len(embeddings.embedded) == 10
+
+    embeddings.embedded.clear()
+    agent = MatchAgent(model=object(), embeddings=embeddings, store=EmbeddingStore(str(tmp_path), "fake-embeddings"))
+    agent.load()
+    assert embeddings.embedded == []
+    assert agent.index.ntotal == 10
+
+
+@pytest.mark.asyncio
+async def test_agent_loads_catalog_once_on_first_use(tmp_path):
+    embeddings = RecordingEmbeddings()
+    agent = MatchAgent(model=object(), embeddings=embeddings, store=EmbeddingStore(str(tmp_path), "fake-embeddings"))
+    assert not agent.ready and embeddings.embedded == []
+
+    snapshots = await asyncio.gather(*(agent.aload() for _ in range(4)))
+    assert agent.ready
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert len(embeddings.embedded) == 10
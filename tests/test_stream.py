@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+import pytest
+from langchain_core.messages import AIMessage
+from agents.extract import ExtractAgent
+from agents.ingest import IngestAgent
+from agents.match import MatchAgent
+from graph import MatchStreamer
+from conftest import FixedScoreChatModel, RecordingEmbeddings
+
+
+class UnevenChatModel(FixedScoreChatModel):
+    """Scoring calls take between 0.02 and 0.3 seconds depending on the prompt"""
+
+    async def ainvoke(self, messages):
+        content = messages[0].content
+        if "Job:" not in content:
+            return await super().ainvoke(messages)
+        await asyncio.sleep(0.02 + hashlib.sha256(content.encode()).digest()[0] / 255 * 0.28)
+        return AIMessage(content='{"confidence_score": 0.7, "reasoning": "Decent match"}')
+
+
+@pytest.fixture
+def streamer(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    model = UnevenChatModel(delay=0)
+    return MatchStreamer(
+        match_agent=MatchAgent(model=model, embeddings=RecordingEmbeddings()),
+        ingest_agent=IngestAgent(model=model),
+        extract_agent=ExtractAgent(model=model)
+    )
+
+
+@pytest.mark.asyncio
+async def test_matches_stream_as_they_are_scored(streamer):
+    with open("data/resume_sample.txt") as f:
+        resume = f.read()
+
+    events = [event async for event in streamer.stream(resume, top_k=5)]
+
+    assert [e.stage for e in events if e.event == "stage"] == ["ingest", "extract", "classify", "match"]
+    matches = [e for e in events if e.event == "match"]
+    assert sorted(e.position for e in matches) == list(range(5))
+    # Results arrive in completion order, the first well before the last
+    assert [e.position for e in matches] != list(range(5))
+    assert matches[0].seconds < matches[-1].seconds - 0.05
+    complete = events[-1]
+    assert complete.event == "complete"
+    assert complete.job_matches == [e.match for e in sorted(matches, key=lambda e: e.position)]
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_stage_errors(streamer):
+    events = [event async for event in streamer.stream("")]
+
+    assert len(events) == 1
+    assert events[0].event == "error" and events[0].stage == "ingest"
+
+
+@pytest.mark.asyncio
+async def test_stream_turns_node_exceptions_into_error_events(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    model = UnevenChatModel(delay=0)
+
+    async def broken(state):
+        raise RuntimeError("classifier unavailable")
+
+    streamer = MatchStreamer(
+        match_agent=MatchAgent(model=model, embeddings=RecordingEmbeddings()),
+        ingest_agent=IngestAgent(model=model),
+        extract_agent=ExtractAgent(model=model),
+        classify_agent=broken
+    )
+    with open("data/resume_sample.txt") as f:
+        events = [event async for event in streamer.stream(f.read())]
+
+    assert [e.stage for e in events if e.event == "stage"] == ["ingest", "extract"]
+    assert events[-1].event == "error" and events[-1].stage == "classify"
+    assert "classifier unavailable" in events[-1].error
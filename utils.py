@@ -1,6 +1,7 @@
 import json
 import re
-from typing import Any, Dict, Optional
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional
 
 
 def parse_llm_json_response(content: str, fallback: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -73,3 +74,10 @@ def safe_parse_llm_json(content: str, fallback: Optional[Dict[str, Any]] = None)
             return fallback
         # Return a minimal valid response
         return {"error": f"Failed to parse response: {str(e)}"}
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Consecutive lists of up to `size` items, consuming the iterable lazily"""
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk